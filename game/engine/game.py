@@ -8,7 +8,7 @@ from game.systems.sound_manager import get_sound_manager
 
 
 class Game:
-    def __init__(self, width: int = 800, height: int = 600):
+    def __init__(self, width: int = 800, height: int = 600, watch_map: bool = False):
         pygame.init()
         self.width = width
         self.height = height
@@ -23,7 +23,7 @@ class Game:
         self.sound_manager = get_sound_manager()
 
         self.scene_manager = SceneManager()
-        self.scene_manager.push_scene(GameScene())
+        self.scene_manager.push_scene(GameScene(watch_map=watch_map))
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -48,6 +48,9 @@ class Game:
             self.update(dt)
             self.render()
 
+        # Exit scenes so they stop their background threads
+        self.scene_manager.clear()
+
         # Clean up sound manager
         self.sound_manager.cleanup()
         pygame.quit()
@@ -29,6 +29,10 @@ class SceneManager:
         self.scenes.append(scene)
         scene.on_enter()
 
+    def clear(self):
+        while self.scenes:
+            self.scenes.pop().on_exit()
+
     def handle_event(self, event: pygame.event.Event):
         if self.scenes:
             self.scenes[-1].handle_event(event)
@@ -2,6 +2,11 @@ import pygame
 import math
 
 from .animated_entity import AnimatedEntity, AnimationState
+from game.world.region_labels import is_unreachable
+from game.world.tile_collision import sweep_box
+
+# Distance (pixels) à laquelle un point de passage du chemin est atteint
+WAYPOINT_TOLERANCE = 4.0
 
 
 class Enemy(AnimatedEntity):
@@ -37,6 +42,17 @@ class Enemy(AnimatedEntity):
         self.is_corpse = False  # True when death animation finished
         self.ai_state = "idle"  # idle, chase, attack
         
+        # Chemin A* vers la cible (tuiles), recalculé seulement quand la cible
+        # change de tuile
+        self.path = None
+        self.path_index = 0
+        self.path_goal = None
+        self.path_request = None  # Recherche en cours dans la file de chemins
+        # Chemin HPA* vers une cible lointaine, raffiné segment par segment
+        self.hierarchical_path = None
+        # Prochaine tuile lue dans le champ de flux vers le joueur
+        self.flow_step = None
+        
         # Blood puddle system
         self.corpse_time = 0.0  # Time since becoming a corpse
         self.blood_puddle_max_time = 3.0  # Time for puddle to reach full size
@@ -82,55 +98,176 @@ class Enemy(AnimatedEntity):
         dy = target_center_y - center_y
         return math.sqrt(dx * dx + dy * dy)
     
-    def can_move_to(self, x: float, y: float, game_map, chest_manager=None, player=None, other_enemies=None) -> bool:
+    def can_see_target(self, game_map=None) -> bool:
+        """Vérifie qu'aucune tuile bloquante ne cache la cible (murs, eau, objets)."""
+        if not self.target:
+            return False
+        if not game_map:
+            return True  # Pas de carte, rien ne bloque la vue
+        
+        return game_map.line_of_sight.can_see(
+            self.x + self.width / 2,
+            self.y + self.height / 2,
+            self.target.x + self.target.width / 2,
+            self.target.y + self.target.height / 2,
+        )
+    
+    def can_reach_target(self, game_map=None) -> bool:
+        """Vérifie que la cible est dans la même région praticable (pas au-delà de l'eau ou d'un mur)."""
+        if not self.target:
+            return False
+        if not game_map:
+            return True  # Pas de carte, rien ne sépare les régions
+        
+        tile_size = game_map.tile_size
+        return not is_unreachable(
+            game_map.region_labels,
+            (int((self.x + self.width / 2) // tile_size), int((self.y + self.height / 2) // tile_size)),
+            (
+                int((self.target.x + self.target.width / 2) // tile_size),
+                int((self.target.y + self.target.height / 2) // tile_size),
+            ),
+        )
+    
+    def can_move_to(
+        self, x: float, y: float, game_map, chest_manager=None, player=None, other_enemies=None, enemy_index=None
+    ) -> bool:
         """Check if enemy can move to the specified position."""
         if not game_map:
             return True  # No collision checking if no map provided
         
         margin = 2
-        corners = [
-            (x + margin, y + margin),
-            (x + self.width - margin, y + margin),
-            (x + margin, y + self.height - margin),
-            (x + self.width - margin, y + self.height - margin),
-        ]
 
-        # Check terrain walkability
-        for corner_x, corner_y in corners:
-            if not game_map.is_walkable(corner_x, corner_y):
-                return False
+        # Check terrain and object walkability over the whole rectangle
+        if not game_map.is_rect_walkable(
+            x + margin, y + margin, self.width - 2 * margin, self.height - 2 * margin
+        ):
+            return False
         
-        # Create a rect for the new position
+        # Check chests, the player and living enemies
         enemy_rect = pygame.Rect(x, y, self.width, self.height)
+        blockers = self.get_movement_blockers(chest_manager, player, other_enemies, enemy_rect, enemy_index)
+        if enemy_rect.collidelist(blockers) != -1:
+            return False
         
-        # Check chest collisions if chest_manager provided
+        return True
+    
+    def get_movement_blockers(
+        self, chest_manager=None, player=None, other_enemies=None, area=None, enemy_index=None
+    ) -> list:
+        """Rects that block this enemy's movement besides the map.
+        
+        With an area (the box swept by a move), chests and enemies are
+        looked up in their spatial indexes around it instead of all scanned.
+        """
+        blockers = []
         if chest_manager:
-            for chest in chest_manager.chests:
-                if enemy_rect.colliderect(chest.rect):
-                    return False
-        
-        # Check player collision if player provided
+            chests = chest_manager.chests if area is None else chest_manager.get_chests_in_rect(*area)
+            blockers.extend(chest.rect for chest in chests)
         if player:
-            player_rect = pygame.Rect(player.x, player.y, player.width, player.height)
-            if enemy_rect.colliderect(player_rect):
-                return False
-        
-        # Check other enemies collision if provided
+            blockers.append(pygame.Rect(player.x, player.y, player.width, player.height))
+        if area is not None and enemy_index is not None:
+            other_enemies = enemy_index.query_rect(*area)
         if other_enemies:
             for other_enemy in other_enemies:
-                # Don't check collision with self
-                if other_enemy is self:
-                    continue
-                
-                # Only check collision with living enemies (corpses don't block movement)
-                if other_enemy.blocks_movement():
-                    other_rect = pygame.Rect(other_enemy.x, other_enemy.y, other_enemy.width, other_enemy.height)
-                    if enemy_rect.colliderect(other_rect):
-                        return False
-        
-        return True
+                # Corpses don't block movement
+                if other_enemy is not self and other_enemy.blocks_movement():
+                    blockers.append(
+                        pygame.Rect(other_enemy.x, other_enemy.y, other_enemy.width, other_enemy.height)
+                    )
+        return blockers
+
+    def get_next_waypoint(self, game_map=None):
+        """Position (coin haut-gauche) du prochain point de passage vers la cible.
+        
+        Les ennemis d'une tuile suivent le champ de flux vers le joueur, les
+        autres (ou hors du champ) un chemin A*, par le graphe HPA* quand la
+        cible est à plus d'un cluster. Retourne None quand il faut
+        aller droit sur la cible : pas de carte, cible inatteignable ou
+        dernière tuile atteinte.
+        """
+        if not game_map or not self.target:
+            return None
+        
+        tile_size = game_map.tile_size
+        size = max(1, -(-max(self.width, self.height) // tile_size))
+        
+        # Ennemis d'une tuile : lire le prochain pas dans le champ de flux
+        # partagé, quand il mène à la tuile de la cible et couvre l'ennemi
+        flow_field = game_map.flow_field
+        tile = (round(self.x / tile_size), round(self.y / tile_size))
+        target_tile = (
+            int((self.target.x + self.target.width / 2) // tile_size),
+            int((self.target.y + self.target.height / 2) // tile_size),
+        )
+        if size == 1 and flow_field.goal == target_tile and flow_field.get_cost(tile) < math.inf:
+            step = self.flow_step
+            if step is None or max(abs(step[0] - tile[0]), abs(step[1] - tile[1])) > 1:
+                step = tile  # Repartir de la tuile actuelle
+            if abs(step[0] * tile_size - self.x) + abs(step[1] * tile_size - self.y) <= WAYPOINT_TOLERANCE:
+                step = flow_field.get_next_tile(step)
+            self.flow_step = step
+            return (step[0] * tile_size, step[1] * tile_size) if step else None
+        
+        # Tuile où serait l'ennemi s'il était centré sur la cible
+        goal = (
+            round((self.target.x + self.target.width / 2 - self.width / 2) / tile_size),
+            round((self.target.y + self.target.height / 2 - self.height / 2) / tile_size),
+        )
+        if goal != self.path_goal:
+            self.path = None
+            self.path_index = 0
+            self.path_goal = goal
+            self.hierarchical_path = None
+            if self.path_request:
+                self.path_request.cancel()
+                self.path_request = None
+            hierarchical_pathfinder = game_map.hierarchical_pathfinder
+            if (
+                size == 1
+                and hierarchical_pathfinder is not None
+                and hierarchical_pathfinder.is_long_range(tile, goal)
+            ):
+                # Cible lointaine : chemin sur le graphe des entrées de clusters,
+                # les tuiles d'un segment ne sont cherchées qu'en l'atteignant
+                self.hierarchical_path = hierarchical_pathfinder.find_path(tile, goal)
+                if self.hierarchical_path:
+                    self.path = self.hierarchical_path.next_segment()
+            elif game_map.path_queue is None or game_map.pathfinder.is_cached(tile, goal, size):
+                self.path = game_map.pathfinder.find_path(tile, goal, size)
+            else:
+                # Chercher en arrière-plan, en ligne droite en attendant
+                self.path_request = game_map.path_queue.request(tile, goal, size)
+        elif self.path_request and self.path_request.done:
+            self.path = self.path_request.path
+            self.path_request = None
+            if self.path:
+                # L'ennemi a avancé entre-temps : reprendre au point le plus proche
+                self.path_index = min(
+                    range(len(self.path)),
+                    key=lambda index: abs(self.path[index][0] * tile_size - self.x)
+                    + abs(self.path[index][1] * tile_size - self.y),
+                )
+        
+        while self.path is not None:
+            while self.path_index < len(self.path):
+                tile_x, tile_y = self.path[self.path_index]
+                waypoint = (tile_x * tile_size, tile_y * tile_size)
+                if abs(waypoint[0] - self.x) + abs(waypoint[1] - self.y) > WAYPOINT_TOLERANCE:
+                    return waypoint
+                self.path_index += 1
+            if not self.hierarchical_path or self.hierarchical_path.is_finished:
+                return None
+            # Segment suivant du chemin HPA*
+            self.path = self.hierarchical_path.next_segment()
+            self.path_index = 0
+            if self.path is None:
+                self.path_goal = None  # Segment bloqué entre-temps : chercher à nouveau
+        return None
     
-    def move_towards_target(self, dt: float, game_map=None, chest_manager=None, player=None, other_enemies=None):
+    def move_towards_target(
+        self, dt: float, game_map=None, chest_manager=None, player=None, other_enemies=None, enemy_index=None
+    ):
         """Déplace l'ennemi vers sa cible."""
         if not self.target:
             return
@@ -143,7 +280,17 @@ class Enemy(AnimatedEntity):
         
         dx = target_center_x - center_x
         dy = target_center_y - center_y
+        speed = self.speed
+        
+        # Suivre le chemin autour des obstacles plutôt que la ligne droite
+        waypoint = self.get_next_waypoint(game_map)
+        if waypoint:
+            dx = waypoint[0] - self.x
+            dy = waypoint[1] - self.y
         distance = math.sqrt(dx * dx + dy * dy)
+        if waypoint and dt > 0:
+            # Ne pas dépasser le point de passage
+            speed = min(speed, distance / dt)
         
         if distance > 0:
             # Normaliser la direction
@@ -151,47 +298,33 @@ class Enemy(AnimatedEntity):
             dy /= distance
             
             # Calculate desired velocity
-            desired_vel_x = dx * self.speed
-            desired_vel_y = dy * self.speed
+            desired_vel_x = dx * speed
+            desired_vel_y = dy * speed
             
-            # Check collision before applying movement
-            if self.can_move_to(
-                self.x + desired_vel_x * dt,
-                self.y + desired_vel_y * dt,
-                game_map,
-                chest_manager,
-                player,
-                other_enemies
-            ):
+            if not game_map:
                 self.velocity_x = desired_vel_x
                 self.velocity_y = desired_vel_y
             else:
-                # Try moving only horizontally
-                if self.can_move_to(
-                    self.x + desired_vel_x * dt,
-                    self.y,
+                # Resolve the whole step in one sweep, sliding along obstacles
+                step_x = desired_vel_x * dt
+                step_y = desired_vel_y * dt
+                swept = pygame.Rect(self.x, self.y, self.width, self.height).union(
+                    pygame.Rect(self.x + step_x, self.y + step_y, self.width, self.height)
+                )
+                new_x, new_y, _ = sweep_box(
                     game_map,
-                    chest_manager,
-                    player,
-                    other_enemies
-                ):
-                    self.velocity_x = desired_vel_x
-                    self.velocity_y = 0
-                # Try moving only vertically
-                elif self.can_move_to(
                     self.x,
-                    self.y + desired_vel_y * dt,
-                    game_map,
-                    chest_manager,
-                    player,
-                    other_enemies
-                ):
-                    self.velocity_x = 0
-                    self.velocity_y = desired_vel_y
-                else:
-                    # Can't move in either direction
-                    self.velocity_x = 0
-                    self.velocity_y = 0
+                    self.y,
+                    self.width,
+                    self.height,
+                    step_x,
+                    step_y,
+                    self.get_movement_blockers(chest_manager, player, other_enemies, swept, enemy_index),
+                    tile_margin=2,
+                )
+                # Velocity that lands exactly on the resolved position
+                self.velocity_x = (new_x - self.x) / dt if dt > 0 else 0
+                self.velocity_y = (new_y - self.y) / dt if dt > 0 else 0
         else:
             self.velocity_x = 0
             self.velocity_y = 0
@@ -200,7 +333,10 @@ class Enemy(AnimatedEntity):
         if self.is_alive:
             self.update_movement_animation(self.velocity_x, self.velocity_y)
     
-    def update_ai(self, dt: float, current_time: float, game_map=None, chest_manager=None, player=None, other_enemies=None):
+    def update_ai(
+        self, dt: float, current_time: float, game_map=None, chest_manager=None, player=None, other_enemies=None,
+        enemy_index=None,
+    ):
         """Met à jour l'IA de l'ennemi."""
         if not self.is_alive:
             # Dead enemies should not move or update AI
@@ -212,18 +348,26 @@ class Enemy(AnimatedEntity):
         
         # Machine d'état simple
         if self.ai_state == "idle":
-            if distance_to_player <= self.detection_radius:
+            # Ne détecter le joueur que s'il est à portée, en vue et atteignable
+            if (
+                distance_to_player <= self.detection_radius
+                and self.can_see_target(game_map)
+                and self.can_reach_target(game_map)
+            ):
                 self.ai_state = "chase"
+                self.path_goal = None  # Chemin à recalculer depuis ici
+                self.flow_step = None
         
         elif self.ai_state == "chase":
             if distance_to_player <= self.attack_range:
                 self.ai_state = "attack"
-            elif distance_to_player > self.detection_radius * 1.5:  # Perd la cible
+            elif distance_to_player > self.detection_radius * 1.5 or not self.can_reach_target(game_map):
+                # Perd la cible : trop loin, ou hors de sa région (eau, murs)
                 self.ai_state = "idle"
                 self.velocity_x = 0
                 self.velocity_y = 0
             else:
-                self.move_towards_target(dt, game_map, chest_manager, player, other_enemies)
+                self.move_towards_target(dt, game_map, chest_manager, player, other_enemies, enemy_index)
         
         elif self.ai_state == "attack":
             if distance_to_player > self.attack_range:
@@ -345,7 +489,10 @@ class Enemy(AnimatedEntity):
         # Blit the puddle to screen
         screen.blit(puddle_surface, (puddle_x, puddle_y))
     
-    def update(self, dt: float, current_time: float = 0, game_map=None, chest_manager=None, player=None, other_enemies=None):
+    def update(
+        self, dt: float, current_time: float = 0, game_map=None, chest_manager=None, player=None, other_enemies=None,
+        enemy_index=None,
+    ):
         """Met à jour l'ennemi."""
         # Always update animations (for death animation and corpses)
         self.update_animation(dt)
@@ -382,7 +529,7 @@ class Enemy(AnimatedEntity):
             old_x, old_y = self.x, self.y
             
             # Mettre à jour l'IA
-            self.update_ai(dt, current_time, game_map, chest_manager, player, other_enemies)
+            self.update_ai(dt, current_time, game_map, chest_manager, player, other_enemies, enemy_index)
             
             # Update movement animations based on velocity
             self.update_movement_animation(self.velocity_x, self.velocity_y)
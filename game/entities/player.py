@@ -4,6 +4,7 @@ from .animated_entity import AnimatedEntity, AnimationState
 from game.equipment.inventory import Inventory
 from game.equipment.weapon import BasicSword, SteelSword, LegendarySword, MagicStaff, ElvenBow
 from game.systems.sound_manager import play_attack_sound, play_hurt_sound
+from game.world.tile_collision import sweep_box
 
 
 class Player(AnimatedEntity):
@@ -163,7 +164,8 @@ class Player(AnimatedEntity):
         player_center_x = self.x + self.width / 2
         player_center_y = self.y + self.height / 2
         
-        chest = chest_manager.find_interactable_chest(player_center_x, player_center_y)
+        chest_manager.update_player_position(player_center_x, player_center_y)
+        chest = chest_manager.get_interactable_chest()
         if chest:
             loot_received = chest.open(self)
             if loot_received:
@@ -259,24 +261,19 @@ class Player(AnimatedEntity):
 
     def can_move_to(self, x: float, y: float, game_map, chest_manager=None) -> bool:
         margin = 2
-        corners = [
-            (x + margin, y + margin),
-            (x + self.width - margin, y + margin),
-            (x + margin, y + self.height - margin),
-            (x + self.width - margin, y + self.height - margin),
-        ]
-
-        for corner_x, corner_y in corners:
-            if not game_map.is_walkable(corner_x, corner_y):
-                return False
+        if not game_map.is_rect_walkable(
+            x + margin, y + margin, self.width - 2 * margin, self.height - 2 * margin
+        ):
+            return False
         
         # Check chest collisions if chest_manager provided
         if chest_manager:
             # Create a rect for the new position
             player_rect = pygame.Rect(x, y, self.width, self.height)
             
-            # Check collision with all chests
-            for chest in chest_manager.chests:
+            # Only chests indexed around the new position can collide
+            chests = chest_manager.get_chests_in_rect(x, y, self.width, self.height)
+            for chest in chests:
                 if player_rect.colliderect(chest.rect):
                     return False
         
@@ -293,13 +290,28 @@ class Player(AnimatedEntity):
         self.update_animation(dt)
 
         if game_map:
-            new_x = self.x + self.velocity_x * dt
-            new_y = self.y + self.velocity_y * dt
-
-            if self.can_move_to(new_x, self.y, game_map, chest_manager):
-                self.x = new_x
-            if self.can_move_to(self.x, new_y, game_map, chest_manager):
-                self.y = new_y
+            # Slide as far as tiles and chests allow, without skipping walls
+            step_x = self.velocity_x * dt
+            step_y = self.velocity_y * dt
+            blockers = []
+            if chest_manager:
+                # Chests are looked up around the box swept by the move
+                swept = pygame.Rect(self.x, self.y, self.width, self.height).union(
+                    (self.x + step_x, self.y + step_y, self.width, self.height)
+                )
+                chests = chest_manager.get_chests_in_rect(*swept)
+                blockers = [chest.rect for chest in chests]
+            self.x, self.y, _ = sweep_box(
+                game_map,
+                self.x,
+                self.y,
+                self.width,
+                self.height,
+                step_x,
+                step_y,
+                blockers,
+                tile_margin=2,
+            )
         else:
             # Update base velocity/position
             old_x, old_y = self.x, self.y
@@ -4,20 +4,39 @@ from game.engine.scene import Scene
 from game.entities.player import Player
 from game.entities.enemy import Goblin, Ogre
 from game.world.bitmap_map import BitmapMap
+from game.world.streaming_map import StreamingMap, is_streaming_world
 from game.world.chest import ChestManager
+from game.world.fog_of_war import FogOfWar
+from game.world.spatial_index import SpatialGrid
+from game.world.trigger_zones import TriggerZoneManager
+from game.world.zone_world import ZoneWorld, is_zone_world
 from game.ui.menu import MenuManager
 from game.ui.inventory_menu import InventoryMenu
 from game.ui.equipment_menu import EquipmentMenu
 from game.ui.main_menu import MainMenu
+from game.ui.minimap import Minimap
 from game.ui.controls_menu import ControlsMenu
 from game.ui.config_menu import ConfigMenu
 from game.systems.sound_manager import get_sound_manager
 
+# Intervalle (en secondes) entre deux vérifications du fichier de carte surveillé
+MAP_CHECK_INTERVAL = 0.5
+
 
 class GameScene(Scene):
-    def __init__(self, map_path: str = "data/maps/large_map.png"):
+    def __init__(self, map_path: str = "data/maps/large_map.png", watch_map: bool = False):
         super().__init__()
-        self.game_map = BitmapMap(map_path, tile_size=32)
+        self.zone_world = None
+        if is_zone_world(map_path):
+            # Plusieurs cartes reliées par des portails
+            self.zone_world = ZoneWorld(map_path, tile_size=32)
+            self.game_map = self.zone_world.current_map
+        elif is_streaming_world(map_path):
+            self.game_map = StreamingMap(map_path, tile_size=32)
+        else:
+            # En mode surveillance, les modifications du PNG sont appliquées en jeu
+            self.game_map = BitmapMap(map_path, tile_size=32, watch=watch_map)
+        self.map_check_timer = 0.0
         # Find a safe spawn position that avoids objects
         spawn_x, spawn_y = self.game_map.find_safe_spawn_position()
         self.player = Player(spawn_x, spawn_y)
@@ -25,14 +44,24 @@ class GameScene(Scene):
         self.camera_y = 0
         self.current_time = 0
         
+        # Zones de déclenchement (coffres, plus tard PNJ, pièges, portes)
+        self.trigger_zones = TriggerZoneManager()
+        
         # Gestionnaire de coffres
-        self.chest_manager = ChestManager()
+        self.chest_manager = ChestManager(self.trigger_zones)
         self.spawn_test_chests()
         
-        # Créer quelques ennemis de test
+        # Créer quelques ennemis de test, indexés pour les requêtes par zone
         self.enemies = []
+        self.enemy_index = SpatialGrid(cell_size=256)
         self.spawn_test_enemies()
         
+        # Brouillard de guerre et mini-carte (qui n'affiche que l'exploré)
+        self.fog = self._create_fog()
+        self.minimap = Minimap(self.game_map, fog=self.fog)
+        # Coffres et ennemis des zones déjà visitées, par nom de zone
+        self.zone_states = {}
+        
         # Initialize menu system
         self.menu_manager = MenuManager()
         
@@ -132,37 +161,87 @@ class GameScene(Scene):
         spawned_count = 0
         ogre_count = 0
         for i, (x, y) in enumerate(enemy_positions):
-            # Vérifier que la position est walkable
-            if self.game_map.is_walkable(x, y):
-                # Spawn un Ogre au milieu des ennemis (position 4) et un autre plus loin
-                if i == 4 or i == 8:
-                    # Vérifier que l'ogre (64x64) a assez de place
-                    if (self.game_map.is_walkable(x + 32, y) and 
-                        self.game_map.is_walkable(x, y + 32) and 
-                        self.game_map.is_walkable(x + 32, y + 32)):
-                        ogre = Ogre(x, y)
-                        ogre.target = self.player
-                        self.enemies.append(ogre)
-                        ogre_count += 1
-                        spawned_count += 1
-                    else:
-                        # Si pas de place pour l'ogre, spawn un gobelin
-                        goblin = Goblin(x, y)
-                        goblin.target = self.player
-                        self.enemies.append(goblin)
-                        spawned_count += 1
-                else:
-                    # Spawn un gobelin normal
-                    goblin = Goblin(x, y)
-                    goblin.target = self.player  # Cibler le joueur
-                    self.enemies.append(goblin)
-                    spawned_count += 1
+            # Spawn un Ogre au milieu des ennemis (position 4) et un autre plus loin
+            enemy = None
+            if i == 4 or i == 8:
+                # Vérifier que l'ogre (64x64) a assez de place
+                position = self.game_map.find_clear_position(x, y, 64, 64, max_radius=1)
+                if position:
+                    enemy = Ogre(*position)
+                    ogre_count += 1
+            if enemy is None:
+                # Spawn un gobelin normal (ou à la place d'un ogre sans place)
+                position = self.game_map.find_clear_position(x, y, 32, 32, max_radius=1)
+                if position:
+                    enemy = Goblin(*position)
+            if enemy:
+                enemy.target = self.player  # Cibler le joueur
+                self.enemies.append(enemy)
+                self.enemy_index.insert(enemy, enemy.x, enemy.y, enemy.width, enemy.height)
+                spawned_count += 1
         
         print(f"Spawned {spawned_count} enemies ({ogre_count} ogres, {spawned_count - ogre_count} goblins) on large map")
         print(f"Player position: ({player_x}, {player_y})")
         if self.enemies:
             print(f"First enemy at: ({self.enemies[0].x}, {self.enemies[0].y})")
 
+    def change_zone(self, portal):
+        """Passe dans la zone cible d'un portail (carte déjà préchargée en général)."""
+        self.zone_states[self.zone_world.current_zone] = (
+            self.trigger_zones,
+            self.chest_manager,
+            self.enemies,
+            self.enemy_index,
+            self.fog,
+            self.minimap,
+        )
+        self.game_map, (arrival_x, arrival_y) = self.zone_world.take_portal(portal)
+        
+        position = self.game_map.find_clear_position(
+            arrival_x, arrival_y, self.player.width, self.player.height
+        )
+        self.player.x, self.player.y = position if position else (arrival_x, arrival_y)
+        self.player.velocity_x = 0
+        self.player.velocity_y = 0
+        
+        state = self.zone_states.get(portal.target_zone)
+        if state:
+            (
+                self.trigger_zones,
+                self.chest_manager,
+                self.enemies,
+                self.enemy_index,
+                self.fog,
+                self.minimap,
+            ) = state
+        else:
+            # Première visite : peupler la zone comme la carte de départ
+            self.trigger_zones = TriggerZoneManager()
+            self.chest_manager = ChestManager(self.trigger_zones)
+            self.enemies = []
+            self.enemy_index = SpatialGrid(cell_size=256)
+            self.spawn_test_chests()
+            self.spawn_test_enemies()
+            self.fog = self._create_fog()
+            self.minimap = None
+        if self.minimap is None or self.minimap.game_map is not self.game_map:
+            # Carte rechargée depuis le disque après une éviction du cache
+            visible = self.minimap.visible if self.minimap else True
+            if self.minimap:
+                self.minimap.close()
+            self.minimap = Minimap(self.game_map, fog=self.fog)
+            self.minimap.visible = visible
+        
+        print(f"Entered zone '{portal.target_zone}' at ({self.player.x}, {self.player.y})")
+
+    def on_exit(self):
+        """Arrête les threads des cartes (chargement, chemins en arrière-plan)."""
+        self.minimap.close()
+        if self.zone_world:
+            self.zone_world.close()
+        else:
+            self.game_map.close()
+
     def handle_event(self, event: pygame.event.Event):
         # Let menu manager handle input first
         if self.menu_manager.handle_input(event):
@@ -190,6 +269,9 @@ class GameScene(Scene):
             elif event.key in [pygame.K_1, pygame.K_2, pygame.K_3]:
                 # Changement d'arme (works both in game and menus)
                 self.player.handle_weapon_switch(event.key)
+            elif event.key == pygame.K_TAB:
+                # Afficher/masquer la mini-carte
+                self.minimap.visible = not self.minimap.visible
             elif event.key == pygame.K_m:
                 # Toggle mute all audio
                 self.sound_manager.toggle_mute()
@@ -211,14 +293,51 @@ class GameScene(Scene):
         # Only update game if no menus are open (pause gameplay during menus)
         if not self.menu_manager.is_any_menu_visible():
             self.player.update(dt, self.game_map, self.current_time, self.chest_manager)
+            # Révéler le brouillard autour du joueur (seulement s'il change de tuile)
+            self.fog.update(
+                self.player.x + self.player.width / 2, self.player.y + self.player.height / 2
+            )
+            # Suivre le joueur dans les zones de déclenchement
+            self.trigger_zones.update(
+                self.player.x + self.player.width / 2, self.player.y + self.player.height / 2
+            )
+            
+            if self.zone_world:
+                self.zone_world.update()
+                portal = self.zone_world.check_portal(
+                    self.player.x + self.player.width / 2, self.player.y + self.player.height / 2
+                )
+                if portal:
+                    self.change_zone(portal)
+            
+            # Recharger la carte si son fichier a changé (mode surveillance)
+            if self.game_map.watch:
+                self.map_check_timer += dt
+                if self.map_check_timer >= MAP_CHECK_INTERVAL:
+                    self.map_check_timer = 0.0
+                    if self.game_map.reload_if_changed():
+                        print("Carte rechargée")
             
             # Mettre à jour les coffres
             self.chest_manager.update(dt)
             
+            # Champ de flux partagé vers le joueur, intégré à la demande des poursuivants
+            self.game_map.flow_field.update(
+                self.player.x + self.player.width / 2, self.player.y + self.player.height / 2
+            )
+            
+            # Appliquer quelques chemins calculés en arrière-plan (plafond par frame)
+            if self.game_map.has_path_queue:
+                self.game_map.path_queue.update()
+            
             # Mettre à jour les ennemis (alive and corpses for animations)
             for enemy in self.enemies[:]:  # Copie pour éviter modifications pendant iteration
-                # Pass player and other enemies for collision detection
-                enemy.update(dt, self.current_time, self.game_map, self.chest_manager, self.player, self.enemies)
+                # Pass player and the enemy index for collision detection
+                enemy.update(
+                    dt, self.current_time, self.game_map, self.chest_manager, self.player, self.enemies,
+                    self.enemy_index,
+                )
+                self.enemy_index.move(enemy, enemy.x, enemy.y, enemy.width, enemy.height)
             
             # Vérifier les collisions d'attaque du joueur
             if self.player.is_attacking:
@@ -230,6 +349,7 @@ class GameScene(Scene):
         screen_height = 600
         self.camera_x = self.player.x - screen_width // 2
         self.camera_y = self.player.y - screen_height // 2
+        self.game_map.update_view(self.camera_x, self.camera_y, screen_width, screen_height)
 
     def render(self, screen: pygame.Surface):
         # Render terrain layer first
@@ -284,6 +404,9 @@ class GameScene(Scene):
                 enemy.render(screen)
                 enemy.x, enemy.y = old_enemy_x, old_enemy_y
 
+        # Brouillard de guerre par-dessus le monde, sous l'interface
+        self.fog.render(screen, self.camera_x, self.camera_y)
+
         # Render UI elements on top
         font = pygame.font.Font(None, 36)
         level_text = font.render(f"Level: {self.player.level}", True, (255, 255, 255))
@@ -304,10 +427,8 @@ class GameScene(Scene):
         damage = self.player.get_attack_damage()
         weapon_text = font.render(f"Weapon: {weapon_name} ({damage} dmg)", True, (255, 255, 255))
         
-        # Interaction prompt
-        player_center_x = self.player.x + self.player.width / 2
-        player_center_y = self.player.y + self.player.height / 2
-        nearby_chest = self.chest_manager.find_interactable_chest(player_center_x, player_center_y)
+        # Interaction prompt (zones mises à jour par update)
+        nearby_chest = self.chest_manager.get_interactable_chest()
         
         # Gold display
         gold_text = font.render(f"Gold: {self.player.gold}", True, (255, 215, 0))
@@ -333,9 +454,43 @@ class GameScene(Scene):
             prompt_y = screen.get_height() - 60
             screen.blit(prompt_text, (prompt_x, prompt_y))
         
+        # Mini-carte : ennemis et coffres cherchés dans la seule zone affichée
+        self.minimap.update()
+        self.minimap.render(
+            screen,
+            self.player.x + self.player.width / 2,
+            self.player.y + self.player.height / 2,
+            [
+                (self._query_minimap_enemies, (220, 40, 40)),
+                (self._query_minimap_chests, (255, 215, 0)),
+            ],
+        )
+        
         # Render menus on top of everything
         self.menu_manager.render(screen)
     
+    def _create_fog(self) -> FogOfWar:
+        fog = FogOfWar(self.game_map.width, self.game_map.height, self.game_map.tile_size)
+        # Révéler dès l'arrivée, avant la première mise à jour
+        fog.update(
+            self.player.x + self.player.width / 2, self.player.y + self.player.height / 2
+        )
+        return fog
+    
+    def _query_minimap_enemies(self, x: float, y: float, width: float, height: float):
+        return [
+            enemy
+            for enemy in self.enemy_index.query_rect(x, y, width, height)
+            if enemy.is_alive
+        ]
+    
+    def _query_minimap_chests(self, x: float, y: float, width: float, height: float):
+        return [
+            zone.owner
+            for zone in self.trigger_zones.index.query_rect(x, y, width, height)
+            if zone.kind == "chest" and not zone.owner.is_opened
+        ]
+    
     # Menu callback methods
     def _resume_game(self):
         """Resume the game by closing all menus."""
@@ -31,6 +31,7 @@ class ControlsMenu(Menu):
             ("  Interact/Open Chest", "E"),
             ("  Open Inventory", "I"),
             ("  Open Equipment", "E (when not near objects)"),
+            ("  Toggle Minimap", "TAB"),
             ("", ""),  # Spacer
             ("Menu", ""),
             ("  Open/Close Menu", "ESC"),
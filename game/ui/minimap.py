@@ -0,0 +1,217 @@
+"""
+Minimap
+
+Overlay showing the map around the player at one pixel per tile.
+"""
+
+from typing import Callable, Iterable, List, Tuple
+
+import pygame
+
+from game.world.streaming_map import StreamingMap
+from game.world.tile_palette import (
+    PALETTE_COLORS,
+    PALETTE_OBJECTS,
+    TILE_RENDER_COLORS,
+    VOID_TILE_ID,
+)
+
+# Palette of the minimap surface, indexed by tile id. Object markers keep
+# their own color so buildings and forests stand out from the ground.
+MINIMAP_COLORS: List[Tuple[int, int, int]] = [
+    render_color if obj is None else marker_color
+    for render_color, marker_color, obj in zip(
+        TILE_RENDER_COLORS, PALETTE_COLORS, PALETTE_OBJECTS
+    )
+] + [(0, 0, 0)] * (256 - len(PALETTE_COLORS))
+
+# Query of the entities inside a world rectangle (x, y, width, height), and the
+# color of their markers
+MarkerLayer = Tuple[
+    Callable[[float, float, float, float], Iterable], Tuple[int, int, int]
+]
+
+
+class Minimap:
+    """Minimap surface built once from the tile grid and kept up to date.
+
+    The surface is 8-bit with the tile palette, so building it is a single
+    write of the tile id bytes. Changed tiles are then redrawn one pixel at a
+    time through the map's tile listeners, and streamed regions are drawn
+    when they first get loaded and stay drawn (explored) afterwards. With a
+    fog of war, only the tiles it reveals are drawn, as they get revealed.
+    """
+
+    def __init__(self, game_map, view_tiles: int = 96, scale: int = 2, fog=None):
+        self.game_map = game_map
+        self.fog = fog
+        self.view_tiles = view_tiles
+        self.scale = scale
+        self.margin = 10
+        self.visible = True
+        self.border_color = (200, 200, 200)
+        self.player_color = (255, 255, 255)
+
+        size = (game_map.width, game_map.height)
+        if isinstance(game_map, StreamingMap) or fog is not None:
+            # Nothing is explored yet
+            tile_ids = bytes((VOID_TILE_ID,)) * (game_map.width * game_map.height)
+        else:
+            tile_ids = bytes(game_map.tile_ids)
+        self.surface = self._make_surface(tile_ids, size)
+        self._drawn_regions = set()
+        game_map.tile_listeners.append(self._on_tile_changed)
+        if fog is not None:
+            # Only tiles under the fog's explored bits are drawn
+            fog.reveal_listeners.append(self._on_tiles_revealed)
+            self._on_tiles_revealed(fog.explored.iter_explored())
+        self.update()
+
+    @staticmethod
+    def _make_surface(tile_ids: bytes, size: Tuple[int, int]) -> pygame.Surface:
+        surface = pygame.image.frombytes(tile_ids, size, "P")
+        surface.set_palette(MINIMAP_COLORS)
+        return surface
+
+    def close(self):
+        """Stop following the map's tile changes and the fog's reveals."""
+        if self._on_tile_changed in self.game_map.tile_listeners:
+            self.game_map.tile_listeners.remove(self._on_tile_changed)
+        if (
+            self.fog is not None
+            and self._on_tiles_revealed in self.fog.reveal_listeners
+        ):
+            self.fog.reveal_listeners.remove(self._on_tiles_revealed)
+
+    def _on_tile_changed(self, tile_x: int, tile_y: int, tile_id: int):
+        if self.fog is None or self.fog.explored.is_explored(tile_x, tile_y):
+            self.surface.set_at((tile_x, tile_y), MINIMAP_COLORS[tile_id])
+
+    def _on_tiles_revealed(self, tiles: Iterable[Tuple[int, int]]):
+        get_tile_id = self.game_map.get_tile_id_at_grid
+        set_at = self.surface.set_at
+        for tile_x, tile_y in tiles:
+            tile_id = get_tile_id(tile_x, tile_y)
+            # Tiles of regions that are not resident are drawn once they are
+            if tile_id != VOID_TILE_ID:
+                set_at((tile_x, tile_y), MINIMAP_COLORS[tile_id])
+
+    def update(self):
+        """Draw the streamed regions loaded since the last update.
+
+        With a fog of war, the explored tiles of a region are drawn each time
+        it becomes resident, as they read as void while it is not.
+        """
+        regions = getattr(self.game_map, "regions", None)
+        if regions is None:
+            return
+        if self.fog is not None:
+            resident = set(regions)
+            for key in resident - self._drawn_regions:
+                self._draw_explored(regions[key])
+            self._drawn_regions = resident
+            return
+        for key, region in list(regions.items()):
+            if key in self._drawn_regions:
+                continue
+            self._drawn_regions.add(key)
+            self.surface.blit(
+                self._make_surface(
+                    bytes(region.tile_ids), (region.width, region.height)
+                ),
+                (region.origin_x, region.origin_y),
+            )
+
+    def _draw_explored(self, region):
+        is_explored = self.fog.explored.is_explored
+        set_at = self.surface.set_at
+        for y in range(region.height):
+            tile_y = region.origin_y + y
+            row = y * region.width
+            for x in range(region.width):
+                tile_x = region.origin_x + x
+                if is_explored(tile_x, tile_y):
+                    set_at((tile_x, tile_y), MINIMAP_COLORS[region.tile_ids[row + x]])
+
+    def get_view_rect(self, center_x: float, center_y: float) -> pygame.Rect:
+        """Tiles shown around a world point, kept inside the map."""
+        tile_size = self.game_map.tile_size
+        width = min(self.view_tiles, self.game_map.width)
+        height = min(self.view_tiles, self.game_map.height)
+        left = int(center_x // tile_size) - width // 2
+        top = int(center_y // tile_size) - height // 2
+        left = max(0, min(left, self.game_map.width - width))
+        top = max(0, min(top, self.game_map.height - height))
+        return pygame.Rect(left, top, width, height)
+
+    def render(
+        self,
+        screen: pygame.Surface,
+        center_x: float,
+        center_y: float,
+        marker_layers: Iterable[MarkerLayer] = (),
+    ):
+        """Draw the minimap in the top right corner of the screen.
+
+        Markers are only looked up inside the shown area, through each layer's
+        spatial query, and only drawn on explored tiles.
+        """
+        if not self.visible:
+            return
+
+        view = self.get_view_rect(center_x, center_y)
+        scale = self.scale
+        screen_x = screen.get_width() - view.width * scale - self.margin
+        screen_y = self.margin
+        screen.blit(
+            pygame.transform.scale(
+                self.surface.subsurface(view), (view.width * scale, view.height * scale)
+            ),
+            (screen_x, screen_y),
+        )
+
+        tile_size = self.game_map.tile_size
+        world_rect = (
+            view.x * tile_size,
+            view.y * tile_size,
+            view.width * tile_size,
+            view.height * tile_size,
+        )
+
+        def draw_marker(x: float, y: float, color: Tuple[int, int, int]):
+            marker_x = int(x // tile_size) - view.x
+            marker_y = int(y // tile_size) - view.y
+            if 0 <= marker_x < view.width and 0 <= marker_y < view.height:
+                screen.fill(
+                    color,
+                    (
+                        screen_x + marker_x * scale - 1,
+                        screen_y + marker_y * scale - 1,
+                        scale + 2,
+                        scale + 2,
+                    ),
+                )
+
+        # Entities on tiles the fog still hides get no marker
+        is_explored = None if self.fog is None else self.fog.explored.is_explored
+        for query, color in marker_layers:
+            for entity in query(*world_rect):
+                x = entity.x + entity.width / 2
+                y = entity.y + entity.height / 2
+                if is_explored is None or is_explored(
+                    int(x // tile_size), int(y // tile_size)
+                ):
+                    draw_marker(x, y, color)
+        draw_marker(center_x, center_y, self.player_color)
+
+        pygame.draw.rect(
+            screen,
+            self.border_color,
+            (
+                screen_x - 1,
+                screen_y - 1,
+                view.width * scale + 2,
+                view.height * scale + 2,
+            ),
+            1,
+        )
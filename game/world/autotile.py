@@ -0,0 +1,126 @@
+"""Neighbour masks selecting terrain tile variants.
+
+Each tile gets a 4-neighbour mask with one bit per side, set when the tile on
+that side is drawn as the same terrain. Masks are computed for the whole grid
+at load and the chosen variants are baked into the terrain chunk cache, so
+transitions cost nothing per frame.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+import pygame
+
+from game.world.map_scan import numpy, use_vectorized
+from game.world.tile_palette import TILE_RENDER_COLORS
+
+NORTH = 1
+EAST = 2
+SOUTH = 4
+WEST = 8
+ALL_SIDES = NORTH | EAST | SOUTH | WEST
+
+# Tiles drawn with the same color connect, e.g. grass, spawn markers and the
+# ground under objects
+TILE_GROUP_TABLE = bytes(
+    TILE_RENDER_COLORS.index(color) for color in TILE_RENDER_COLORS
+).ljust(256, b"\xff")
+
+
+def compute_masks(
+    tile_ids, width: int, height: int, vectorized: Optional[bool] = None
+) -> bytearray:
+    """Compute the mask of every tile of a row-major grid.
+
+    Sides past the map edge count as connected.
+    """
+    groups = bytes(tile_ids).translate(TILE_GROUP_TABLE)
+    if use_vectorized(vectorized):
+        grid = numpy.frombuffer(groups, dtype=numpy.uint8).reshape(height, width)
+        padded = numpy.pad(grid, 1, mode="edge")
+        masks = (
+            (padded[:-2, 1:-1] == grid) * NORTH
+            | (padded[1:-1, 2:] == grid) * EAST
+            | (padded[2:, 1:-1] == grid) * SOUTH
+            | (padded[1:-1, :-2] == grid) * WEST
+        )
+        return bytearray(masks.astype(numpy.uint8).tobytes())
+
+    masks = bytearray(width * height)
+    for tile_y in range(height):
+        start = tile_y * width
+        row = groups[start : start + width]
+        above = groups[start - width : start] if tile_y > 0 else row
+        below = (
+            groups[start + width : start + 2 * width] if tile_y < height - 1 else row
+        )
+        right = row[1:] + row[-1:]
+        left = row[:1] + row[:-1]
+        masks[start : start + width] = bytes(
+            (north == group) * NORTH
+            | (east == group) * EAST
+            | (south == group) * SOUTH
+            | (west == group) * WEST
+            for group, north, east, south, west in zip(row, above, right, below, left)
+        )
+    return masks
+
+
+def compute_tile_mask(
+    get_tile_id: Callable[[int, int], int],
+    tile_x: int,
+    tile_y: int,
+    width: int,
+    height: int,
+) -> int:
+    """Compute the mask of one tile from a tile id lookup."""
+    group = TILE_GROUP_TABLE[get_tile_id(tile_x, tile_y)]
+    mask = 0
+    for bit, neighbour_x, neighbour_y in (
+        (NORTH, tile_x, tile_y - 1),
+        (EAST, tile_x + 1, tile_y),
+        (SOUTH, tile_x, tile_y + 1),
+        (WEST, tile_x - 1, tile_y),
+    ):
+        if (
+            not (0 <= neighbour_x < width and 0 <= neighbour_y < height)
+            or TILE_GROUP_TABLE[get_tile_id(neighbour_x, neighbour_y)] == group
+        ):
+            mask |= bit
+    return mask
+
+
+class AutotileSet:
+    """Tile variant surfaces by (tile id, mask), drawn on first use.
+
+    Until there is tile art, a variant is the flat tile color with a darker
+    strip on each side bordering another terrain.
+    """
+
+    def __init__(self, tile_size: int):
+        self.tile_size = tile_size
+        self.border = max(1, tile_size // 8)
+        self._variants: Dict[Tuple[int, int], pygame.Surface] = {}
+
+    def get_variant(self, tile_id: int, mask: int) -> pygame.Surface:
+        key = (tile_id, mask)
+        variant = self._variants.get(key)
+        if variant is None:
+            variant = self._variants[key] = self._draw_variant(tile_id, mask)
+        return variant
+
+    def _draw_variant(self, tile_id: int, mask: int) -> pygame.Surface:
+        size, border = self.tile_size, self.border
+        color = TILE_RENDER_COLORS[tile_id]
+        edge_color = tuple(channel * 3 // 4 for channel in color)
+
+        variant = pygame.Surface((size, size))
+        variant.fill(color)
+        for bit, rect in (
+            (NORTH, (0, 0, size, border)),
+            (EAST, (size - border, 0, border, size)),
+            (SOUTH, (0, size - border, size, border)),
+            (WEST, (0, 0, border, size)),
+        ):
+            if not mask & bit:
+                variant.fill(edge_color, rect)
+        return variant
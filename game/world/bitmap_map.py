@@ -1,43 +1,231 @@
-from typing import List, Tuple
+import os
+import struct
+import zlib
+from collections import Counter
+from typing import Callable, Iterable, List, Optional, Tuple
 
 import pygame
 
+from game.world.autotile import ALL_SIDES, compute_masks, compute_tile_mask
+from game.world.blocked_area_table import BlockedAreaTable
+from game.world.clearance_map import MAX_CLEARANCE, ClearanceMap
+from game.world.compiled_map import CompiledMap, find_compiled_map
+from game.world.flow_field import FlowField
 from game.world.game_object import GameObject
-from game.world.object_types import get_object_type, is_object_color
-from game.world.tile_types import TileType, get_tile_type
+from game.world.hierarchical_pathfinding import HierarchicalPathfinder
+from game.world.layered_map import TRIGGER_SPAWN, LayeredMap, is_layered_map
+from game.world.line_of_sight import LineOfSight
+from game.world.map_scan import decode_surface, find_object_markers
+from game.world.object_types import ObjectType
+from game.world.path_queue import PathQueue
+from game.world.pathfinding import GridPathfinder
+from game.world.region_labels import RegionLabels
+from game.world.spatial_index import SpatialGrid
+from game.world.terrain_cache import TerrainChunkCache
+from game.world.tile_palette import (
+    FIRST_OBJECT_TILE_ID,
+    PALETTE_OBJECTS,
+    PALETTE_TILES,
+    SPAWN_TILE_ID,
+    TILE_BLOCKED_TABLE,
+    TILE_WALKABLE,
+    VOID_TILE_ID,
+    decode_rgb,
+)
+from game.world.tile_types import TileType
 
 
 class BitmapMap:
-    def __init__(self, map_path: str, tile_size: int = 32):
+    def __init__(
+        self,
+        map_path: str,
+        tile_size: int = 32,
+        vectorized: Optional[bool] = None,
+        use_compiled: bool = True,
+        watch: bool = False,
+        autotile: bool = False,
+        defer_objects: bool = False,
+    ):
         self.tile_size = tile_size
-        self.map_surface = pygame.image.load(map_path)
-        self.width = self.map_surface.get_width()
-        self.height = self.map_surface.get_height()
-        self.pixel_array = pygame.PixelArray(self.map_surface)
+        # Loader path: True/False forces NumPy or pure Python, None picks NumPy
+        # whenever it is installed
+        self.vectorized = vectorized
+        # Watch mode: reload_if_changed() applies edits of the map file in place
+        self.map_path = map_path
+        self.watch = watch
+        self._map_mtime = os.path.getmtime(map_path) if watch else None
+        self._row_digests: Optional[List[int]] = None
+        # Deferred objects: markers are kept as (tile x, tile y, object type)
+        # until create_objects(), for maps loaded off the main thread
+        self.defer_objects = defer_objects
+        self.pending_objects: List[Tuple[int, int, ObjectType]] = []
+
+        # A watched map is read from its image, which is what gets edited
+        compiled_path = (
+            find_compiled_map(map_path) if use_compiled and not watch else None
+        )
+        if is_layered_map(map_path):
+            self.watch = False  # Only map images are watched
+            self._load_layered(map_path)
+        elif not (compiled_path and self._load_compiled(compiled_path)):
+            self._load_image(map_path)
+        self.object_index = self._build_object_index()
+        self.blocked_table = BlockedAreaTable(
+            self.collision_grid, self.width, self.height, vectorized
+        )
+        # Autotile neighbour masks, baked into the terrain chunks. Off by default,
+        # tiles are then drawn flat as before
+        self.tile_masks = (
+            compute_masks(self.tile_ids, self.width, self.height, vectorized)
+            if autotile
+            else None
+        )
+        self.terrain_cache = TerrainChunkCache(self)
+        self._clearance_map: Optional[ClearanceMap] = None
+        self._line_of_sight: Optional[LineOfSight] = None
+        self._pathfinder: Optional[GridPathfinder] = None
+        self._flow_field: Optional[FlowField] = None
+        self._path_queue: Optional[PathQueue] = None
+        self._region_labels: Optional[RegionLabels] = None
+        # Called with (tile_x, tile_y, blocked) whenever a tile's collision
+        # changes, so derived navigation data can update just that tile
+        self.collision_listeners: List[Callable[[int, int, bool], None]] = []
+        # Called with (tile_x, tile_y, tile_id) whenever a terrain tile changes
+        self.tile_listeners: List[Callable[[int, int, int], None]] = []
+        # Cluster entrance graph for long paths, ready before the first search.
+        # Distances inside a cluster are still computed when a search first
+        # goes through it, precompute_distances() takes seconds on large maps
+        self.hierarchical_pathfinder = HierarchicalPathfinder(
+            self, vectorized=vectorized
+        )
+
+    @property
+    def clearance_map(self) -> ClearanceMap:
+        """Free square sizes per tile, built on first use and kept up to date."""
+        if self._clearance_map is None:
+            self._clearance_map = ClearanceMap(
+                self.collision_grid, self.width, self.height, self.vectorized
+            )
+        return self._clearance_map
+
+    @property
+    def line_of_sight(self) -> LineOfSight:
+        """Memoized sight lines over blocked tiles, built on first use."""
+        if self._line_of_sight is None:
+            self._line_of_sight = LineOfSight(self)
+        return self._line_of_sight
+
+    @property
+    def pathfinder(self) -> GridPathfinder:
+        """Cached A* searches over blocked tiles, built on first use."""
+        if self._pathfinder is None:
+            self._pathfinder = GridPathfinder(self)
+        return self._pathfinder
+
+    @property
+    def flow_field(self) -> FlowField:
+        """Shared field leading chasers to the player, built on first use."""
+        if self._flow_field is None:
+            self._flow_field = FlowField(self)
+        return self._flow_field
+
+    @property
+    def region_labels(self) -> RegionLabels:
+        """Walkable regions to reject unreachable goals, labeled on first use."""
+        if self._region_labels is None:
+            self._region_labels = RegionLabels(self)
+        return self._region_labels
+
+    @property
+    def path_queue(self) -> PathQueue:
+        """Background path searches, the worker starts on first use."""
+        if self._path_queue is None:
+            self._path_queue = PathQueue(self)
+        return self._path_queue
+
+    @property
+    def has_path_queue(self) -> bool:
+        """Check whether the background path worker was started."""
+        return self._path_queue is not None
+
+    def create_objects(self):
+        """Create the objects of deferred markers (GameObjects load their sprites)."""
+        self.defer_objects = False
+        for tile_x, tile_y, object_type in self.pending_objects:
+            obj = self._create_object(object_type, tile_x, tile_y)
+            self.objects.append(obj)
+            self.object_index.insert(obj, obj.x, obj.y, obj.width, obj.height)
+        self.pending_objects = []
+
+    def close(self):
+        """Stop the background path worker, if it was started."""
+        if self._path_queue is not None:
+            self._path_queue.close()
+            self._path_queue = None
+
+    def _load_image(self, map_path: str):
+        map_surface = pygame.image.load(map_path)
+        self.width = map_surface.get_width()
+        self.height = map_surface.get_height()
+        # Decode the image once into one tile id byte per tile (row-major), the
+        # surface itself is not kept after load
+        self.tile_ids = decode_surface(map_surface, self.vectorized)
+        if self.watch:
+            self._row_digests = self._get_row_digests(
+                pygame.image.tobytes(map_surface, "RGB")
+            )
 
         self.spawn_point = self._find_spawn_point()
         self.objects = self._load_objects()
         self.object_collision_tiles = self._build_object_collision_map()
+        self.collision_grid = self._build_collision_grid()
+
+    def _load_compiled(self, compiled_path: str) -> bool:
+        """Open a compiled map without copying its grids, False if unusable."""
+        try:
+            compiled = CompiledMap(compiled_path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Warning: Could not open compiled map '{compiled_path}': {e}")
+            return False
+
+        self.width = compiled.width
+        self.height = compiled.height
+        self.tile_ids = compiled.tile_ids
+        self.collision_grid = compiled.collision_grid
+        self.spawn_point = self._find_walkable_spawn_near(*compiled.spawn_tile)
+        self.objects = self._load_objects(compiled.object_markers)
+        self.object_collision_tiles = self._build_object_collision_map()
+        return True
+
+    def _load_layered(self, layered_path: str):
+        """Load a layered map, objects and spawn come from their own layers."""
+        layered = LayeredMap(layered_path, self.vectorized)
+        self.width = layered.width
+        self.height = layered.height
+        self.tile_ids = layered.terrain
+        self.collision_grid = layered.collision
+
+        spawn_index = layered.triggers.find(TRIGGER_SPAWN)
+        if spawn_index == -1:
+            self.spawn_point = self._find_walkable_spawn_near(1, 1)
+        else:
+            self.spawn_point = self._find_walkable_spawn_near(
+                *reversed(divmod(spawn_index, self.width))
+            )
+        self.objects = self._load_objects(
+            find_object_markers(layered.decoration, self.vectorized)
+        )
+        self.object_collision_tiles = self._build_object_collision_map()
 
     def _find_spawn_point(self) -> Tuple[float, float]:
-        spawn_tile_x, spawn_tile_y = None, None
-        
         # First, find the red spawn marker
-        for y in range(self.height):
-            for x in range(self.width):
-                color = self.map_surface.unmap_rgb(self.pixel_array[x, y])
-                color_tuple = (
-                    (color.r, color.g, color.b) if hasattr(color, "r") else color
-                )
-                if color_tuple == (255, 0, 0):
-                    spawn_tile_x, spawn_tile_y = x, y
-                    break
-            if spawn_tile_x is not None:
-                break
+        spawn_index = self.tile_ids.find(SPAWN_TILE_ID)
         
         # If no spawn marker found, use default
-        if spawn_tile_x is None:
+        if spawn_index == -1:
             spawn_tile_x, spawn_tile_y = 1, 1
+        else:
+            spawn_tile_y, spawn_tile_x = divmod(spawn_index, self.width)
         
         return self._find_walkable_spawn_near(spawn_tile_x, spawn_tile_y)
     
@@ -54,123 +242,411 @@ class BitmapMap:
     def find_safe_spawn_position(self) -> Tuple[float, float]:
         """Find a safe spawn position after objects are loaded."""
         spawn_x, spawn_y = self.spawn_point
-        spawn_tile_x = int(spawn_x // self.tile_size)
-        spawn_tile_y = int(spawn_y // self.tile_size)
-        
-        # Check if current spawn is walkable for a player-sized rectangle
-        if self.is_player_spawn_safe(spawn_x, spawn_y):
-            return (spawn_x, spawn_y)
-        
-        # Search in expanding spiral around spawn point
-        for radius in range(1, 10):
+        position = self.find_clear_position(spawn_x, spawn_y)
+        # Fallback: return original spawn point
+        return position if position is not None else (spawn_x, spawn_y)
+
+    def find_clear_position(
+        self,
+        x: float,
+        y: float,
+        width: int = 32,
+        height: int = 32,
+        max_radius: int = 9,
+    ) -> Optional[Tuple[float, float]]:
+        """Find the nearest position, whole tiles away from (x, y), where an entity fits.
+
+        Candidates are searched in rings of growing radius around the starting
+        tile, None when nothing within max_radius tiles fits.
+        """
+        if self.can_entity_fit(x, y, width, height):
+            return (x, y)
+
+        start_tile_x = int(x // self.tile_size)
+        start_tile_y = int(y // self.tile_size)
+        for radius in range(1, max_radius + 1):
             for dx in range(-radius, radius + 1):
                 for dy in range(-radius, radius + 1):
                     if abs(dx) == radius or abs(dy) == radius:  # Only check border of current radius
-                        check_tile_x = spawn_tile_x + dx
-                        check_tile_y = spawn_tile_y + dy
-                        
+                        check_tile_x = start_tile_x + dx
+                        check_tile_y = start_tile_y + dy
+
                         if (0 <= check_tile_x < self.width and 0 <= check_tile_y < self.height):
-                            check_x = check_tile_x * self.tile_size + self.tile_size // 2
-                            check_y = check_tile_y * self.tile_size + self.tile_size // 2
-                            
-                            if self.is_player_spawn_safe(check_x, check_y):
+                            check_x = x + dx * self.tile_size
+                            check_y = y + dy * self.tile_size
+
+                            if self.can_entity_fit(check_x, check_y, width, height):
                                 return (check_x, check_y)
-        
-        # Fallback: return original spawn point
-        return (spawn_x, spawn_y)
-    
+        return None
+
+    def can_entity_fit(self, x: float, y: float, width: int = 32, height: int = 32) -> bool:
+        """Check if an entity with the usual 2px collision margin can stand at (x, y)."""
+        margin = 2
+        start_tile_x = int((x + margin) // self.tile_size)
+        start_tile_y = int((y + margin) // self.tile_size)
+        tiles_x = int((x + width - margin) // self.tile_size) - start_tile_x + 1
+        tiles_y = int((y + height - margin) // self.tile_size) - start_tile_y + 1
+        if tiles_x != tiles_y or tiles_x > MAX_CLEARANCE:
+            return self.is_player_spawn_safe(x, y, width, height)
+        # Square footprints are a single clearance lookup
+        return self.clearance_map.get_clearance(start_tile_x, start_tile_y) >= tiles_x
+
     def is_player_spawn_safe(self, x: float, y: float, player_width: int = 32, player_height: int = 32) -> bool:
         """Check if a player-sized rectangle can be safely placed at this position."""
         margin = 2
-        corners = [
-            (x + margin, y + margin),
-            (x + player_width - margin, y + margin),
-            (x + margin, y + player_height - margin),
-            (x + player_width - margin, y + player_height - margin),
-        ]
-        
-        for corner_x, corner_y in corners:
-            if not self.is_walkable(corner_x, corner_y):
-                return False
-        return True
+        return self.is_rect_walkable(
+            x + margin, y + margin, player_width - 2 * margin, player_height - 2 * margin
+        )
 
-    def _load_objects(self) -> List[GameObject]:
+    def _load_objects(self, markers=None) -> List[GameObject]:
         """Scan the map for object markers and create GameObjects."""
         objects = []
+        if markers is None:
+            markers = find_object_markers(self.tile_ids, self.vectorized)
         
-        for y in range(self.height):
-            for x in range(self.width):
-                color = self.map_surface.unmap_rgb(self.pixel_array[x, y])
-                color_tuple = (
-                    (color.r, color.g, color.b) if hasattr(color, "r") else color
-                )
-                
-                # Check if this color represents an object
-                object_type = get_object_type(color_tuple)
-                if object_type:
-                    # Calculate object position and size
-                    obj_x = x * self.tile_size
-                    obj_y = y * self.tile_size
-                    obj_width = object_type.size[0] * self.tile_size
-                    obj_height = object_type.size[1] * self.tile_size
-                    
-                    # Create GameObject
-                    game_object = GameObject(
-                        name=object_type.name,
-                        x=obj_x,
-                        y=obj_y,
-                        width=obj_width,
-                        height=obj_height,
-                        sprite_path=object_type.sprite_path,
-                        walkable=object_type.walkable,
-                    )
-                    
-                    objects.append(game_object)
+        for index, object_type in markers:
+            y, x = divmod(index, self.width)
+            if self.defer_objects:
+                self.pending_objects.append((x, y, object_type))
+            else:
+                objects.append(self._create_object(object_type, x, y))
         
         return objects
 
-    def _build_object_collision_map(self) -> set[Tuple[int, int]]:
-        """Build a set of tile coordinates that have object collisions."""
-        collision_tiles = set()
+    def _create_object(self, object_type, tile_x: int, tile_y: int) -> GameObject:
+        """Create the GameObject for an object marker found at a tile."""
+        # Calculate object position and size
+        obj_x = tile_x * self.tile_size
+        obj_y = tile_y * self.tile_size
+        obj_width = object_type.size[0] * self.tile_size
+        obj_height = object_type.size[1] * self.tile_size
+        
+        return GameObject(
+            name=object_type.name,
+            x=obj_x,
+            y=obj_y,
+            width=obj_width,
+            height=obj_height,
+            sprite_path=object_type.sprite_path,
+            walkable=object_type.walkable,
+        )
+
+    def _build_object_collision_map(self) -> Counter:
+        """Count the blocking objects covering each tile with object collisions."""
+        collision_tiles = Counter()
         
         for obj in self.objects:
             if not obj.walkable:
                 tiles = obj.get_tile_coverage(self.tile_size)
                 collision_tiles.update(tiles)
+        # Deferred objects block their tiles before they are created
+        for tile_x, tile_y, object_type in self.pending_objects:
+            if not object_type.walkable:
+                width, height = object_type.size
+                collision_tiles.update(
+                    (tile_x + dx, tile_y + dy)
+                    for dy in range(height)
+                    for dx in range(width)
+                )
         
         return collision_tiles
 
+    def _build_object_index(self) -> SpatialGrid:
+        """Index objects by their bounds in 8x8-tile cells."""
+        object_index = SpatialGrid(cell_size=self.tile_size * 8)
+        for obj in self.objects:
+            object_index.insert(obj, obj.x, obj.y, obj.width, obj.height)
+        return object_index
+
+    def _build_collision_grid(self) -> bytearray:
+        """Build one byte per tile, 1 where terrain or an object blocks movement."""
+        collision_grid = self.tile_ids.translate(TILE_BLOCKED_TABLE)
+        for tile_x, tile_y in self.object_collision_tiles:
+            if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+                collision_grid[tile_y * self.width + tile_x] = 1
+        return collision_grid
+
     def get_tile_at_pixel(self, world_x: float, world_y: float) -> TileType:
         tile_x = int(world_x // self.tile_size)
         tile_y = int(world_y // self.tile_size)
         return self.get_tile_at_grid(tile_x, tile_y)
 
-    def get_tile_at_grid(self, tile_x: int, tile_y: int) -> TileType:
+    def get_tile_id_at_grid(self, tile_x: int, tile_y: int) -> int:
+        """Get the palette tile id at a grid position, void when out of bounds."""
         if tile_x < 0 or tile_y < 0 or tile_x >= self.width or tile_y >= self.height:
-            return get_tile_type((0, 0, 0))
+            return VOID_TILE_ID
+        return self.tile_ids[tile_y * self.width + tile_x]
 
-        color = self.map_surface.unmap_rgb(self.pixel_array[tile_x, tile_y])
-        color_tuple = (color.r, color.g, color.b) if hasattr(color, "r") else color
-        return get_tile_type(color_tuple)
+    def get_tile_mask(self, tile_x: int, tile_y: int) -> int:
+        """Get the autotile neighbour mask of an in-bounds tile."""
+        if self.tile_masks is None:
+            return ALL_SIDES
+        return self.tile_masks[tile_y * self.width + tile_x]
 
-    def is_walkable(self, world_x: float, world_y: float) -> bool:
-        # Check terrain walkability
-        if not self.get_tile_at_pixel(world_x, world_y).walkable:
+    def _terrain_changed(self, tile_x: int, tile_y: int):
+        """Update masks and chunks around a changed tile and notify listeners."""
+        if self.tile_masks is None:
+            self.terrain_cache.invalidate_tile(tile_x, tile_y)
+        else:
+            self._update_masks_around(tile_x, tile_y)
+        tile_id = self.get_tile_id_at_grid(tile_x, tile_y)
+        for listener in self.tile_listeners:
+            listener(tile_x, tile_y, tile_id)
+
+    def _update_masks_around(self, tile_x: int, tile_y: int):
+        for neighbour_x, neighbour_y in (
+            (tile_x, tile_y),
+            (tile_x, tile_y - 1),
+            (tile_x + 1, tile_y),
+            (tile_x, tile_y + 1),
+            (tile_x - 1, tile_y),
+        ):
+            if 0 <= neighbour_x < self.width and 0 <= neighbour_y < self.height:
+                self.tile_masks[neighbour_y * self.width + neighbour_x] = (
+                    compute_tile_mask(
+                        self.get_tile_id_at_grid,
+                        neighbour_x,
+                        neighbour_y,
+                        self.width,
+                        self.height,
+                    )
+                )
+        self.terrain_cache.invalidate_tile_neighbourhood(tile_x, tile_y)
+
+    def get_tile_at_grid(self, tile_x: int, tile_y: int) -> TileType:
+        return PALETTE_TILES[self.get_tile_id_at_grid(tile_x, tile_y)]
+
+    def set_tile_at_grid(self, tile_x: int, tile_y: int, tile_id: int) -> bool:
+        """Change a terrain tile, returns False when out of bounds."""
+        if tile_x < 0 or tile_y < 0 or tile_x >= self.width or tile_y >= self.height:
             return False
-        
-        # Check object collisions
-        tile_x = int(world_x // self.tile_size)
-        tile_y = int(world_y // self.tile_size)
-        
-        if (tile_x, tile_y) in self.object_collision_tiles:
+
+        self.tile_ids[tile_y * self.width + tile_x] = tile_id
+        self._set_tile_blocked(
+            tile_x,
+            tile_y,
+            not TILE_WALKABLE[tile_id] or (tile_x, tile_y) in self.object_collision_tiles,
+        )
+        self._terrain_changed(tile_x, tile_y)
+        return True
+
+    def _set_tile_blocked(self, tile_x: int, tile_y: int, blocked: bool):
+        """Update the collision grid and the blocked-area table for one tile."""
+        index = tile_y * self.width + tile_x
+        if bool(self.collision_grid[index]) == blocked:
+            return
+        self.collision_grid[index] = int(blocked)
+        self.blocked_table.update_tile(tile_x, tile_y, 1 if blocked else -1)
+        if self._clearance_map is not None:
+            self._clearance_map.update_tile(tile_x, tile_y)
+        for listener in self.collision_listeners:
+            listener(tile_x, tile_y, blocked)
+
+    def add_obstacle(self, obj: GameObject) -> bool:
+        """Add an object at runtime, blocking its tiles unless it is walkable."""
+        self.objects.append(obj)
+        self.object_index.insert(obj, obj.x, obj.y, obj.width, obj.height)
+        if not obj.walkable:
+            self._add_collision_tiles(obj.get_tile_coverage(self.tile_size))
+        return True
+
+    def remove_obstacle(self, obj: GameObject) -> bool:
+        """Remove an object (e.g. a broken barrel), returns False if not on the map."""
+        if not self.object_index.remove(obj):
             return False
-            
+        self.objects.remove(obj)
+        if not obj.walkable:
+            self._remove_collision_tiles(obj.get_tile_coverage(self.tile_size))
         return True
 
+    def set_obstacle_blocking(self, obj: GameObject, blocking: bool):
+        """Open or close an object in place (e.g. a door), only its tiles are updated."""
+        if obj.walkable != blocking:
+            return
+        obj.walkable = not blocking
+        if blocking:
+            self._add_collision_tiles(obj.get_tile_coverage(self.tile_size))
+        else:
+            self._remove_collision_tiles(obj.get_tile_coverage(self.tile_size))
+
+    def _add_collision_tiles(self, tiles: Iterable[Tuple[int, int]]):
+        for tile in tiles:
+            self.object_collision_tiles[tile] += 1
+            tile_x, tile_y = tile
+            if self.object_collision_tiles[tile] == 1 and (
+                0 <= tile_x < self.width and 0 <= tile_y < self.height
+            ):
+                self._set_tile_blocked(tile_x, tile_y, True)
+
+    def _remove_collision_tiles(self, tiles: Iterable[Tuple[int, int]]):
+        for tile in tiles:
+            self.object_collision_tiles[tile] -= 1
+            if self.object_collision_tiles[tile] > 0:
+                continue
+            # Other objects may still cover the tile, otherwise terrain decides
+            del self.object_collision_tiles[tile]
+            tile_x, tile_y = tile
+            if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+                self._set_tile_blocked(
+                    tile_x,
+                    tile_y,
+                    not TILE_WALKABLE[self.tile_ids[tile_y * self.width + tile_x]],
+                )
+
+    def reload_if_changed(self) -> bool:
+        """In watch mode, apply the edits of a modified map file to the running map.
+
+        Returns True when tiles changed. Entities are left alone, only the
+        changed tiles and their objects, collisions and chunks are updated.
+        """
+        if not self.watch:
+            return False
+        try:
+            mtime = os.path.getmtime(self.map_path)
+        except OSError:
+            return False
+        if mtime <= self._map_mtime:
+            return False
+        self._map_mtime = mtime
+
+        try:
+            map_surface = pygame.image.load(self.map_path)
+        except (pygame.error, FileNotFoundError) as e:
+            # Typically a file caught while the editor is still writing it
+            print(f"Warning: Could not reload map '{self.map_path}': {e}")
+            return False
+        return self.apply_map_surface(map_surface)
+
+    def apply_map_surface(self, map_surface: pygame.Surface) -> bool:
+        """Diff a new version of the map image against the loaded tiles and apply it."""
+        if map_surface.get_size() != (self.width, self.height):
+            print("Warning: Map size changed, restart the game to load it")
+            return False
+
+        rgb = pygame.image.tobytes(map_surface, "RGB")
+        row_digests = self._get_row_digests(rgb)
+        if self._row_digests is None:
+            # No digests of the loaded image (compiled map), decode it all once
+            new_tile_ids = decode_surface(map_surface, self.vectorized)
+            changed_rows = range(self.height)
+        else:
+            new_tile_ids = None
+            changed_rows = [
+                row
+                for row, (old, new) in enumerate(zip(self._row_digests, row_digests))
+                if old != new
+            ]
+        self._row_digests = row_digests
+
+        stride = self.width * 3
+        changes = []
+        for row in changed_rows:
+            start = row * self.width
+            if new_tile_ids is None:
+                new_row = decode_rgb(rgb[row * stride : (row + 1) * stride])
+            else:
+                new_row = new_tile_ids[start : start + self.width]
+            old_row = self.tile_ids[start : start + self.width]
+            if old_row == new_row:
+                continue
+            for tile_x in range(self.width):
+                if old_row[tile_x] != new_row[tile_x]:
+                    changes.append((tile_x, row, old_row[tile_x], new_row[tile_x]))
+
+        self._apply_tile_changes(changes)
+        return bool(changes)
+
+    def _get_row_digests(self, rgb: bytes) -> List[int]:
+        stride = self.width * 3
+        data = memoryview(rgb)
+        return [
+            zlib.crc32(data[row * stride : (row + 1) * stride])
+            for row in range(self.height)
+        ]
+
+    def _apply_tile_changes(self, changes: List[Tuple[int, int, int, int]]):
+        """Apply (tile_x, tile_y, old_id, new_id) changes read from the map file."""
+        # Every id is written before masks are updated, as they read neighbours
+        for tile_x, tile_y, _, new_id in changes:
+            self.tile_ids[tile_y * self.width + tile_x] = new_id
+        for tile_x, tile_y, _, _ in changes:
+            self._terrain_changed(tile_x, tile_y)
+
+        # Objects of removed markers go first, so their tiles are released
+        # before new objects claim them
+        for tile_x, tile_y, old_id, _ in changes:
+            if old_id >= FIRST_OBJECT_TILE_ID:
+                obj = self._find_marker_object(tile_x, tile_y, PALETTE_OBJECTS[old_id])
+                if obj is not None:
+                    self.remove_obstacle(obj)
+        for tile_x, tile_y, _, new_id in changes:
+            if new_id >= FIRST_OBJECT_TILE_ID:
+                self.add_obstacle(
+                    self._create_object(PALETTE_OBJECTS[new_id], tile_x, tile_y)
+                )
+            if new_id == SPAWN_TILE_ID:
+                self.spawn_point = self._find_walkable_spawn_near(tile_x, tile_y)
+
+        for tile_x, tile_y, _, new_id in changes:
+            self._set_tile_blocked(
+                tile_x,
+                tile_y,
+                not TILE_WALKABLE[new_id]
+                or (tile_x, tile_y) in self.object_collision_tiles,
+            )
+
+    def _find_marker_object(
+        self, tile_x: int, tile_y: int, object_type
+    ) -> Optional[GameObject]:
+        """Get the object created for a marker at a tile."""
+        x = tile_x * self.tile_size
+        y = tile_y * self.tile_size
+        for obj in self.object_index.query_point(x, y):
+            if obj.x == x and obj.y == y and obj.name == object_type.name:
+                return obj
+        return None
+
+    def is_tile_blocked(self, tile_x: int, tile_y: int) -> bool:
+        """Check if terrain or an object blocks a tile, out of bounds is blocked."""
+        if tile_x < 0 or tile_y < 0 or tile_x >= self.width or tile_y >= self.height:
+            return True
+        return self.collision_grid[tile_y * self.width + tile_x] != 0
+
+    def is_walkable(self, world_x: float, world_y: float) -> bool:
+        # The collision grid merges terrain and object collisions
+        return not self.is_tile_blocked(
+            int(world_x // self.tile_size), int(world_y // self.tile_size)
+        )
+
+    def is_rect_walkable(self, x: float, y: float, width: float, height: float) -> bool:
+        """Check that no tile touched by a world rectangle is blocked.
+
+        Edges are inclusive, so a rectangle ending exactly on a tile border
+        touches that tile. Entity-sized rectangles read at most four blocks
+        of the blocked-area table.
+        """
+        start_tile_x = int(x // self.tile_size)
+        start_tile_y = int(y // self.tile_size)
+        end_tile_x = int((x + width) // self.tile_size)
+        end_tile_y = int((y + height) // self.tile_size)
+        if (
+            start_tile_x < 0
+            or start_tile_y < 0
+            or end_tile_x >= self.width
+            or end_tile_y >= self.height
+        ):
+            return False
+        return (
+            self.blocked_table.count_blocked(
+                start_tile_x, start_tile_y, end_tile_x, end_tile_y
+            )
+            == 0
+        )
+
     def get_objects_at_point(self, world_x: float, world_y: float) -> List[GameObject]:
         """Get all objects that contain the given point."""
         objects_at_point = []
-        for obj in self.objects:
+        for obj in self.object_index.query_point(world_x, world_y):
             if obj.is_point_inside(world_x, world_y):
                 objects_at_point.append(obj)
         return objects_at_point
@@ -180,51 +656,29 @@ class BitmapMap:
         area_rect = pygame.Rect(int(x), int(y), int(width), int(height))
         intersecting_objects = []
         
-        for obj in self.objects:
+        for obj in self.object_index.query_rect(x, y, width, height):
             if area_rect.colliderect(obj.rect):
                 intersecting_objects.append(obj)
                 
         return intersecting_objects
 
+    def update_view(
+        self, camera_x: float, camera_y: float, view_width: int, view_height: int
+    ):
+        """Hook called once per frame with the camera view, static maps are fully loaded."""
+
     def get_world_size(self) -> Tuple[int, int]:
         return (self.width * self.tile_size, self.height * self.tile_size)
 
     def render_terrain(self, screen: pygame.Surface, camera_x: float, camera_y: float):
-        """Render only the terrain layer."""
-        screen_width = screen.get_width()
-        screen_height = screen.get_height()
-
-        start_tile_x = max(0, int(camera_x // self.tile_size))
-        start_tile_y = max(0, int(camera_y // self.tile_size))
-        end_tile_x = min(
-            self.width, int((camera_x + screen_width) // self.tile_size) + 1
-        )
-        end_tile_y = min(
-            self.height, int((camera_y + screen_height) // self.tile_size) + 1
-        )
-
-        # Render terrain tiles
-        for tile_y in range(start_tile_y, end_tile_y):
-            for tile_x in range(start_tile_x, end_tile_x):
-                color = self.map_surface.unmap_rgb(self.pixel_array[tile_x, tile_y])
-                color_tuple = (color.r, color.g, color.b) if hasattr(color, "r") else color
-                
-                # Skip object colors, render as terrain underneath
-                if is_object_color(color_tuple):
-                    # Render grass underneath objects
-                    tile_type = get_tile_type((34, 139, 34))  # Grass
-                else:
-                    tile_type = get_tile_type(color_tuple)
-
-                screen_x = tile_x * self.tile_size - camera_x
-                screen_y = tile_y * self.tile_size - camera_y
-
-                rect = pygame.Rect(screen_x, screen_y, self.tile_size, self.tile_size)
-                pygame.draw.rect(screen, tile_type.color, rect)
+        """Render only the terrain layer from the pre-rendered chunk cache."""
+        self.terrain_cache.render(screen, camera_x, camera_y)
 
     def render_objects(self, screen: pygame.Surface, camera_x: float, camera_y: float):
-        """Render only the objects layer."""
-        for obj in self.objects:
+        """Render only the objects layer, culled to the camera rectangle."""
+        for obj in self.object_index.query_rect(
+            camera_x, camera_y, screen.get_width(), screen.get_height()
+        ):
             obj.render(screen, camera_x, camera_y)
 
     def render(self, screen: pygame.Surface, camera_x: float, camera_y: float):
@@ -0,0 +1,202 @@
+from array import array
+from typing import Optional
+
+from game.world.map_scan import numpy, use_vectorized
+
+# Side of the square blocks, in tiles. Counts inside a block fit 16 bits up to
+# 255 tiles per side.
+BLOCK_SIZE = 16
+
+
+class BlockedAreaTable:
+    """Blocked tile counts over rectangles of a collision grid.
+
+    The grid is cut in square blocks, each with its own summed-area table,
+    and a 2D Fenwick tree holds the block totals. A rectangle reads the
+    blocks along its border from their tables (four lookups each) and the
+    blocks inside it from the tree, so an entity-sized query touches at most
+    four blocks. A tile change rewrites its block's entries below and to the
+    right of it, plus a few tree nodes, instead of the rest of the map.
+    """
+
+    def __init__(
+        self,
+        collision_grid,
+        width: int,
+        height: int,
+        vectorized: Optional[bool] = None,
+        block_size: int = BLOCK_SIZE,
+    ):
+        self.width = width
+        self.height = height
+        self.block_size = block_size
+        self.blocks_x = -(-width // block_size)
+        self.blocks_y = -(-height // block_size)
+        # Entry (x, y) of a block's table counts the blocked tiles of that
+        # block from its corner up to, but excluding, local tile (x, y)
+        self._block_stride = block_size + 1
+        self._block_entries = self._block_stride * self._block_stride
+
+        if use_vectorized(vectorized):
+            self._tables, totals = self._build_vectorized(collision_grid)
+        else:
+            self._tables, totals = self._build(collision_grid)
+        self._tree = self._build_tree(totals)
+
+    def _build(self, collision_grid):
+        width, size, stride = self.width, self.block_size, self._block_stride
+        tables = array(
+            "H", bytes(2 * self._block_entries * self.blocks_x * self.blocks_y)
+        )
+        totals = []
+        for block_y in range(self.blocks_y):
+            for block_x in range(self.blocks_x):
+                offset = (block_y * self.blocks_x + block_x) * self._block_entries
+                origin_x, origin_y = block_x * size, block_y * size
+                columns = max(0, min(size, width - origin_x))
+                for local_y in range(min(size, self.height - origin_y)):
+                    row_sum = 0
+                    above = offset + local_y * stride
+                    row = above + stride
+                    cells = (origin_y + local_y) * width + origin_x
+                    for local_x in range(size):
+                        if local_x < columns:
+                            row_sum += collision_grid[cells + local_x] != 0
+                        tables[row + local_x + 1] = (
+                            tables[above + local_x + 1] + row_sum
+                        )
+                # Rows past the map edge repeat the last one
+                last = offset + min(size, self.height - origin_y) * stride
+                for row in range(last + stride, offset + self._block_entries, stride):
+                    tables[row : row + stride] = tables[last : last + stride]
+                totals.append(tables[offset + self._block_entries - 1])
+        return tables, totals
+
+    def _build_vectorized(self, collision_grid):
+        size = self.block_size
+        grid = numpy.zeros(
+            (self.blocks_y * size, self.blocks_x * size), dtype=numpy.uint16
+        )
+        grid[: self.height, : self.width] = (
+            numpy.frombuffer(collision_grid, dtype=numpy.uint8).reshape(
+                self.height, self.width
+            )
+            != 0
+        )
+        blocks = grid.reshape(self.blocks_y, size, self.blocks_x, size).swapaxes(1, 2)
+        sums = numpy.zeros(
+            (self.blocks_y, self.blocks_x, size + 1, size + 1), dtype=numpy.uint16
+        )
+        sums[:, :, 1:, 1:] = blocks.cumsum(axis=2).cumsum(axis=3)
+        totals = sums[:, :, size, size].ravel().tolist()
+        return array("H", sums.tobytes()), totals
+
+    def _build_tree(self, totals):
+        """Fenwick tree over the block totals, built in linear time."""
+        tree_stride = self.blocks_x + 1
+        tree = array("i", bytes(4 * tree_stride * (self.blocks_y + 1)))
+        for block_y in range(self.blocks_y):
+            row = (block_y + 1) * tree_stride
+            start = block_y * self.blocks_x
+            tree[row + 1 : row + tree_stride] = array(
+                "i", totals[start : start + self.blocks_x]
+            )
+        for node_y in range(1, self.blocks_y + 1):
+            row = node_y * tree_stride
+            for node_x in range(1, self.blocks_x + 1):
+                parent = node_x + (node_x & -node_x)
+                if parent <= self.blocks_x:
+                    tree[row + parent] += tree[row + node_x]
+        for node_y in range(1, self.blocks_y + 1):
+            parent = node_y + (node_y & -node_y)
+            if parent <= self.blocks_y:
+                for node_x in range(1, self.blocks_x + 1):
+                    tree[parent * tree_stride + node_x] += tree[
+                        node_y * tree_stride + node_x
+                    ]
+        return tree
+
+    def _blocks_before(self, block_x: int, block_y: int) -> int:
+        """Blocked tiles in the blocks left of block_x and above block_y."""
+        tree, tree_stride = self._tree, self.blocks_x + 1
+        total = 0
+        node_y = block_y
+        while node_y > 0:
+            node_x = block_x
+            while node_x > 0:
+                total += tree[node_y * tree_stride + node_x]
+                node_x -= node_x & -node_x
+            node_y -= node_y & -node_y
+        return total
+
+    def _count_in_block(
+        self,
+        block_x: int,
+        block_y: int,
+        start_x: int,
+        start_y: int,
+        end_x: int,
+        end_y: int,
+    ) -> int:
+        size, stride = self.block_size, self._block_stride
+        origin_x, origin_y = block_x * size, block_y * size
+        left = max(start_x - origin_x, 0)
+        right = min(end_x - origin_x, size - 1) + 1
+        top = max(start_y - origin_y, 0) * stride
+        bottom = (min(end_y - origin_y, size - 1) + 1) * stride
+        offset = (block_y * self.blocks_x + block_x) * self._block_entries
+        table = self._tables
+        return (
+            table[offset + bottom + right]
+            - table[offset + top + right]
+            - table[offset + bottom + left]
+            + table[offset + top + left]
+        )
+
+    def count_blocked(self, start_x: int, start_y: int, end_x: int, end_y: int) -> int:
+        """Count blocked tiles in an inclusive, in-bounds rectangle of tiles."""
+        size = self.block_size
+        first_x, last_x = start_x // size, end_x // size
+        first_y, last_y = start_y // size, end_y // size
+
+        count = 0
+        if last_x - first_x > 1 and last_y - first_y > 1:
+            # Blocks fully inside the rectangle
+            count = (
+                self._blocks_before(last_x, last_y)
+                - self._blocks_before(first_x + 1, last_y)
+                - self._blocks_before(last_x, first_y + 1)
+                + self._blocks_before(first_x + 1, first_y + 1)
+            )
+        for block_y in range(first_y, last_y + 1):
+            if block_y in (first_y, last_y) or last_x - first_x <= 1:
+                columns = range(first_x, last_x + 1)
+            else:
+                columns = (first_x, last_x)
+            for block_x in columns:
+                count += self._count_in_block(
+                    block_x, block_y, start_x, start_y, end_x, end_y
+                )
+        return count
+
+    def update_tile(self, tile_x: int, tile_y: int, delta: int):
+        """Add delta (+1 blocked, -1 cleared) for one tile."""
+        size, stride = self.block_size, self._block_stride
+        block_x, local_x = divmod(tile_x, size)
+        block_y, local_y = divmod(tile_y, size)
+        offset = (block_y * self.blocks_x + block_x) * self._block_entries
+        table = self._tables
+        for row in range(
+            offset + (local_y + 1) * stride, offset + self._block_entries, stride
+        ):
+            for index in range(row + local_x + 1, row + stride):
+                table[index] += delta
+
+        tree, tree_stride = self._tree, self.blocks_x + 1
+        node_y = block_y + 1
+        while node_y <= self.blocks_y:
+            node_x = block_x + 1
+            while node_x <= self.blocks_x:
+                tree[node_y * tree_stride + node_x] += delta
+                node_x += node_x & -node_x
+            node_y += node_y & -node_y
@@ -6,6 +6,8 @@ from typing import List, Optional
 
 from game.world.game_object import GameObject
 from game.world.loot import LootItem, loot_generator
+from game.world.spatial_index import SpatialGrid
+from game.world.trigger_zones import TriggerZone, TriggerZoneManager
 from game.graphics.sprite_manager import SpriteManager
 from game.graphics.animation import Animation, AnimationSet, AnimationMode
 from game.graphics.sprite_sheet import SpriteSheet
@@ -223,12 +225,30 @@ class ChestObject(GameObject):
 class ChestManager:
     """Gestionnaire pour tous les coffres du jeu."""
     
-    def __init__(self):
+    def __init__(self, trigger_zones: Optional[TriggerZoneManager] = None):
         self.chests: List[ChestObject] = []
+        # Boîtes des coffres, pour les collisions autour d'un déplacement
+        self.chest_index = SpatialGrid(cell_size=256)
+        # Rayons d'interaction indexés, partagés avec les autres déclencheurs
+        self.trigger_zones = trigger_zones if trigger_zones is not None else TriggerZoneManager()
+        # Zones où se trouve le joueur, tenues à jour par les événements entrée/sortie
+        self.nearby_zones: List[TriggerZone] = []
     
     def add_chest(self, chest: ChestObject):
         """Ajoute un coffre au gestionnaire."""
         self.chests.append(chest)
+        self.chest_index.insert(chest, chest.x, chest.y, chest.width, chest.height)
+        self.trigger_zones.add_zone(
+            TriggerZone(
+                "chest",
+                chest,
+                chest.x + chest.width / 2,
+                chest.y + chest.height / 2,
+                chest.interaction_radius,
+                on_enter=self.nearby_zones.append,
+                on_exit=self.nearby_zones.remove,
+            )
+        )
     
     def create_chest(self, x: float, y: float, chest_type: str = "basic_chest") -> ChestObject:
         """Crée et ajoute un nouveau coffre."""
@@ -236,23 +256,36 @@ class ChestManager:
         self.add_chest(chest)
         return chest
     
+    def get_chests_in_rect(self, x: float, y: float, width: float, height: float) -> List[ChestObject]:
+        """Coffres candidats autour d'un rectangle (test exact laissé à l'appelant)."""
+        return self.chest_index.query_rect(x, y, width, height)
+    
     def find_interactable_chest(self, player_x: float, player_y: float) -> Optional[ChestObject]:
         """Trouve le coffre le plus proche avec lequel le joueur peut interagir."""
+        return self._closest_unopened(
+            self.trigger_zones.zones_at(player_x, player_y, "chest"), player_x, player_y
+        )
+    
+    def update_player_position(self, player_x: float, player_y: float):
+        """Suit le joueur dans les zones d'interaction (événements entrée/sortie)."""
+        self.trigger_zones.update(player_x, player_y)
+    
+    def get_interactable_chest(self) -> Optional[ChestObject]:
+        """Coffre le plus proche parmi les zones où se trouve le joueur."""
+        if not self.nearby_zones:
+            return None
+        return self._closest_unopened(self.nearby_zones, *self.trigger_zones.position)
+    
+    def _closest_unopened(self, zones: List[TriggerZone], x: float, y: float) -> Optional[ChestObject]:
         closest_chest = None
         closest_distance = float('inf')
         
-        for chest in self.chests:
-            if chest.can_interact_with(player_x, player_y):
-                # Calculer la distance exacte pour trouver le plus proche
-                chest_center_x = chest.x + chest.width / 2
-                chest_center_y = chest.y + chest.height / 2
-                dx = player_x - chest_center_x
-                dy = player_y - chest_center_y
-                distance = (dx * dx + dy * dy) ** 0.5
-                
-                if distance < closest_distance:
-                    closest_distance = distance
-                    closest_chest = chest
+        for zone in zones:
+            # Comparer les distances au carré, pas besoin de racine
+            distance = zone.distance_squared(x, y)
+            if not zone.owner.is_opened and distance < closest_distance:
+                closest_distance = distance
+                closest_chest = zone.owner
         
         return closest_chest
     
@@ -0,0 +1,101 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+
+class ChunkCache(ABC):
+    """Chunk surfaces built lazily and kept in a bounded LRU cache.
+
+    Each chunk covers ``chunk_tiles`` x ``chunk_tiles`` tiles of a grid of
+    ``width`` x ``height`` tiles of ``tile_size`` pixels, which subclasses
+    provide along with ``_render_chunk``. A chunk rendered as None has nothing
+    to draw and is cached like any other.
+    """
+
+    def __init__(self, chunk_tiles: int = 16, max_chunks: int = 32):
+        self.chunk_tiles = chunk_tiles
+        self.max_chunks = max_chunks
+        self._chunks: Dict[Tuple[int, int], Optional[pygame.Surface]] = OrderedDict()
+
+    @property
+    def chunk_pixels(self) -> int:
+        return self.chunk_tiles * self.tile_size
+
+    def get_chunk(self, chunk_x: int, chunk_y: int) -> Optional[pygame.Surface]:
+        """Get a chunk surface, rendering it on first use."""
+        key = (chunk_x, chunk_y)
+        if key in self._chunks:
+            self._chunks.move_to_end(key)
+            return self._chunks[key]
+
+        chunk = self._render_chunk(chunk_x, chunk_y)
+        self._chunks[key] = chunk
+        if len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)  # Evict least recently used
+        return chunk
+
+    @abstractmethod
+    def _render_chunk(self, chunk_x: int, chunk_y: int) -> Optional[pygame.Surface]:
+        pass
+
+    def _chunk_tile_bounds(
+        self, chunk_x: int, chunk_y: int
+    ) -> Tuple[int, int, int, int]:
+        """Tiles of a chunk as (start_x, start_y, end_x, end_y), clipped to the grid."""
+        start_x = chunk_x * self.chunk_tiles
+        start_y = chunk_y * self.chunk_tiles
+        return (
+            start_x,
+            start_y,
+            min(self.width, start_x + self.chunk_tiles),
+            min(self.height, start_y + self.chunk_tiles),
+        )
+
+    def invalidate_tile(self, tile_x: int, tile_y: int):
+        """Drop the chunk showing a tile so it is re-rendered on next use."""
+        self._chunks.pop((tile_x // self.chunk_tiles, tile_y // self.chunk_tiles), None)
+
+    def invalidate_area(self, tile_x: int, tile_y: int, width: int, height: int):
+        """Drop every chunk overlapping a rectangle of tiles."""
+        for chunk_y in range(
+            tile_y // self.chunk_tiles, (tile_y + height - 1) // self.chunk_tiles + 1
+        ):
+            for chunk_x in range(
+                tile_x // self.chunk_tiles, (tile_x + width - 1) // self.chunk_tiles + 1
+            ):
+                self._chunks.pop((chunk_x, chunk_y), None)
+
+    def invalidate_all(self):
+        self._chunks.clear()
+
+    def is_cached(self, chunk_x: int, chunk_y: int) -> bool:
+        return (chunk_x, chunk_y) in self._chunks
+
+    def render(self, screen: pygame.Surface, camera_x: float, camera_y: float):
+        """Blit the chunks intersecting the camera rectangle."""
+        chunk_pixels = self.chunk_pixels
+        chunks_x = -(-self.width // self.chunk_tiles)
+        chunks_y = -(-self.height // self.chunk_tiles)
+
+        start_chunk_x = max(0, int(camera_x // chunk_pixels))
+        start_chunk_y = max(0, int(camera_y // chunk_pixels))
+        end_chunk_x = min(
+            chunks_x, int((camera_x + screen.get_width()) // chunk_pixels) + 1
+        )
+        end_chunk_y = min(
+            chunks_y, int((camera_y + screen.get_height()) // chunk_pixels) + 1
+        )
+
+        for chunk_y in range(start_chunk_y, end_chunk_y):
+            for chunk_x in range(start_chunk_x, end_chunk_x):
+                chunk = self.get_chunk(chunk_x, chunk_y)
+                if chunk is not None:
+                    screen.blit(
+                        chunk,
+                        (
+                            int(chunk_x * chunk_pixels - camera_x),
+                            int(chunk_y * chunk_pixels - camera_y),
+                        ),
+                    )
@@ -0,0 +1,127 @@
+from typing import Optional
+
+from game.world.map_scan import numpy, use_vectorized
+
+# Larger free squares read as this. Entities and objects span a few tiles, and
+# a tile change can only alter the clearances of the MAX_CLEARANCE x
+# MAX_CLEARANCE tiles above and left of it, which bounds update_tile.
+MAX_CLEARANCE = 16
+
+
+class ClearanceMap:
+    """Size of the largest free square of tiles anchored at each tile.
+
+    Entry (x, y) is n when the n x n tiles starting at (x, y) and extending
+    right and down are all free (and inside the map), 0 on blocked tiles, so
+    whether an entity of any size fits at a tile is a single lookup.
+    """
+
+    def __init__(
+        self,
+        collision_grid,
+        width: int,
+        height: int,
+        vectorized: Optional[bool] = None,
+    ):
+        self.width = width
+        self.height = height
+        self._collision_grid = collision_grid
+
+        if use_vectorized(vectorized):
+            self.clearance = self._build_vectorized()
+        else:
+            self.clearance = bytearray(width * height)
+            for tile_y in range(height - 1, -1, -1):
+                for tile_x in range(width - 1, -1, -1):
+                    self.clearance[tile_y * width + tile_x] = self._compute(
+                        tile_x, tile_y
+                    )
+
+    def _build_vectorized(self) -> bytearray:
+        width = self.width
+        free = (
+            numpy.frombuffer(self._collision_grid, dtype=numpy.uint8).reshape(
+                self.height, width
+            )
+            == 0
+        )
+        clearance = numpy.zeros((self.height + 1, width + 1), dtype=numpy.int32)
+        offsets = numpy.arange(width + 1, dtype=numpy.int32)
+        for tile_y in range(self.height - 1, -1, -1):
+            # 1 + min(below, below-right) on free tiles, the right neighbour
+            # term c[x] <= c[x + 1] + 1 becomes a suffix minimum of m[j] + j
+            bound = numpy.zeros(width + 1, dtype=numpy.int32)
+            below = clearance[tile_y + 1]
+            bound[:width] = numpy.where(
+                free[tile_y], numpy.minimum(below[:width], below[1:]) + 1, 0
+            )
+            bound += offsets
+            suffix_min = numpy.minimum.accumulate(bound[::-1])[::-1]
+            clearance[tile_y] = suffix_min - offsets
+        return bytearray(
+            numpy.minimum(clearance[: self.height, :width], MAX_CLEARANCE)
+            .astype(numpy.uint8)
+            .tobytes()
+        )
+
+    def _compute(self, tile_x: int, tile_y: int) -> int:
+        """Clearance of one tile from its right, lower and lower-right neighbours."""
+        if self._collision_grid[tile_y * self.width + tile_x]:
+            return 0
+        return min(
+            MAX_CLEARANCE,
+            1
+            + min(
+                self.get_clearance(tile_x + 1, tile_y),
+                self.get_clearance(tile_x, tile_y + 1),
+                self.get_clearance(tile_x + 1, tile_y + 1),
+            ),
+        )
+
+    def get_clearance(self, tile_x: int, tile_y: int) -> int:
+        """Get the free square size at a tile, 0 when out of bounds."""
+        if tile_x < 0 or tile_y < 0 or tile_x >= self.width or tile_y >= self.height:
+            return 0
+        return self.clearance[tile_y * self.width + tile_x]
+
+    def update_tile(self, tile_x: int, tile_y: int):
+        """Recompute clearances after a tile of the collision grid changed.
+
+        Only tiles above and to the left depend on it. Rows are redone upwards
+        over the span that changed in the row below, and stop as soon as a
+        row comes out unchanged.
+        """
+        width, height = self.width, self.height
+        grid, clearance = self._collision_grid, self.clearance
+        span_start, span_end = tile_x, tile_x
+        for row in range(tile_y, -1, -1):
+            changed_start = changed_end = None
+            has_below = row + 1 < height
+            column = span_end
+            previous_changed = False
+            while column >= 0 and (column >= span_start - 1 or previous_changed):
+                index = row * width + column
+                # Same recurrence as _compute, inlined as this is the hot loop
+                if grid[index]:
+                    value = 0
+                elif column + 1 < width and has_below:
+                    value = 1 + min(
+                        clearance[index + 1],
+                        clearance[index + width],
+                        clearance[index + width + 1],
+                    )
+                    if value > MAX_CLEARANCE:
+                        value = MAX_CLEARANCE
+                else:
+                    value = 1
+                previous_changed = value != clearance[index]
+                if previous_changed:
+                    clearance[index] = value
+                    changed_start = column
+                    if changed_end is None:
+                        changed_end = column
+                column -= 1
+
+            if changed_start is None:
+                return
+            span_start, span_end = changed_start, changed_end
@@ -0,0 +1,133 @@
+"""Compiled binary map format, opened with mmap for near-instant startup.
+
+Layout (little-endian):
+
+- header: magic, version, palette checksum, width, height, spawn tile,
+  object count
+- tile grid: one palette tile id byte per tile, row-major
+- collision grid: one byte per tile, 1 where terrain or an object blocks
+- object table: (tile_x, tile_y, tile_id) per object marker
+
+Compiled files live next to their PNG (``large_map.png`` ->
+``large_map.cmap``) and are produced by ``scripts/compile_maps.py``.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from typing import List, Optional, Tuple
+
+from game.world.object_types import ObjectType
+from game.world.tile_palette import OBJECT_TILE_IDS, PALETTE_COLORS, PALETTE_OBJECTS
+
+COMPILED_MAP_SUFFIX = ".cmap"
+COMPILED_MAP_MAGIC = b"CMAP"
+COMPILED_MAP_VERSION = 1
+
+HEADER = struct.Struct("<4sHIIIiiI")
+OBJECT_RECORD = struct.Struct("<IIB")
+
+# Tile ids are palette indices, so files compiled against another palette
+# must not be reused
+PALETTE_CHECKSUM = zlib.crc32(repr(PALETTE_COLORS).encode())
+
+
+def compiled_path_for(map_path: str) -> str:
+    return os.path.splitext(map_path)[0] + COMPILED_MAP_SUFFIX
+
+
+def find_compiled_map(map_path: str) -> Optional[str]:
+    """Get the compiled file for a map, None when missing or older than the PNG."""
+    if map_path.endswith(COMPILED_MAP_SUFFIX):
+        return map_path
+
+    compiled_path = compiled_path_for(map_path)
+    if not os.path.exists(compiled_path):
+        return None
+    if os.path.exists(map_path) and os.path.getmtime(compiled_path) < os.path.getmtime(
+        map_path
+    ):
+        return None
+    return compiled_path
+
+
+class CompiledMap:
+    """Read-only view of a compiled map file.
+
+    The grids are memoryviews over a copy-on-write mmap, so nothing is copied
+    at open time and runtime edits never reach the file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as map_file:
+            self._mmap = mmap.mmap(map_file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        (
+            magic,
+            version,
+            palette_checksum,
+            self.width,
+            self.height,
+            spawn_x,
+            spawn_y,
+            object_count,
+        ) = HEADER.unpack_from(self._mmap)
+        if magic != COMPILED_MAP_MAGIC or version != COMPILED_MAP_VERSION:
+            raise ValueError(
+                f"'{path}' is not a compiled map (version {COMPILED_MAP_VERSION})"
+            )
+        if palette_checksum != PALETTE_CHECKSUM:
+            raise ValueError(f"'{path}' was compiled with another tile palette")
+
+        self.spawn_tile = (spawn_x, spawn_y)
+        tile_count = self.width * self.height
+        expected_size = HEADER.size + 2 * tile_count + object_count * OBJECT_RECORD.size
+        if len(self._mmap) < expected_size:
+            raise ValueError(f"'{path}' is truncated")
+        data = memoryview(self._mmap)
+        offset = HEADER.size
+        self.tile_ids = data[offset : offset + tile_count]
+        offset += tile_count
+        self.collision_grid = data[offset : offset + tile_count]
+        offset += tile_count
+
+        self.object_markers: List[Tuple[int, ObjectType]] = []
+        for tile_x, tile_y, tile_id in OBJECT_RECORD.iter_unpack(
+            data[offset : offset + object_count * OBJECT_RECORD.size]
+        ):
+            self.object_markers.append(
+                (tile_y * self.width + tile_x, PALETTE_OBJECTS[tile_id])
+            )
+
+
+def write_compiled_map(game_map, path: str):
+    """Write a loaded BitmapMap to a compiled map file."""
+    spawn_x, spawn_y = game_map.spawn_point
+    object_records = []
+    for obj in game_map.objects:
+        # The object's own marker, terrain under objects of layered maps is
+        # ground. Objects without a marker color cannot be reloaded
+        tile_id = OBJECT_TILE_IDS.get(obj.name)
+        if tile_id is None:
+            continue
+        tile_x = int(obj.x // game_map.tile_size)
+        tile_y = int(obj.y // game_map.tile_size)
+        object_records.append(OBJECT_RECORD.pack(tile_x, tile_y, tile_id))
+
+    with open(path, "wb") as map_file:
+        map_file.write(
+            HEADER.pack(
+                COMPILED_MAP_MAGIC,
+                COMPILED_MAP_VERSION,
+                PALETTE_CHECKSUM,
+                game_map.width,
+                game_map.height,
+                int(spawn_x // game_map.tile_size),
+                int(spawn_y // game_map.tile_size),
+                len(object_records),
+            )
+        )
+        map_file.write(game_map.tile_ids)
+        map_file.write(game_map.collision_grid)
+        map_file.write(b"".join(object_records))
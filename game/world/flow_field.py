@@ -0,0 +1,210 @@
+"""Flow field leading every chaser to the player over the walkable tiles.
+
+A Dijkstra integration from the player's tile gives each tile of a square
+window around it its walking distance to the player. Chasers then read their
+next tile from their own tile instead of each steering on their own. The
+integration is lazy: it only runs when a chaser asks about a tile, and only
+until that tile is settled, keeping its frontier for the next question. Once
+the player enters another tile, or a collision change lands inside the
+window, the field starts over from the new goal, again on demand, so frames
+without chasers cost nothing and chasers near the player only settle the
+few tiles around them.
+"""
+
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+from game.world.pathfinding import NEIGHBOURS
+
+Tile = Tuple[int, int]
+
+# Window tiles whose collision has not been read yet
+UNKNOWN = 2
+
+
+class FlowField:
+    """Distances to a goal tile within a radius, and the next step toward it."""
+
+    def __init__(self, game_map, radius: int = 24):
+        self.game_map = game_map
+        self.radius = radius
+        self.size = 2 * radius + 1
+        self.goal: Optional[Tile] = None
+        self._origin: Tile = (0, 0)
+        # 1 free, 0 blocked, UNKNOWN until the integration reaches the tile
+        self._free = bytearray()
+        # Final for settled tiles, upper bounds for the frontier
+        self._costs: List[float] = []
+        self._settled = bytearray()
+        self._open_heap: List[Tuple[float, int]] = []
+        self._next_tiles: Dict[int, Optional[Tile]] = {}
+        self._dirty = False
+        game_map.collision_listeners.append(self._on_collision_changed)
+
+    def close(self):
+        """Stop following the map's collision changes."""
+        if self._on_collision_changed in self.game_map.collision_listeners:
+            self.game_map.collision_listeners.remove(self._on_collision_changed)
+
+    def update(self, world_x: float, world_y: float) -> bool:
+        """Follow the goal, starting the field over when it enters a new tile."""
+        tile_size = self.game_map.tile_size
+        tile = (int(world_x // tile_size), int(world_y // tile_size))
+        if tile == self.goal and not self._dirty:
+            return False
+        self.goal = tile
+        self._reset()
+        return True
+
+    def _reset(self):
+        self._dirty = False
+        self._next_tiles = {}
+        size = self.size
+        old_free, (old_x, old_y) = self._free, self._origin
+        origin_x, origin_y = self._origin = (
+            self.goal[0] - self.radius,
+            self.goal[1] - self.radius,
+        )
+        free = self._free = bytearray((UNKNOWN,)) * (size * size)
+        shift_x, shift_y = origin_x - old_x, origin_y - old_y
+        if old_free and abs(shift_x) < size and abs(shift_y) < size:
+            # Tiles still inside the window keep the collisions already read
+            start_x, end_x = max(0, -shift_x), min(size, size - shift_x)
+            for y in range(max(0, -shift_y), min(size, size - shift_y)):
+                row = y * size
+                old_row = (y + shift_y) * size + shift_x
+                free[row + start_x : row + end_x] = old_free[
+                    old_row + start_x : old_row + end_x
+                ]
+        self._costs = [math.inf] * (size * size)
+        self._settled = bytearray(size * size)
+        center = self.radius * size + self.radius
+        if self._is_free(center):
+            self._costs[center] = 0.0
+            self._open_heap = [(0.0, center)]
+        else:
+            self._open_heap = []
+
+    def _is_free(self, index: int) -> bool:
+        free = self._free[index]
+        if free == UNKNOWN:
+            y, x = divmod(index, self.size)
+            free = self._free[index] = not self.game_map.is_tile_blocked(
+                self._origin[0] + x, self._origin[1] + y
+            )
+        return bool(free)
+
+    def _integrate_until(self, target: int):
+        """Run the integration until a window tile is settled or all are."""
+        size = self.size
+        costs, settled, open_heap = self._costs, self._settled, self._open_heap
+        free, is_free = self._free, self._is_free
+        while open_heap and not settled[target]:
+            cost, index = heapq.heappop(open_heap)
+            if settled[index]:
+                continue
+            settled[index] = 1
+            y, x = divmod(index, size)
+            for dx, dy, step_cost in NEIGHBOURS:
+                neighbour_x = x + dx
+                neighbour_y = y + dy
+                if not (0 <= neighbour_x < size and 0 <= neighbour_y < size):
+                    continue
+                neighbour = neighbour_y * size + neighbour_x
+                known = free[neighbour]
+                if known == UNKNOWN:
+                    known = is_free(neighbour)
+                if settled[neighbour] or not known:
+                    continue
+                # Diagonal steps need both sides free, not to clip a corner
+                if (
+                    dx
+                    and dy
+                    and not (
+                        is_free(y * size + neighbour_x)
+                        and is_free(neighbour_y * size + x)
+                    )
+                ):
+                    continue
+                new_cost = cost + step_cost
+                if new_cost < costs[neighbour]:
+                    costs[neighbour] = new_cost
+                    heapq.heappush(open_heap, (new_cost, neighbour))
+
+    def _settle(self, tile: Tile) -> Optional[int]:
+        """Window index of a tile, integrated far enough for its cost to be final."""
+        if self._dirty:
+            self._reset()
+        index = self._get_index(tile)
+        if index is not None and not self._settled[index]:
+            self._integrate_until(index)
+        return index
+
+    def _get_index(self, tile: Tile) -> Optional[int]:
+        x = tile[0] - self._origin[0]
+        y = tile[1] - self._origin[1]
+        if self.goal is None or not (0 <= x < self.size and 0 <= y < self.size):
+            return None
+        return y * self.size + x
+
+    def get_cost(self, tile: Tile) -> float:
+        """Walking distance to the goal, inf outside the field or unreachable."""
+        index = self._settle(tile)
+        return math.inf if index is None else self._costs[index]
+
+    def get_next_tile(self, tile: Tile) -> Optional[Tile]:
+        """Neighbour one step closer to the goal, None at the goal or off-field."""
+        index = self._settle(tile)
+        if index is None:
+            return None
+        if index in self._next_tiles:
+            return self._next_tiles[index]
+
+        # Neighbours cheaper than a settled tile are settled before it
+        next_tile = None
+        costs, is_free, size = self._costs, self._is_free, self.size
+        best = costs[index]
+        if best < math.inf:
+            y, x = divmod(index, size)
+            for dx, dy, _ in NEIGHBOURS:
+                neighbour_x = x + dx
+                neighbour_y = y + dy
+                if not (0 <= neighbour_x < size and 0 <= neighbour_y < size):
+                    continue
+                if (
+                    dx
+                    and dy
+                    and not (
+                        is_free(y * size + neighbour_x)
+                        and is_free(neighbour_y * size + x)
+                    )
+                ):
+                    continue
+                cost = costs[neighbour_y * size + neighbour_x]
+                if cost < best:
+                    best = cost
+                    next_tile = (tile[0] + dx, tile[1] + dy)
+        self._next_tiles[index] = next_tile
+        return next_tile
+
+    def invalidate_area(self, tile_x: int, tile_y: int, width: int, height: int):
+        """Start the field over on next use if a tile area overlaps it."""
+        origin_x, origin_y = self._origin
+        if (
+            self.goal is not None
+            and tile_x < origin_x + self.size
+            and tile_x + width > origin_x
+            and tile_y < origin_y + self.size
+            and tile_y + height > origin_y
+        ):
+            self._dirty = True
+            self._free = bytearray()  # Collisions in the area may all differ
+
+    def _on_collision_changed(self, tile_x: int, tile_y: int, blocked: bool):
+        index = self._get_index((tile_x, tile_y))
+        if index is None:
+            return
+        if self._free:
+            self._free[index] = not blocked
+        self._dirty = True
@@ -0,0 +1,173 @@
+"""Fog of war over the tiles the player has not explored yet.
+
+Explored tiles are kept in a bitset, one bit per tile. The reveal circle is
+only applied when the player enters a new tile, and the overlay is drawn in
+chunks that are re-rendered only when one of their bits changed.
+"""
+
+import struct
+import zlib
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pygame
+
+from game.world.chunk_cache import ChunkCache
+
+# Saved bitsets start with their size, so they can be checked against the map
+SAVE_HEADER = struct.Struct("<II")
+
+
+class ExploredTiles:
+    """Bitset of explored tiles, row-major, bit (index & 7) of byte index >> 3."""
+
+    def __init__(self, width: int, height: int, bits: Optional[bytearray] = None):
+        self.width = width
+        self.height = height
+        size = (width * height + 7) // 8
+        if bits is not None and len(bits) != size:
+            raise ValueError(
+                f"Expected {size} bytes of explored tiles, got {len(bits)}"
+            )
+        self.bits = bits if bits is not None else bytearray(size)
+
+    def is_explored(self, tile_x: int, tile_y: int) -> bool:
+        if tile_x < 0 or tile_y < 0 or tile_x >= self.width or tile_y >= self.height:
+            return False
+        index = tile_y * self.width + tile_x
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def explore(self, tile_x: int, tile_y: int) -> bool:
+        """Mark a tile explored, returns False if it already was."""
+        index = tile_y * self.width + tile_x
+        mask = 1 << (index & 7)
+        if self.bits[index >> 3] & mask:
+            return False
+        self.bits[index >> 3] |= mask
+        return True
+
+    def count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def iter_explored(self) -> Iterator[Tuple[int, int]]:
+        """Explored tiles in row-major order, skipping unexplored bytes."""
+        for byte_index, byte in enumerate(self.bits):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    tile_y, tile_x = divmod(byte_index * 8 + bit, self.width)
+                    yield tile_x, tile_y
+
+    def to_bytes(self) -> bytes:
+        """Serialize for a save file, long unexplored stretches deflate to nothing."""
+        return SAVE_HEADER.pack(self.width, self.height) + zlib.compress(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ExploredTiles":
+        width, height = SAVE_HEADER.unpack_from(data)
+        try:
+            bits = bytearray(zlib.decompress(data[SAVE_HEADER.size :]))
+        except zlib.error as e:
+            raise ValueError(f"Corrupt explored tiles: {e}") from e
+        return cls(width, height, bits)
+
+
+def circle_offsets(radius: int) -> List[Tuple[int, int]]:
+    """Tile offsets within a radius, row by row."""
+    return [
+        (dx, dy)
+        for dy in range(-radius, radius + 1)
+        for dx in range(-radius, radius + 1)
+        if dx * dx + dy * dy <= radius * radius
+    ]
+
+
+class FogOfWar(ChunkCache):
+    """Explored tiles around the player and the overlay hiding the others.
+
+    Overlay chunks with every tile explored render as None and are not drawn.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        tile_size: int = 32,
+        reveal_radius: int = 8,
+        chunk_tiles: int = 16,
+        max_chunks: int = 32,
+        explored: Optional[ExploredTiles] = None,
+    ):
+        super().__init__(chunk_tiles, max_chunks)
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.reveal_radius = reveal_radius
+        self.visible = True
+        self.color = (0, 0, 0)
+        self.explored = explored or ExploredTiles(width, height)
+        self._offsets = circle_offsets(reveal_radius)
+        self._player_tile: Optional[Tuple[int, int]] = None
+        # Called with the list of newly explored tiles after each reveal
+        self.reveal_listeners: List[Callable[[List[Tuple[int, int]]], None]] = []
+
+    def update(self, world_x: float, world_y: float) -> List[Tuple[int, int]]:
+        """Follow the player, revealing around them when they enter a new tile."""
+        tile = (int(world_x // self.tile_size), int(world_y // self.tile_size))
+        if tile == self._player_tile:
+            return []
+        self._player_tile = tile
+        return self.reveal(*tile)
+
+    def reveal(self, tile_x: int, tile_y: int) -> List[Tuple[int, int]]:
+        """Explore the tiles around a tile, returns the newly explored ones."""
+        width, height = self.width, self.height
+        explore = self.explored.explore
+        revealed = []
+        for dx, dy in self._offsets:
+            x = tile_x + dx
+            y = tile_y + dy
+            if 0 <= x < width and 0 <= y < height and explore(x, y):
+                revealed.append((x, y))
+
+        if revealed:
+            for x, y in revealed:
+                self.invalidate_tile(x, y)
+            for listener in self.reveal_listeners:
+                listener(revealed)
+        return revealed
+
+    def _render_chunk(self, chunk_x: int, chunk_y: int) -> Optional[pygame.Surface]:
+        tile_size = self.tile_size
+        start_x, start_y, end_x, end_y = self._chunk_tile_bounds(chunk_x, chunk_y)
+
+        is_explored = self.explored.is_explored
+        hidden = [
+            (tile_x, tile_y)
+            for tile_y in range(start_y, end_y)
+            for tile_x in range(start_x, end_x)
+            if not is_explored(tile_x, tile_y)
+        ]
+        if not hidden:
+            return None
+
+        surface = pygame.Surface(
+            ((end_x - start_x) * tile_size, (end_y - start_y) * tile_size),
+            pygame.SRCALPHA,
+        )
+        for tile_x, tile_y in hidden:
+            surface.fill(
+                self.color,
+                (
+                    (tile_x - start_x) * tile_size,
+                    (tile_y - start_y) * tile_size,
+                    tile_size,
+                    tile_size,
+                ),
+            )
+        return surface
+
+    def render(self, screen: pygame.Surface, camera_x: float, camera_y: float):
+        """Blit the overlay chunks intersecting the camera rectangle."""
+        if self.visible:
+            super().render(screen, camera_x, camera_y)
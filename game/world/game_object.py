@@ -1,7 +1,43 @@
-from typing import Tuple
+from typing import Dict, Tuple
 import pygame
 
 
+# Flyweight cache: one decoded, converted and scaled surface per (path, size),
+# shared by every GameObject of the same type
+_object_sprite_cache: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+
+
+def load_object_sprite(sprite_path: str, size: Tuple[int, int]) -> pygame.Surface:
+    """Load an object sprite scaled to size, decoding each (path, size) only once."""
+    cache_key = (sprite_path, size)
+    sprite = _object_sprite_cache.get(cache_key)
+    if sprite is not None:
+        return sprite
+
+    try:
+        sprite = pygame.image.load(sprite_path)
+        # Convert to the display format when there is one, for faster blits
+        if pygame.display.get_surface() is not None:
+            if sprite.get_alpha() is not None:
+                sprite = sprite.convert_alpha()
+            else:
+                sprite = sprite.convert()
+        # Scale sprite to match object size
+        sprite = pygame.transform.scale(sprite, size)
+    except (pygame.error, FileNotFoundError):
+        # If sprite loading fails, create a colored rectangle
+        sprite = pygame.Surface(size)
+        sprite.fill((100, 100, 100))  # Gray fallback
+
+    _object_sprite_cache[cache_key] = sprite
+    return sprite
+
+
+def clear_object_sprite_cache():
+    """Drop all shared object sprites (e.g. after the display mode changes)."""
+    _object_sprite_cache.clear()
+
+
 class GameObject:
     def __init__(
         self,
@@ -23,16 +59,8 @@ class GameObject:
         self.sprite_surface = None
 
         if sprite_path:
-            try:
-                self.sprite_surface = pygame.image.load(sprite_path)
-                # Scale sprite to match object size
-                self.sprite_surface = pygame.transform.scale(
-                    self.sprite_surface, (width, height)
-                )
-            except pygame.error:
-                # If sprite loading fails, create a colored rectangle
-                self.sprite_surface = pygame.Surface((width, height))
-                self.sprite_surface.fill((100, 100, 100))  # Gray fallback
+            # Shared with every object using the same sprite at the same size
+            self.sprite_surface = load_object_sprite(sprite_path, (width, height))
 
     @property
     def rect(self) -> pygame.Rect:
@@ -0,0 +1,463 @@
+"""Hierarchical A* (HPA*) over square clusters of tiles.
+
+The map is split into clusters, and entrances are the free tile pairs facing
+each other across a cluster border: one in the middle of each open stretch
+of the border, or one at each end of long stretches. Paths are first found
+on the small graph of entrances, then refined into tiles one segment at a
+time, each segment being a short A* inside a single cluster. A collision
+change only rebuilds the entrances on the borders of its cluster.
+"""
+
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from game.world.map_scan import numpy, use_vectorized
+from game.world.pathfinding import NEIGHBOURS, octile_distance, search_grid
+from game.world.region_labels import is_unreachable
+
+Tile = Tuple[int, int]
+Cluster = Tuple[int, int]
+
+# A border is the east or south side of a cluster, (cluster_x, cluster_y, side)
+EAST_BORDER = 0
+SOUTH_BORDER = 1
+Border = Tuple[int, int, int]
+
+# Open stretches of a border at least this long get an entrance at each end
+ENTRANCE_SPLIT = 6
+
+# Goals more clusters away than this are searched on the entrance graph, plain
+# A* is cheaper for nearer ones
+LONG_RANGE_CLUSTERS = 1
+
+
+class HierarchicalPath:
+    """Path through entrance nodes, refined into tiles segment by segment."""
+
+    def __init__(self, pathfinder: "HierarchicalPathfinder", nodes: List[Tile]):
+        self.pathfinder = pathfinder
+        self.nodes = nodes
+        self._next_node = 1
+
+    @property
+    def is_finished(self) -> bool:
+        return self._next_node >= len(self.nodes)
+
+    def next_segment(self) -> Optional[Tuple[Tile, ...]]:
+        """Tiles up to the next node, None once finished or if it got blocked."""
+        if self.is_finished:
+            return None
+        segment = self.pathfinder.refine(
+            self.nodes[self._next_node - 1], self.nodes[self._next_node]
+        )
+        self._next_node += 1
+        return segment
+
+    def tiles(self) -> List[Tile]:
+        """Refine all the remaining segments, empty if one got blocked."""
+        tiles: List[Tile] = []
+        while not self.is_finished:
+            segment = self.next_segment()
+            if segment is None:
+                return []
+            tiles.extend(segment)
+        return tiles
+
+
+class HierarchicalPathfinder:
+    """Entrance graph over map clusters, for long paths on large maps.
+
+    Entrances are found for the whole map up front. Distances between the
+    entrances of a cluster are computed by precompute_distances(), or else the
+    first time a search goes through the cluster, and kept until a collision
+    change in or next to it.
+    """
+
+    def __init__(
+        self,
+        game_map,
+        cluster_tiles: int = 16,
+        vectorized: Optional[bool] = None,
+    ):
+        self.game_map = game_map
+        self.cluster_tiles = cluster_tiles
+        self.clusters_x = -(-game_map.width // cluster_tiles)
+        self.clusters_y = -(-game_map.height // cluster_tiles)
+
+        # Entrance pairs by border, the first tile inside the border's cluster
+        self._border_links: Dict[Border, List[Tuple[Tile, Tile]]] = {}
+        # Abstract graph: links across borders, and distances inside clusters
+        self._links: Dict[Tile, Dict[Tile, float]] = {}
+        self._intra: Dict[Cluster, Dict[Tile, Dict[Tile, float]]] = {}
+        self._dirty: Set[Cluster] = set()
+
+        if use_vectorized(vectorized) and hasattr(game_map, "collision_grid"):
+            self._build_entrances_vectorized()
+        else:
+            for border in self._all_borders():
+                self._set_border(border, self._scan_border(border))
+        game_map.collision_listeners.append(self._on_collision_changed)
+
+    def close(self):
+        """Stop following the map's collision changes."""
+        if self._on_collision_changed in self.game_map.collision_listeners:
+            self.game_map.collision_listeners.remove(self._on_collision_changed)
+
+    def get_cluster(self, tile: Tile) -> Cluster:
+        return (tile[0] // self.cluster_tiles, tile[1] // self.cluster_tiles)
+
+    def is_long_range(self, start: Tile, goal: Tile) -> bool:
+        """Check whether a search is long enough to go through the entrances."""
+        start_x, start_y = self.get_cluster(start)
+        goal_x, goal_y = self.get_cluster(goal)
+        return max(abs(goal_x - start_x), abs(goal_y - start_y)) > LONG_RANGE_CLUSTERS
+
+    def is_cluster_cached(self, cluster: Cluster) -> bool:
+        """Check whether the entrance distances of a cluster are computed."""
+        return cluster in self._intra
+
+    def get_entrances(self, cluster: Cluster) -> Set[Tile]:
+        """Entrance tiles inside a cluster."""
+        cluster_x, cluster_y = cluster
+        entrances = set()
+        for border, index in (
+            ((cluster_x, cluster_y, EAST_BORDER), 0),
+            ((cluster_x, cluster_y, SOUTH_BORDER), 0),
+            ((cluster_x - 1, cluster_y, EAST_BORDER), 1),
+            ((cluster_x, cluster_y - 1, SOUTH_BORDER), 1),
+        ):
+            for pair in self._border_links.get(border, ()):
+                entrances.add(pair[index])
+        return entrances
+
+    # Entrances
+
+    def _all_borders(self) -> Iterable[Border]:
+        for cluster_y in range(self.clusters_y):
+            for cluster_x in range(self.clusters_x):
+                if cluster_x + 1 < self.clusters_x:
+                    yield (cluster_x, cluster_y, EAST_BORDER)
+                if cluster_y + 1 < self.clusters_y:
+                    yield (cluster_x, cluster_y, SOUTH_BORDER)
+
+    def _border_pair(self, border: Border, offset: int) -> Tuple[Tile, Tile]:
+        cluster_x, cluster_y, side = border
+        if side == EAST_BORDER:
+            x = (cluster_x + 1) * self.cluster_tiles - 1
+            y = cluster_y * self.cluster_tiles + offset
+            return (x, y), (x + 1, y)
+        x = cluster_x * self.cluster_tiles + offset
+        y = (cluster_y + 1) * self.cluster_tiles - 1
+        return (x, y), (x, y + 1)
+
+    def _border_length(self, border: Border) -> int:
+        cluster_x, cluster_y, side = border
+        if side == EAST_BORDER:
+            start, size = cluster_y * self.cluster_tiles, self.game_map.height
+        else:
+            start, size = cluster_x * self.cluster_tiles, self.game_map.width
+        return min(self.cluster_tiles, size - start)
+
+    def _run_links(
+        self, border: Border, start: int, end: int
+    ) -> List[Tuple[Tile, Tile]]:
+        """Entrance pairs of the open stretch of a border from start to end."""
+        if end - start + 1 >= ENTRANCE_SPLIT:
+            return [self._border_pair(border, start), self._border_pair(border, end)]
+        return [self._border_pair(border, (start + end) // 2)]
+
+    def _scan_border(self, border: Border) -> List[Tuple[Tile, Tile]]:
+        is_tile_blocked = self.game_map.is_tile_blocked
+        links = []
+        run_start = None
+        length = self._border_length(border)
+        for offset in range(length + 1):
+            is_open = False
+            if offset < length:
+                inside, outside = self._border_pair(border, offset)
+                is_open = not is_tile_blocked(*inside) and not is_tile_blocked(*outside)
+            if is_open and run_start is None:
+                run_start = offset
+            elif not is_open and run_start is not None:
+                links.extend(self._run_links(border, run_start, offset - 1))
+                run_start = None
+        return links
+
+    def _build_entrances_vectorized(self):
+        """Find the open stretches of every border at once."""
+        cluster_tiles = self.cluster_tiles
+        width, height = self.game_map.width, self.game_map.height
+        free = (
+            numpy.frombuffer(self.game_map.collision_grid, dtype=numpy.uint8).reshape(
+                height, width
+            )
+            == 0
+        )
+        for side, grid in ((EAST_BORDER, free), (SOUTH_BORDER, free.T)):
+            # Rows of the (transposed) grid run along the borders
+            lines = numpy.arange(cluster_tiles - 1, grid.shape[1] - 1, cluster_tiles)
+            open_tiles = grid[:, lines] & grid[:, lines + 1]
+            offsets = numpy.arange(grid.shape[0])[:, None]
+            # Stretches are cut where a cluster ends along the border
+            previous = numpy.zeros_like(open_tiles)
+            previous[1:] = open_tiles[:-1]
+            previous[offsets[:, 0] % cluster_tiles == 0] = False
+            following = numpy.zeros_like(open_tiles)
+            following[:-1] = open_tiles[1:]
+            following[offsets[:, 0] % cluster_tiles == cluster_tiles - 1] = False
+            run_starts = numpy.nonzero((open_tiles & ~previous).T)
+            run_ends = numpy.nonzero((open_tiles & ~following).T)
+
+            links: Dict[Border, List[Tuple[Tile, Tile]]] = {}
+            for line, start, end in zip(
+                run_starts[0].tolist(), run_starts[1].tolist(), run_ends[1].tolist()
+            ):
+                along = start // cluster_tiles
+                border = (
+                    (line, along, side) if side == EAST_BORDER else (along, line, side)
+                )
+                links.setdefault(border, []).extend(
+                    self._run_links(border, start % cluster_tiles, end % cluster_tiles)
+                )
+            for border, border_links in links.items():
+                self._set_border(border, border_links)
+
+    def _set_border(self, border: Border, links: List[Tuple[Tile, Tile]]):
+        for inside, outside in self._border_links.pop(border, ()):
+            self._links[inside].pop(outside, None)
+            self._links[outside].pop(inside, None)
+        if links:
+            self._border_links[border] = links
+        for inside, outside in links:
+            self._links.setdefault(inside, {})[outside] = 1.0
+            self._links.setdefault(outside, {})[inside] = 1.0
+
+    # Dynamic obstacles
+
+    def invalidate_area(self, tile_x: int, tile_y: int, width: int, height: int):
+        """Mark the clusters of a tile area for rebuilding before next search."""
+        cluster_tiles = self.cluster_tiles
+        for cluster_y in range(
+            max(0, tile_y // cluster_tiles),
+            min(self.clusters_y, (tile_y + height - 1) // cluster_tiles + 1),
+        ):
+            for cluster_x in range(
+                max(0, tile_x // cluster_tiles),
+                min(self.clusters_x, (tile_x + width - 1) // cluster_tiles + 1),
+            ):
+                self._dirty.add((cluster_x, cluster_y))
+
+    def _on_collision_changed(self, tile_x: int, tile_y: int, blocked: bool):
+        self.invalidate_area(tile_x, tile_y, 1, 1)
+
+    def _rebuild_dirty(self):
+        while self._dirty:
+            cluster_x, cluster_y = self._dirty.pop()
+            for border in (
+                (cluster_x, cluster_y, EAST_BORDER),
+                (cluster_x, cluster_y, SOUTH_BORDER),
+                (cluster_x - 1, cluster_y, EAST_BORDER),
+                (cluster_x, cluster_y - 1, SOUTH_BORDER),
+            ):
+                if border[0] < 0 or border[1] < 0:
+                    continue
+                if (border[2] == EAST_BORDER and border[0] + 1 >= self.clusters_x) or (
+                    border[2] == SOUTH_BORDER and border[1] + 1 >= self.clusters_y
+                ):
+                    continue
+                self._set_border(border, self._scan_border(border))
+            # Neighbours' entrances on the shared borders may have moved
+            for cluster in (
+                (cluster_x, cluster_y),
+                (cluster_x + 1, cluster_y),
+                (cluster_x - 1, cluster_y),
+                (cluster_x, cluster_y + 1),
+                (cluster_x, cluster_y - 1),
+            ):
+                self._intra.pop(cluster, None)
+
+    # Searches inside a cluster
+
+    def _cluster_passable(self, cluster: Cluster):
+        is_tile_blocked = self.game_map.is_tile_blocked
+        min_x = cluster[0] * self.cluster_tiles
+        min_y = cluster[1] * self.cluster_tiles
+        max_x = min_x + self.cluster_tiles
+        max_y = min_y + self.cluster_tiles
+
+        def is_passable(tile: Tile) -> bool:
+            return (
+                min_x <= tile[0] < max_x
+                and min_y <= tile[1] < max_y
+                and not is_tile_blocked(*tile)
+            )
+
+        return is_passable
+
+    def _cluster_free(self, cluster: Cluster) -> Tuple[int, int, int, int, bytearray]:
+        """Bounds of a cluster and its free tiles, row-major inside it."""
+        min_x = cluster[0] * self.cluster_tiles
+        min_y = cluster[1] * self.cluster_tiles
+        width = min(self.cluster_tiles, self.game_map.width - min_x)
+        height = min(self.cluster_tiles, self.game_map.height - min_y)
+        is_tile_blocked = self.game_map.is_tile_blocked
+        free = bytearray(
+            not is_tile_blocked(x, y)
+            for y in range(min_y, min_y + height)
+            for x in range(min_x, min_x + width)
+        )
+        return min_x, min_y, width, height, free
+
+    @staticmethod
+    def _distances(
+        source: Tile,
+        targets: Set[Tile],
+        cluster_free: Tuple[int, int, int, int, bytearray],
+    ) -> Dict[Tile, float]:
+        """Dijkstra inside a cluster, until all the targets are reached."""
+        min_x, min_y, width, height, free = cluster_free
+        if all(free):
+            # Nothing in the way, so the octile distance is exact
+            return {target: octile_distance(source, target) for target in targets}
+
+        remaining = {(x - min_x) + (y - min_y) * width: (x, y) for x, y in targets}
+        start = (source[0] - min_x) + (source[1] - min_y) * width
+        found: Dict[Tile, float] = {}
+        costs = {start: 0.0}
+        open_heap = [(0.0, start)]
+        while open_heap and remaining:
+            cost, index = heapq.heappop(open_heap)
+            if cost > costs[index]:
+                continue
+            target = remaining.pop(index, None)
+            if target is not None:
+                found[target] = cost
+            y, x = divmod(index, width)
+            for dx, dy, step_cost in NEIGHBOURS:
+                neighbour_x = x + dx
+                neighbour_y = y + dy
+                if not (0 <= neighbour_x < width and 0 <= neighbour_y < height):
+                    continue
+                neighbour = neighbour_y * width + neighbour_x
+                if not free[neighbour]:
+                    continue
+                # Diagonal steps need both sides free, not to clip a corner
+                if (
+                    dx
+                    and dy
+                    and not (
+                        free[y * width + neighbour_x] and free[neighbour_y * width + x]
+                    )
+                ):
+                    continue
+                new_cost = cost + step_cost
+                if new_cost < costs.get(neighbour, math.inf):
+                    costs[neighbour] = new_cost
+                    heapq.heappush(open_heap, (new_cost, neighbour))
+        return found
+
+    def _cluster_edges(self, cluster: Cluster) -> Dict[Tile, Dict[Tile, float]]:
+        edges = self._intra.get(cluster)
+        if edges is None:
+            entrances = sorted(self.get_entrances(cluster))
+            cluster_free = self._cluster_free(cluster)
+            edges = self._intra[cluster] = {entrance: {} for entrance in entrances}
+            # Distances are symmetric, each pair is searched once
+            for index, entrance in enumerate(entrances):
+                distances = self._distances(
+                    entrance, set(entrances[index + 1 :]), cluster_free
+                )
+                for other, distance in distances.items():
+                    edges[entrance][other] = edges[other][entrance] = distance
+        return edges
+
+    def precompute_distances(self):
+        """Compute the entrance distances of every cluster now, e.g. at load."""
+        for cluster_y in range(self.clusters_y):
+            for cluster_x in range(self.clusters_x):
+                self._cluster_edges((cluster_x, cluster_y))
+
+    def refine(self, from_tile: Tile, to_tile: Tile) -> Optional[Tuple[Tile, ...]]:
+        """Tiles from one node of an abstract path to the next."""
+        cluster = self.get_cluster(from_tile)
+        if cluster != self.get_cluster(to_tile):
+            # Both sides of an entrance
+            if self.game_map.is_tile_blocked(*to_tile):
+                return None
+            return (to_tile,)
+        return search_grid(
+            from_tile,
+            to_tile,
+            self._cluster_passable(cluster),
+            self.cluster_tiles * self.cluster_tiles,
+        )
+
+    # Abstract search
+
+    def find_path(self, start: Tile, goal: Tile) -> Optional[HierarchicalPath]:
+        """Abstract path from start to goal, None if the goal is unreachable."""
+        self._rebuild_dirty()
+        is_tile_blocked = self.game_map.is_tile_blocked
+        if is_tile_blocked(*start) or is_tile_blocked(*goal):
+            return None
+        if is_unreachable(self.game_map.region_labels, start, goal):
+            return None
+
+        start_cluster = self.get_cluster(start)
+        goal_cluster = self.get_cluster(goal)
+        if start_cluster == goal_cluster and self.refine(start, goal) is not None:
+            return HierarchicalPath(self, [start, goal])
+
+        start_edges = self._distances(
+            start, self.get_entrances(start_cluster), self._cluster_free(start_cluster)
+        )
+        goal_edges = self._distances(
+            goal, self.get_entrances(goal_cluster), self._cluster_free(goal_cluster)
+        )
+
+        costs = {start: 0.0}
+        parents: Dict[Tile, Tile] = {}
+        open_heap = [(octile_distance(start, goal), 0, start)]
+        pushed = 1
+        closed = set()
+        while open_heap:
+            _, _, node = heapq.heappop(open_heap)
+            if node == goal:
+                nodes = [goal]
+                while nodes[-1] != start:
+                    nodes.append(parents[nodes[-1]])
+                nodes.reverse()
+                return HierarchicalPath(self, nodes)
+            if node in closed:
+                continue
+            closed.add(node)
+
+            if node == start:
+                neighbours = dict(start_edges)
+            else:
+                neighbours = dict(
+                    self._cluster_edges(self.get_cluster(node)).get(node, {})
+                )
+            neighbours.update(self._links.get(node, {}))
+            if node in goal_edges:
+                neighbours[goal] = goal_edges[node]
+
+            cost = costs[node]
+            for neighbour, edge_cost in neighbours.items():
+                if neighbour in closed:
+                    continue
+                new_cost = cost + edge_cost
+                if new_cost < costs.get(neighbour, math.inf):
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = node
+                    heapq.heappush(
+                        open_heap,
+                        (
+                            new_cost + octile_distance(neighbour, goal),
+                            pushed,
+                            neighbour,
+                        ),
+                    )
+                    pushed += 1
+        return None
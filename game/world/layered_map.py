@@ -0,0 +1,220 @@
+"""Layered map container with run-length compressed layers.
+
+Unlike the single PNG, where objects and the spawn marker replace the terrain
+color of their tile, a layered map keeps one byte grid per layer:
+
+- terrain: palette tile id of the ground, also under objects
+- decoration: palette tile id of the object marker anchored at a tile, 0 if none
+- collision: 1 where terrain or an object blocks
+- triggers: trigger id (``TRIGGER_SPAWN``...), 0 if none
+
+Layout (little-endian):
+
+- header: magic, version, palette checksum, width, height, layer count
+- per layer: name, encoded size, then the layer's (run length, value)
+  records, deflated
+
+Mostly uniform maps compress to a few runs per row, and deflating the runs
+takes care of the repeated patterns left (scattered objects, wall outlines).
+Each layer decodes straight into a row-major bytearray. Files are produced
+from PNG maps by ``scripts/compile_maps.py --layered``.
+"""
+
+import re
+import struct
+import zlib
+from typing import Dict, Optional
+
+from game.world.compiled_map import PALETTE_CHECKSUM
+from game.world.map_scan import numpy, use_vectorized
+from game.world.tile_palette import (
+    FIRST_OBJECT_TILE_ID,
+    PALETTE_COLORS,
+    SPAWN_TILE_ID,
+    TILE_IDS,
+)
+
+LAYERED_MAP_SUFFIX = ".lmap"
+LAYERED_MAP_MAGIC = b"LMAP"
+LAYERED_MAP_VERSION = 1
+
+HEADER = struct.Struct("<4sHIIIB")
+LAYER_HEADER = struct.Struct("<16sI")
+RUN = struct.Struct("<HB")
+MAX_RUN = 0xFFFF
+
+_RUN_PATTERN = re.compile(rb"(.)\1*", re.DOTALL)
+
+LAYER_NAMES = ("terrain", "decoration", "collision", "triggers")
+
+TRIGGER_NONE = 0
+TRIGGER_SPAWN = 1
+
+# Ground drawn under objects and the spawn marker of PNG maps
+GRASS_TILE_ID = TILE_IDS[(34, 139, 34)]
+
+# bytes.translate tables splitting a PNG tile id grid into layers
+_TERRAIN_TABLE = bytes(
+    GRASS_TILE_ID
+    if tile_id >= FIRST_OBJECT_TILE_ID or tile_id == SPAWN_TILE_ID
+    else tile_id
+    for tile_id in range(256)
+)
+_DECORATION_TABLE = bytes(
+    tile_id if FIRST_OBJECT_TILE_ID <= tile_id < len(PALETTE_COLORS) else 0
+    for tile_id in range(256)
+)
+_TRIGGER_TABLE = bytes(
+    TRIGGER_SPAWN if tile_id == SPAWN_TILE_ID else TRIGGER_NONE
+    for tile_id in range(256)
+)
+
+
+def is_layered_map(path: str) -> bool:
+    return path.endswith(LAYERED_MAP_SUFFIX)
+
+
+def encode_runs(data, vectorized: Optional[bool] = None) -> bytes:
+    """Run-length encode a byte grid into (run length, value) records."""
+    if not data:
+        return b""
+    if use_vectorized(vectorized):
+        values = numpy.frombuffer(data, dtype=numpy.uint8)
+        starts = numpy.flatnonzero(numpy.diff(values)) + 1
+        starts = numpy.concatenate(([0], starts))
+        lengths = numpy.diff(numpy.concatenate((starts, [len(values)])))
+        runs = zip(lengths.tolist(), values[starts].tolist())
+    else:
+        runs = _iter_runs(data)
+
+    records = []
+    for length, value in runs:
+        while length > MAX_RUN:
+            records.append(RUN.pack(MAX_RUN, value))
+            length -= MAX_RUN
+        records.append(RUN.pack(length, value))
+    return b"".join(records)
+
+
+def _iter_runs(data):
+    # A backreference regex walks the runs at C speed
+    for match in _RUN_PATTERN.finditer(data):
+        yield match.end() - match.start(), data[match.start()]
+
+
+def decode_runs(
+    encoded, tile_count: int, vectorized: Optional[bool] = None
+) -> bytearray:
+    """Decode (run length, value) records into a bytearray of tile_count bytes."""
+    if use_vectorized(vectorized):
+        runs = numpy.frombuffer(
+            encoded, dtype=numpy.dtype([("length", "<u2"), ("value", "u1")])
+        )
+        decoded = bytearray(numpy.repeat(runs["value"], runs["length"]).tobytes())
+    else:
+        decoded = bytearray()
+        for length, value in RUN.iter_unpack(encoded):
+            decoded += bytes((value,)) * length
+    if len(decoded) != tile_count:
+        raise ValueError(
+            f"Layer decodes to {len(decoded)} tiles, expected {tile_count}"
+        )
+    return decoded
+
+
+def split_layers(tile_ids, collision_grid) -> Dict[str, bytes]:
+    """Split the tile id grid of a PNG map into layers."""
+    tile_ids = bytes(tile_ids)
+    return {
+        "terrain": tile_ids.translate(_TERRAIN_TABLE),
+        "decoration": tile_ids.translate(_DECORATION_TABLE),
+        "collision": bytes(collision_grid),
+        "triggers": tile_ids.translate(_TRIGGER_TABLE),
+    }
+
+
+class LayeredMap:
+    """Decoded layers of a layered map file."""
+
+    def __init__(self, path: str, vectorized: Optional[bool] = None):
+        with open(path, "rb") as map_file:
+            data = memoryview(map_file.read())
+
+        (
+            magic,
+            version,
+            palette_checksum,
+            self.width,
+            self.height,
+            layer_count,
+        ) = HEADER.unpack_from(data)
+        if magic != LAYERED_MAP_MAGIC or version != LAYERED_MAP_VERSION:
+            raise ValueError(
+                f"'{path}' is not a layered map (version {LAYERED_MAP_VERSION})"
+            )
+        if palette_checksum != PALETTE_CHECKSUM:
+            raise ValueError(f"'{path}' was written with another tile palette")
+
+        tile_count = self.width * self.height
+        self.layers: Dict[str, bytearray] = {}
+        offset = HEADER.size
+        for _ in range(layer_count):
+            name, size = LAYER_HEADER.unpack_from(data, offset)
+            offset += LAYER_HEADER.size
+            if offset + size > len(data):
+                raise ValueError(f"'{path}' is truncated")
+            try:
+                runs = zlib.decompress(data[offset : offset + size])
+            except zlib.error as e:
+                raise ValueError(f"'{path}' has a corrupt layer: {e}") from e
+            if len(runs) % RUN.size:
+                raise ValueError(f"'{path}' has a corrupt layer")
+            self.layers[name.rstrip(b"\0").decode()] = decode_runs(
+                runs, tile_count, vectorized
+            )
+            offset += size
+
+        missing = [name for name in LAYER_NAMES if name not in self.layers]
+        if missing:
+            raise ValueError(f"'{path}' has no {', '.join(missing)} layer")
+
+    @property
+    def terrain(self) -> bytearray:
+        return self.layers["terrain"]
+
+    @property
+    def decoration(self) -> bytearray:
+        return self.layers["decoration"]
+
+    @property
+    def collision(self) -> bytearray:
+        return self.layers["collision"]
+
+    @property
+    def triggers(self) -> bytearray:
+        return self.layers["triggers"]
+
+
+def write_layered_map(
+    path: str,
+    width: int,
+    height: int,
+    layers: Dict[str, bytes],
+    vectorized: Optional[bool] = None,
+):
+    """Write layers (name -> row-major byte grid) to a layered map file."""
+    with open(path, "wb") as map_file:
+        map_file.write(
+            HEADER.pack(
+                LAYERED_MAP_MAGIC,
+                LAYERED_MAP_VERSION,
+                PALETTE_CHECKSUM,
+                width,
+                height,
+                len(layers),
+            )
+        )
+        for name, grid in layers.items():
+            encoded = zlib.compress(encode_runs(grid, vectorized))
+            map_file.write(LAYER_HEADER.pack(name.encode(), len(encoded)))
+            map_file.write(encoded)
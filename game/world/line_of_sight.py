@@ -0,0 +1,101 @@
+"""Line of sight between tiles, for enemies to spot the player.
+
+Sight lines are walked over the tile grid with Bresenham's algorithm and stop
+at the first blocked tile. Results are memoized per target tile, so all the
+enemies watching the player share one cache, which ages out as the player
+moves to other tiles and is trimmed when a tile's collision changes.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+Tile = Tuple[int, int]
+
+
+class LineOfSight:
+    """Memoized tile to tile visibility over a map's blocked tiles."""
+
+    def __init__(self, game_map, max_targets: int = 8):
+        self.game_map = game_map
+        self.max_targets = max_targets
+        # Results by target tile, then by source tile
+        self._cache: Dict[Tile, Dict[Tile, bool]] = OrderedDict()
+        game_map.collision_listeners.append(self._on_collision_changed)
+
+    def close(self):
+        """Stop following the map's collision changes."""
+        if self._on_collision_changed in self.game_map.collision_listeners:
+            self.game_map.collision_listeners.remove(self._on_collision_changed)
+
+    def can_see(self, from_x: float, from_y: float, to_x: float, to_y: float) -> bool:
+        """Check the line of sight between two world points."""
+        tile_size = self.game_map.tile_size
+        return self.has_line_of_sight(
+            (int(from_x // tile_size), int(from_y // tile_size)),
+            (int(to_x // tile_size), int(to_y // tile_size)),
+        )
+
+    def has_line_of_sight(self, from_tile: Tile, to_tile: Tile) -> bool:
+        """Check that no blocked tile lies strictly between two tiles."""
+        lines = self._cache.get(to_tile)
+        if lines is None:
+            lines = self._cache[to_tile] = {}
+            if len(self._cache) > self.max_targets:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(to_tile)
+
+        visible = lines.get(from_tile)
+        if visible is None:
+            visible = lines[from_tile] = self._walk(from_tile, to_tile)
+        return visible
+
+    def is_cached(self, from_tile: Tile, to_tile: Tile) -> bool:
+        return from_tile in self._cache.get(to_tile, ())
+
+    def _walk(self, from_tile: Tile, to_tile: Tile) -> bool:
+        is_tile_blocked = self.game_map.is_tile_blocked
+        x, y = from_tile
+        end_x, end_y = to_tile
+        dx = abs(end_x - x)
+        dy = -abs(end_y - y)
+        step_x = 1 if x < end_x else -1
+        step_y = 1 if y < end_y else -1
+        error = dx + dy
+        while x != end_x or y != end_y:
+            double_error = 2 * error
+            if double_error >= dy:
+                error += dy
+                x += step_x
+            if double_error <= dx:
+                error += dx
+                y += step_y
+            if (x != end_x or y != end_y) and is_tile_blocked(x, y):
+                return False
+        return True
+
+    def invalidate_area(self, tile_x: int, tile_y: int, width: int, height: int):
+        """Drop the results of lines passing near a tile area.
+
+        A line only crosses tiles inside the box spanned by its two ends, so
+        the results whose box misses the area are kept.
+        """
+        end_x = tile_x + width - 1
+        end_y = tile_y + height - 1
+        for (target_x, target_y), lines in self._cache.items():
+            stale = [
+                (source_x, source_y)
+                for source_x, source_y in lines
+                if min(source_x, target_x) <= end_x
+                and max(source_x, target_x) >= tile_x
+                and min(source_y, target_y) <= end_y
+                and max(source_y, target_y) >= tile_y
+            ]
+            for source in stale:
+                del lines[source]
+
+    def clear(self):
+        self._cache.clear()
+
+    def _on_collision_changed(self, tile_x: int, tile_y: int, blocked: bool):
+        self.invalidate_area(tile_x, tile_y, 1, 1)
@@ -0,0 +1,219 @@
+"""Seeded procedural maps in the colors of TILE_TYPES and OBJECT_TYPES.
+
+The same (width, height, seed, object_density) always gives the same image,
+so generated maps can serve as benchmark corpora. Terrain and water are drawn
+with pygame fills and shapes, objects are single marker pixels, and every
+feature count scales with the map area.
+"""
+
+import math
+import random
+from typing import Tuple
+
+import pygame
+
+MIN_MAP_SIZE = 256
+MAX_MAP_SIZE = 8192
+
+GRASS = (34, 139, 34)
+DIRT = (139, 69, 19)
+STONE = (128, 128, 128)
+WATER = (0, 0, 255)
+WALL = (165, 42, 42)
+SPAWN = (255, 0, 0)
+ENEMY_SPAWN = (255, 0, 255)
+
+SMALL_TREE = (50, 150, 50)
+LARGE_TREE = (40, 120, 40)
+BUSH = (60, 180, 60)
+HOUSE = (150, 75, 0)
+SHED = (120, 60, 0)
+WELL = (100, 50, 0)
+CHEST = (200, 200, 0)
+BARREL = (180, 100, 50)
+STONE_WALL = (100, 100, 100)
+WOODEN_FENCE = (80, 60, 40)
+
+
+class MapGenerator:
+    """Draws one map, every random choice comes from a single seeded RNG."""
+
+    def __init__(
+        self, width: int, height: int, seed: int = 0, object_density: float = 1.0
+    ):
+        for size in (width, height):
+            if not MIN_MAP_SIZE <= size <= MAX_MAP_SIZE:
+                raise ValueError(
+                    f"Map sides must be between {MIN_MAP_SIZE} and {MAX_MAP_SIZE}"
+                )
+        self.width = width
+        self.height = height
+        self.object_density = object_density
+        self.rng = random.Random(seed)
+        self.surface = pygame.Surface((width, height))
+
+    def _count(self, tiles_per_feature: int) -> int:
+        """Number of features for the map area, at least one."""
+        return max(1, self.width * self.height // tiles_per_feature)
+
+    def _random_point(self, margin: int = 1) -> Tuple[int, int]:
+        return (
+            self.rng.randrange(margin, self.width - margin),
+            self.rng.randrange(margin, self.height - margin),
+        )
+
+    def _is_free(self, x: int, y: int) -> bool:
+        """Plain ground tile inside the outer walls."""
+        if not (1 <= x < self.width - 1 and 1 <= y < self.height - 1):
+            return False
+        return tuple(self.surface.get_at((x, y)))[:3] in (GRASS, DIRT)
+
+    def _place(self, x: int, y: int, color: Tuple[int, int, int]) -> bool:
+        if not self._is_free(x, y):
+            return False
+        self.surface.set_at((x, y), color)
+        return True
+
+    def generate(self) -> pygame.Surface:
+        self.surface.fill(GRASS)
+        self._add_terrain_patches()
+        self._add_lakes()
+        self._add_rivers()
+        self._add_roads()
+        self._add_ruins()
+        self._add_forests()
+        self._add_villages()
+        self._add_markers(CHEST, self._count(8192))
+        self._add_markers(ENEMY_SPAWN, self._count(4096))
+        self._add_border()
+        self._add_player_spawn()
+        return self.surface
+
+    def _add_terrain_patches(self):
+        for _ in range(self._count(4096)):
+            x, y = self._random_point()
+            color = self.rng.choice((DIRT, DIRT, STONE))
+            width = self.rng.randint(4, 48)
+            height = self.rng.randint(4, 48)
+            pygame.draw.ellipse(
+                self.surface, color, (x - width // 2, y - height // 2, width, height)
+            )
+
+    def _add_lakes(self):
+        for _ in range(self._count(16384)):
+            x, y = self._random_point()
+            # Overlapping ellipses give irregular shores
+            for _ in range(self.rng.randint(1, 4)):
+                width = self.rng.randint(6, 60)
+                height = self.rng.randint(6, 60)
+                pygame.draw.ellipse(
+                    self.surface,
+                    WATER,
+                    (
+                        x + self.rng.randint(-12, 12) - width // 2,
+                        y + self.rng.randint(-12, 12) - height // 2,
+                        width,
+                        height,
+                    ),
+                )
+
+    def _wander(self, length: int, step: int):
+        """Random walk from one map edge, as a list of points."""
+        if self.rng.random() < 0.5:
+            x, y, angle = 0, self.rng.randrange(self.height), 0.0
+        else:
+            x, y, angle = self.rng.randrange(self.width), 0, math.pi / 2
+        points = [(x, y)]
+        for _ in range(length):
+            angle += self.rng.uniform(-0.4, 0.4)
+            x += int(step * math.cos(angle))
+            y += int(step * math.sin(angle))
+            points.append((x, y))
+        return points
+
+    def _add_rivers(self):
+        for _ in range(self._count(1024 * 1024)):
+            points = self._wander(max(self.width, self.height) // 8, 8)
+            pygame.draw.lines(
+                self.surface, WATER, False, points, self.rng.randint(2, 4)
+            )
+
+    def _add_roads(self):
+        # Drawn over water, where they act as fords
+        for _ in range(self._count(256 * 256)):
+            points = self._wander(max(self.width, self.height) // 16, 16)
+            pygame.draw.lines(self.surface, STONE, False, points, 2)
+
+    def _add_ruins(self):
+        for _ in range(self._count(65536)):
+            x, y = self._random_point()
+            width = self.rng.randint(6, 24)
+            height = self.rng.randint(6, 24)
+            pygame.draw.rect(self.surface, WALL, (x, y, width, height), 1)
+            # Knock a doorway into one side
+            door_x = x + self.rng.randint(1, width - 2)
+            self.surface.fill(GRASS, (door_x, y + height - 1, 2, 1))
+
+    def _add_forests(self):
+        trees = (SMALL_TREE, SMALL_TREE, LARGE_TREE, BUSH)
+        for _ in range(self._count(8192)):
+            center_x, center_y = self._random_point()
+            radius = self.rng.randint(6, 32)
+            for _ in range(int(radius * radius * 0.25 * self.object_density)):
+                self._place(
+                    int(self.rng.gauss(center_x, radius / 2)),
+                    int(self.rng.gauss(center_y, radius / 2)),
+                    self.rng.choice(trees),
+                )
+
+    def _add_villages(self):
+        for _ in range(self._count(131072)):
+            columns = self.rng.randint(2, 5)
+            rows = self.rng.randint(2, 4)
+            # 6x5 tile lots, with room for the fence and a path around them
+            width = columns * 6 + 4
+            height = rows * 5 + 4
+            x, y = self._random_point(2)
+            x = min(x, self.width - width - 2)
+            y = min(y, self.height - height - 2)
+            self.surface.fill(DIRT, (x, y, width, height))
+            for lot_y in range(rows):
+                for lot_x in range(columns):
+                    lot_left = x + 2 + lot_x * 6
+                    lot_top = y + 2 + lot_y * 5
+                    self.surface.fill(GRASS, (lot_left, lot_top, 5, 4))
+                    building = self.rng.choice((HOUSE, HOUSE, SHED, WELL))
+                    self.surface.set_at((lot_left + 1, lot_top + 1), building)
+                    if self.rng.random() < 0.3:
+                        self.surface.set_at((lot_left + 4, lot_top + 3), BARREL)
+            self._add_fence(x, y, width, height)
+
+    def _add_fence(self, x: int, y: int, width: int, height: int):
+        fence = self.rng.choice((WOODEN_FENCE, WOODEN_FENCE, STONE_WALL))
+        gate = self.rng.randint(2, width - 4)
+        for fence_x in range(x, x + width):
+            if not gate <= fence_x - x < gate + 2:
+                self.surface.set_at((fence_x, y), fence)
+            self.surface.set_at((fence_x, y + height - 1), fence)
+        for fence_y in range(y, y + height):
+            self.surface.set_at((x, fence_y), fence)
+            self.surface.set_at((x + width - 1, fence_y), fence)
+
+    def _add_markers(self, color: Tuple[int, int, int], count: int):
+        for _ in range(int(count * self.object_density)):
+            self._place(*self._random_point(), color)
+
+    def _add_border(self):
+        pygame.draw.rect(self.surface, WALL, (0, 0, self.width, self.height), 1)
+
+    def _add_player_spawn(self):
+        center_x, center_y = self.width // 2, self.height // 2
+        self.surface.fill(GRASS, (center_x - 3, center_y - 3, 7, 7))
+        self.surface.set_at((center_x, center_y), SPAWN)
+
+
+def generate_map(
+    width: int, height: int, seed: int = 0, object_density: float = 1.0
+) -> pygame.Surface:
+    """Generate a map image, identical for identical arguments."""
+    return MapGenerator(width, height, seed, object_density).generate()
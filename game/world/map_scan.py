@@ -0,0 +1,72 @@
+"""Bulk decoding and marker scanning for bitmap maps.
+
+Each scan has a pure Python path and a vectorized NumPy path. NumPy is an
+optional dependency (``pip install jeux-papa[fast]``); without it every scan
+falls back to the pure Python path.
+"""
+
+from typing import List, Optional, Tuple
+
+import pygame
+
+from game.world.object_types import ObjectType
+from game.world.tile_palette import (
+    DEFAULT_TILE_ID,
+    FIRST_OBJECT_TILE_ID,
+    PALETTE_COLORS,
+    PALETTE_OBJECTS,
+    decode_rgb,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None
+
+HAS_NUMPY = numpy is not None
+
+
+def use_vectorized(vectorized: Optional[bool] = None) -> bool:
+    """Resolve the loader path, None picks NumPy whenever it is installed."""
+    if vectorized is None:
+        return HAS_NUMPY
+    if vectorized and not HAS_NUMPY:
+        raise ImportError("The vectorized map loader requires numpy")
+    return vectorized
+
+
+def decode_surface(
+    surface: pygame.Surface, vectorized: Optional[bool] = None
+) -> bytearray:
+    """Decode a map surface into one tile id byte per tile (row-major)."""
+    if not use_vectorized(vectorized):
+        return decode_rgb(pygame.image.tobytes(surface, "RGB"))
+
+    rgb = pygame.surfarray.array3d(surface).astype(numpy.uint32)
+    packed = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+    # surfarray is indexed [x, y], the tile grid is stored row by row
+    packed = packed.T
+
+    tile_ids = numpy.full(packed.shape, DEFAULT_TILE_ID, dtype=numpy.uint8)
+    for tile_id, (r, g, b) in enumerate(PALETTE_COLORS):
+        tile_ids[packed == ((r << 16) | (g << 8) | b)] = tile_id
+    return bytearray(tile_ids.tobytes())
+
+
+def find_object_markers(
+    tile_ids: bytearray, vectorized: Optional[bool] = None
+) -> List[Tuple[int, ObjectType]]:
+    """Find every object marker as (tile index, object type), in row-major order."""
+    if not use_vectorized(vectorized):
+        return [
+            (index, PALETTE_OBJECTS[tile_id])
+            for index, tile_id in enumerate(tile_ids)
+            if tile_id >= FIRST_OBJECT_TILE_ID
+        ]
+
+    grid = numpy.frombuffer(tile_ids, dtype=numpy.uint8)
+    indices = numpy.flatnonzero(grid >= FIRST_OBJECT_TILE_ID)
+    return [
+        (index, PALETTE_OBJECTS[tile_id])
+        for index, tile_id in zip(indices.tolist(), grid[indices].tolist())
+    ]
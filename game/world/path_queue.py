@@ -0,0 +1,174 @@
+"""Path searches run on a background thread, applied a few per frame.
+
+Requests are searched by a worker thread on an immutable snapshot of the
+collision grid, so a burst of requests (e.g. every goblin spotting the player
+at once) never stalls a frame. Finished searches are handed back through
+PathRequest handles, and at most ``max_results_per_frame`` of them are
+applied per update. Results found on a grid that changed since are searched
+again rather than handed back.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from game.world.pathfinding import search_grid
+from game.world.region_labels import is_unreachable
+
+Tile = Tuple[int, int]
+
+
+class PathRequest:
+    """Completion handle of a queued path search."""
+
+    def __init__(self, start: Tile, goal: Tile, size: int, version: int):
+        self.start = start
+        self.goal = goal
+        self.size = size
+        # Collision grid version the search ran on
+        self.version = version
+        self.done = False
+        self.cancelled = False
+        self.path: Optional[Tuple[Tile, ...]] = None
+
+    def cancel(self):
+        """Drop the result, e.g. when the requester needs another path."""
+        self.cancelled = True
+
+
+class PathQueue:
+    """Worker thread running A* searches on snapshots of a map's collisions."""
+
+    def __init__(
+        self,
+        game_map,
+        max_results_per_frame: int = 8,
+        max_nodes: int = 4096,
+    ):
+        self.game_map = game_map
+        self.max_results_per_frame = max_results_per_frame
+        self.max_nodes = max_nodes
+        # Called with each request as its result gets applied
+        self.completion_listeners: List[Callable[[PathRequest], None]] = []
+
+        self._version = 0
+        self._snapshot: Optional[bytes] = None
+        # Requests whose result was not taken back yet, cancelled ones included
+        self._unfinished = 0
+        self._requests: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+        game_map.collision_listeners.append(self._on_collision_changed)
+
+    def close(self):
+        """Stop the worker thread and following the map's collision changes."""
+        if self._on_collision_changed in self.game_map.collision_listeners:
+            self.game_map.collision_listeners.remove(self._on_collision_changed)
+        self._requests.put(None)
+        self._worker.join(timeout=1.0)
+
+    def request(self, start: Tile, goal: Tile, size: int = 1) -> PathRequest:
+        """Queue a search, its handle is done once update() applied it."""
+        request = PathRequest(start, goal, size, self._version)
+        self._unfinished += 1
+        self._queue(request)
+        return request
+
+    def update(self) -> int:
+        """Apply up to max_results_per_frame finished searches, never blocking."""
+        applied = 0
+        while applied < self.max_results_per_frame:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            applied += self._apply(*result)
+        return applied
+
+    def drain(self, timeout: float = 5.0) -> int:
+        """Wait for every queued search and apply them all, e.g. in tests.
+
+        Raises TimeoutError when the worker has not finished them in time.
+        """
+        deadline = time.monotonic() + timeout
+        applied = 0
+        while self._unfinished:
+            try:
+                result = self._results.get(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except queue.Empty:
+                raise TimeoutError(
+                    f"{self._unfinished} path searches still running"
+                ) from None
+            applied += self._apply(*result)
+        return applied
+
+    def _queue(self, request: PathRequest):
+        if self._snapshot is None:
+            # Copied once per collision change, the worker only reads copies
+            self._snapshot = bytes(self.game_map.collision_grid)
+        if is_unreachable(self.game_map.region_labels, request.start, request.goal):
+            # Another region, answered without waking the worker
+            self._results.put((request, None))
+        else:
+            self._requests.put((request, self._snapshot))
+
+    def _apply(self, request: PathRequest, path: Optional[Tuple[Tile, ...]]) -> int:
+        if request.cancelled:
+            self._unfinished -= 1
+            return 0
+        if request.version != self._version:
+            # Collisions changed since the search, it runs again on the new grid
+            request.version = self._version
+            self._queue(request)
+            return 0
+        self._unfinished -= 1
+        request.path = path
+        request.done = True
+        # Valid for the current grid, so others can reuse it
+        self.game_map.pathfinder.store_path(
+            request.start, request.goal, request.size, path
+        )
+        for listener in self.completion_listeners:
+            listener(request)
+        return 1
+
+    def _worker_loop(self):
+        while True:
+            job = self._requests.get()
+            if job is None:
+                return
+            request, snapshot = job
+            # Cancelled requests are handed back unsearched, to be dropped
+            path = None if request.cancelled else self._search(request, snapshot)
+            self._results.put((request, path))
+
+    def _search(
+        self, request: PathRequest, snapshot: bytes
+    ) -> Optional[Tuple[Tile, ...]]:
+        width, height = self.game_map.width, self.game_map.height
+        size = request.size
+
+        def is_passable(tile: Tile) -> bool:
+            tile_x, tile_y = tile
+            if (
+                tile_x < 0
+                or tile_y < 0
+                or tile_x + size > width
+                or tile_y + size > height
+            ):
+                return False
+            return not any(
+                snapshot[(tile_y + dy) * width + tile_x + dx]
+                for dy in range(size)
+                for dx in range(size)
+            )
+
+        return search_grid(request.start, request.goal, is_passable, self.max_nodes)
+
+    def _on_collision_changed(self, tile_x: int, tile_y: int, blocked: bool):
+        self._version += 1
+        self._snapshot = None
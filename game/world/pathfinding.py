@@ -0,0 +1,193 @@
+"""A* paths over the walkable tiles of a map.
+
+Searches move in eight directions with an octile distance heuristic and a
+binary heap as open set, and never cut the corner of a blocked tile. Found
+paths are cached per (start tile, goal tile), so enemies chasing the player
+from the same spot share them, until a collision change may affect them.
+"""
+
+import heapq
+import math
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from game.world.region_labels import is_unreachable
+
+Tile = Tuple[int, int]
+
+DIAGONAL_COST = math.sqrt(2)
+# Octile distance is max + (sqrt(2) - 1) * min of the axis distances
+DIAGONAL_EXTRA = DIAGONAL_COST - 1
+
+NEIGHBOURS = (
+    (1, 0, 1.0),
+    (-1, 0, 1.0),
+    (0, 1, 1.0),
+    (0, -1, 1.0),
+    (1, 1, DIAGONAL_COST),
+    (1, -1, DIAGONAL_COST),
+    (-1, 1, DIAGONAL_COST),
+    (-1, -1, DIAGONAL_COST),
+)
+
+
+def octile_distance(from_tile: Tile, to_tile: Tile) -> float:
+    dx = abs(from_tile[0] - to_tile[0])
+    dy = abs(from_tile[1] - to_tile[1])
+    return max(dx, dy) + DIAGONAL_EXTRA * min(dx, dy)
+
+
+def search_grid(
+    start: Tile,
+    goal: Tile,
+    is_passable: Callable[[Tile], bool],
+    max_nodes: int,
+) -> Optional[Tuple[Tile, ...]]:
+    """A* from start to goal over the tiles passing is_passable.
+
+    Returns the tiles after start up to goal, or None when the goal cannot be
+    reached or more than max_nodes tiles were expanded.
+    """
+    if start == goal:
+        return ()
+    if not is_passable(goal):
+        return None
+
+    costs = {start: 0.0}
+    parents: Dict[Tile, Tile] = {}
+    # (estimated total, insertion order, tile), the order breaks ties FIFO
+    open_heap = [(octile_distance(start, goal), 0, start)]
+    pushed = 1
+    closed = set()
+    while open_heap:
+        _, _, tile = heapq.heappop(open_heap)
+        if tile == goal:
+            path = [goal]
+            while path[-1] != start:
+                path.append(parents[path[-1]])
+            path.pop()
+            path.reverse()
+            return tuple(path)
+        if tile in closed:
+            continue
+        closed.add(tile)
+        if len(closed) > max_nodes:
+            return None
+
+        tile_x, tile_y = tile
+        cost = costs[tile]
+        for dx, dy, step_cost in NEIGHBOURS:
+            neighbour = (tile_x + dx, tile_y + dy)
+            if neighbour in closed or not is_passable(neighbour):
+                continue
+            # Diagonal steps need both sides free, not to clip a corner
+            if (
+                dx
+                and dy
+                and not (
+                    is_passable((tile_x + dx, tile_y))
+                    and is_passable((tile_x, tile_y + dy))
+                )
+            ):
+                continue
+            new_cost = cost + step_cost
+            if new_cost < costs.get(neighbour, math.inf):
+                costs[neighbour] = new_cost
+                parents[neighbour] = tile
+                heapq.heappush(
+                    open_heap,
+                    (new_cost + octile_distance(neighbour, goal), pushed, neighbour),
+                )
+                pushed += 1
+    return None
+
+
+class GridPathfinder:
+    """Cached A* searches over a map's blocked tiles.
+
+    Entities larger than a tile pass a size in tiles, paths then keep the
+    size x size square anchored at each tile free.
+    """
+
+    def __init__(self, game_map, max_paths: int = 256, max_nodes: int = 4096):
+        self.game_map = game_map
+        self.max_paths = max_paths
+        # Searches give up after expanding this many tiles
+        self.max_nodes = max_nodes
+        # None is cached too, for goals that could not be reached
+        self._paths: Dict[Tuple[Tile, Tile, int], Optional[Tuple[Tile, ...]]] = (
+            OrderedDict()
+        )
+        game_map.collision_listeners.append(self._on_collision_changed)
+
+    def close(self):
+        """Stop following the map's collision changes."""
+        if self._on_collision_changed in self.game_map.collision_listeners:
+            self.game_map.collision_listeners.remove(self._on_collision_changed)
+
+    def is_passable(self, tile_x: int, tile_y: int, size: int = 1) -> bool:
+        is_tile_blocked = self.game_map.is_tile_blocked
+        return not any(
+            is_tile_blocked(tile_x + dx, tile_y + dy)
+            for dy in range(size)
+            for dx in range(size)
+        )
+
+    def find_path(
+        self, start: Tile, goal: Tile, size: int = 1
+    ) -> Optional[Tuple[Tile, ...]]:
+        """Tiles from the one after start up to goal, None if unreachable."""
+        key = (start, goal, size)
+        if key in self._paths:
+            self._paths.move_to_end(key)
+            return self._paths[key]
+        if is_unreachable(self.game_map.region_labels, start, goal):
+            return None
+
+        path = self._search(start, goal, size)
+        self.store_path(start, goal, size, path)
+        return path
+
+    def store_path(
+        self, start: Tile, goal: Tile, size: int, path: Optional[Tuple[Tile, ...]]
+    ):
+        """Cache a search result, e.g. one found by the background path queue."""
+        self._paths[(start, goal, size)] = path
+        if len(self._paths) > self.max_paths:
+            self._paths.popitem(last=False)
+
+    def is_cached(self, start: Tile, goal: Tile, size: int = 1) -> bool:
+        return (start, goal, size) in self._paths
+
+    def _search(self, start: Tile, goal: Tile, size: int) -> Optional[Tuple[Tile, ...]]:
+        passable: Dict[Tile, bool] = {}
+
+        def is_passable(tile: Tile) -> bool:
+            free = passable.get(tile)
+            if free is None:
+                free = passable[tile] = self.is_passable(*tile, size)
+            return free
+
+        return search_grid(start, goal, is_passable, self.max_nodes)
+
+    def clear(self):
+        self._paths.clear()
+
+    def _on_collision_changed(self, tile_x: int, tile_y: int, blocked: bool):
+        if not blocked:
+            # Any path may get shorter, and unreachable goals reachable
+            self._paths.clear()
+            return
+
+        # A new obstacle only breaks the paths crossing it
+        stale = [
+            key
+            for key, path in self._paths.items()
+            if path
+            and any(
+                x <= tile_x < x + key[2] and y <= tile_y < y + key[2]
+                for x, y in (key[0],) + path
+            )
+        ]
+        for key in stale:
+            del self._paths[key]
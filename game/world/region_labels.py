@@ -0,0 +1,254 @@
+"""Connected regions of walkable tiles, to reject unreachable goals at once.
+
+Every free tile carries the label of its region, so two tiles are connected
+exactly when their labels match. Movement never cuts a blocked corner, so
+regions are 4-connected. Labels are built on first use by a union-find over
+the free runs of each row, then follow collision changes incrementally: an opened
+tile joins its neighbours' regions, relabeling the smaller ones, and a newly
+blocked tile floods from each of its neighbours in turn, relabeling the parts
+it split off as they close, which only walks the smaller parts.
+"""
+
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+Tile = Tuple[int, int]
+
+# Collision bytes read as 0 (free) or 1 (blocked)
+FREE_RUN_TABLE = bytes([0] + [1] * 255)
+
+# Labels are 16-bit until one goes past this, counting the regions split off
+# since load, then the array is widened to 32 bits
+MAX_SHORT_LABEL = 0xFFFF
+
+
+class RegionLabels:
+    """Region label per tile, 0 on blocked tiles."""
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.width = game_map.width
+        self.height = game_map.height
+        self.labels = array("H", bytes(2 * self.width * self.height))
+        # Free tiles per region label
+        self.sizes: Dict[int, int] = {}
+        self._next_label = 1
+        self._label_runs()
+        game_map.collision_listeners.append(self._on_collision_changed)
+
+    def close(self):
+        """Stop following the map's collision changes."""
+        if self._on_collision_changed in self.game_map.collision_listeners:
+            self.game_map.collision_listeners.remove(self._on_collision_changed)
+
+    def get_label(self, tile: Tile) -> int:
+        """Region of a tile, 0 when blocked or out of bounds."""
+        tile_x, tile_y = tile
+        if not (0 <= tile_x < self.width and 0 <= tile_y < self.height):
+            return 0
+        return self.labels[tile_y * self.width + tile_x]
+
+    def same_region(self, a: Tile, b: Tile) -> bool:
+        """Check that a walk exists between two free tiles."""
+        label = self.get_label(a)
+        return label != 0 and label == self.get_label(b)
+
+    @property
+    def region_count(self) -> int:
+        return len(self.sizes)
+
+    def _new_label(self) -> int:
+        label = self._next_label
+        self._next_label += 1
+        if label > MAX_SHORT_LABEL and self.labels.typecode == "H":
+            self.labels = array("i", self.labels)
+        return label
+
+    def _label_runs(self):
+        width = self.width
+        grid = bytes(self.game_map.collision_grid).translate(FREE_RUN_TABLE)
+        parents: List[int] = []
+        runs: List[Tuple[int, int]] = []
+
+        def find(run: int) -> int:
+            while parents[run] != run:
+                parents[run] = parents[parents[run]]
+                run = parents[run]
+            return run
+
+        previous: List[Tuple[int, int, int]] = []
+        for tile_y in range(self.height):
+            row_start = tile_y * width
+            row = grid[row_start : row_start + width]
+            current = []
+            start = row.find(0)
+            while start != -1:
+                end = row.find(1, start)
+                if end == -1:
+                    end = width
+                run = len(runs)
+                parents.append(run)
+                runs.append((row_start + start, row_start + end))
+                current.append((start, end, run))
+                start = row.find(0, end)
+
+            # Join the runs overlapping a run of the row above
+            index = 0
+            for start, end, run in current:
+                while index < len(previous) and previous[index][1] <= start:
+                    index += 1
+                above = index
+                while above < len(previous) and previous[above][0] < end:
+                    root = find(previous[above][2])
+                    parents[root] = find(run)
+                    above += 1
+            previous = current
+
+        root_labels: Dict[int, int] = {}
+        for run, (start, end) in enumerate(runs):
+            root = find(run)
+            label = root_labels.get(root)
+            if label is None:
+                label = root_labels[root] = self._new_label()
+                self.sizes[label] = 0
+            labels = self.labels  # Widened past MAX_SHORT_LABEL regions
+            labels[start:end] = array(labels.typecode, [label]) * (end - start)
+            self.sizes[label] += end - start
+
+    def _free_neighbours(self, index: int) -> List[int]:
+        width = self.width
+        tile_y, tile_x = divmod(index, width)
+        neighbours = []
+        if tile_x > 0:
+            neighbours.append(index - 1)
+        if tile_x < width - 1:
+            neighbours.append(index + 1)
+        if tile_y > 0:
+            neighbours.append(index - width)
+        if tile_y < self.height - 1:
+            neighbours.append(index + width)
+        return [neighbour for neighbour in neighbours if self.labels[neighbour]]
+
+    def _relabel(self, seed: int, label: int):
+        """Move the region holding a tile to another label."""
+        labels = self.labels
+        old_label = labels[seed]
+        labels[seed] = label
+        stack = [seed]
+        while stack:
+            for neighbour in self._free_neighbours(stack.pop()):
+                if labels[neighbour] == old_label:
+                    labels[neighbour] = label
+                    stack.append(neighbour)
+        self.sizes[label] += self.sizes.pop(old_label)
+
+    def _open_tile(self, index: int):
+        neighbours = self._free_neighbours(index)
+        regions = {self.labels[neighbour]: neighbour for neighbour in neighbours}
+        if not regions:
+            label = self._new_label()
+            self.sizes[label] = 1
+            self.labels[index] = label
+            return
+
+        label = max(regions, key=self.sizes.__getitem__)
+        self.labels[index] = label
+        self.sizes[label] += 1
+        for other_label, seed in regions.items():
+            if other_label != label:
+                self._relabel(seed, label)
+
+    def _block_tile(self, index: int):
+        labels = self.labels
+        label = labels[index]
+        labels[index] = 0
+        self.sizes[label] -= 1
+        if not self.sizes[label]:
+            del self.sizes[label]
+        seeds = self._free_neighbours(index)
+        if len(seeds) > 1:
+            self._split(label, seeds)
+
+    def _split(self, label: int, seeds: List[int]):
+        """Relabel the parts of a region cut apart around a blocked tile.
+
+        One flood per seed advances a tile at a time, floods meeting are
+        merged, and a group of floods with nothing left to visit is a whole
+        part, which gets a new label until a single part is left.
+        """
+        labels = self.labels
+        groups = list(range(len(seeds)))
+        owners = {seed: flood for flood, seed in enumerate(seeds)}
+        frontiers = [[seed] for seed in seeds]
+        visited = [[seed] for seed in seeds]
+
+        def find(flood: int) -> int:
+            while groups[flood] != flood:
+                flood = groups[flood]
+            return flood
+
+        alive = list(range(len(seeds)))
+        # Distinct groups among the floods still running
+        parts = len(seeds)
+        while parts > 1:
+            closed = False
+            for flood in alive:
+                frontier = frontiers[flood]
+                if not frontier:
+                    continue
+                for neighbour in self._free_neighbours(frontier.pop()):
+                    if labels[neighbour] != label:
+                        continue
+                    owner = owners.get(neighbour)
+                    if owner is None:
+                        owners[neighbour] = flood
+                        frontier.append(neighbour)
+                        visited[flood].append(neighbour)
+                    elif find(owner) != find(flood):
+                        groups[find(owner)] = find(flood)
+                        parts -= 1
+                closed = closed or not frontier
+            if closed:
+                parts = self._close_parts(label, alive, find, frontiers, visited)
+                labels = self.labels  # New labels may have widened it
+
+    def _close_parts(self, label, alive, find, frontiers, visited) -> int:
+        """Give new labels to the flood groups done visiting, but the last one."""
+        parts: Dict[int, List[int]] = {}
+        for flood in alive:
+            parts.setdefault(find(flood), []).append(flood)
+        remaining = len(parts)
+        for floods in parts.values():
+            if remaining <= 1:
+                break
+            if any(frontiers[flood] for flood in floods):
+                continue
+            new_label = self._new_label()
+            size = 0
+            for flood in floods:
+                for tile in visited[flood]:
+                    self.labels[tile] = new_label
+                size += len(visited[flood])
+                alive.remove(flood)
+            self.sizes[new_label] = size
+            self.sizes[label] -= size
+            remaining -= 1
+        return remaining
+
+    def _on_collision_changed(self, tile_x: int, tile_y: int, blocked: bool):
+        index = tile_y * self.width + tile_x
+        if blocked:
+            self._block_tile(index)
+        else:
+            self._open_tile(index)
+
+
+def is_unreachable(
+    region_labels: Optional[RegionLabels], start: Tile, goal: Tile
+) -> bool:
+    """Check whether labels prove a goal unreachable from a free start tile."""
+    return (
+        region_labels is not None
+        and region_labels.get_label(start) != 0
+        and not region_labels.same_region(start, goal)
+    )
@@ -0,0 +1,100 @@
+from typing import Dict, List, Tuple
+
+
+class SpatialGrid:
+    """Bucketed grid index of rectangles for point and area queries.
+
+    Items are stored in every cell their bounds overlap. Queries return the
+    candidates of the cells they touch, in insertion order, and callers apply
+    the exact intersection test on that short list.
+    """
+
+    def __init__(self, cell_size: int = 256):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Tuple[int, object]]] = {}
+        self._item_cells: Dict[int, Tuple[int, List[Tuple[int, int]]]] = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._item_cells)
+
+    def _cell_range(self, x: float, y: float, width: float, height: float):
+        cell_size = self.cell_size
+        return (
+            int(x // cell_size),
+            int(y // cell_size),
+            int((x + max(width, 1) - 1) // cell_size),
+            int((y + max(height, 1) - 1) // cell_size),
+        )
+
+    def insert(self, item, x: float, y: float, width: float, height: float):
+        """Index an item under the cells covered by its bounds."""
+        order = self._next_order
+        self._next_order += 1
+
+        start_x, start_y, end_x, end_y = self._cell_range(x, y, width, height)
+        cells = []
+        for cell_y in range(start_y, end_y + 1):
+            for cell_x in range(start_x, end_x + 1):
+                self._cells.setdefault((cell_x, cell_y), []).append((order, item))
+                cells.append((cell_x, cell_y))
+        self._item_cells[id(item)] = (order, cells)
+
+    def remove(self, item) -> bool:
+        """Remove an item, returns False if it was not indexed."""
+        entry = self._item_cells.pop(id(item), None)
+        if entry is None:
+            return False
+
+        order, cells = entry
+        for cell in cells:
+            bucket = self._cells[cell]
+            bucket.remove((order, item))
+            if not bucket:
+                del self._cells[cell]
+        return True
+
+    def move(self, item, x: float, y: float, width: float, height: float) -> bool:
+        """Update the bounds of an indexed item, returns False if it is not indexed.
+
+        Only touches the buckets when the item changes cells, so moving
+        entities can be re-indexed every frame.
+        """
+        entry = self._item_cells.get(id(item))
+        if entry is None:
+            return False
+
+        order, cells = entry
+        start_x, start_y, end_x, end_y = self._cell_range(x, y, width, height)
+        if cells[0] == (start_x, start_y) and cells[-1] == (end_x, end_y):
+            return True
+
+        for cell in cells:
+            bucket = self._cells[cell]
+            bucket.remove((order, item))
+            if not bucket:
+                del self._cells[cell]
+        cells = []
+        for cell_y in range(start_y, end_y + 1):
+            for cell_x in range(start_x, end_x + 1):
+                self._cells.setdefault((cell_x, cell_y), []).append((order, item))
+                cells.append((cell_x, cell_y))
+        self._item_cells[id(item)] = (order, cells)
+        return True
+
+    def query_rect(self, x: float, y: float, width: float, height: float) -> list:
+        """Get the items in the cells touched by a rectangle, in insertion order."""
+        start_x, start_y, end_x, end_y = self._cell_range(x, y, width, height)
+        found = {}
+        for cell_y in range(start_y, end_y + 1):
+            for cell_x in range(start_x, end_x + 1):
+                for order, item in self._cells.get((cell_x, cell_y), ()):
+                    found[order] = item
+        return [found[order] for order in sorted(found)]
+
+    def query_point(self, x: float, y: float) -> list:
+        """Get the items in the cell containing a point, in insertion order."""
+        bucket = self._cells.get(
+            (int(x // self.cell_size), int(y // self.cell_size)), ()
+        )
+        return [item for _, item in bucket]
@@ -0,0 +1,470 @@
+"""Streaming world split into region images loaded around the camera.
+
+A streaming world is a directory holding a ``world.json`` manifest and one PNG
+per region (``region_<rx>_<ry>.png``), using the same color vocabulary as a
+single-image map. Regions are decoded and scanned for object markers on a
+background thread, their objects (and sprites) are created on the main thread
+as they are installed, and the least recently used ones are evicted once more
+than ``max_regions`` are resident, so the world size is no longer bounded by
+memory.
+"""
+
+import json
+import os
+import queue
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import pygame
+
+from game.world.autotile import ALL_SIDES, compute_tile_mask
+from game.world.bitmap_map import BitmapMap
+from game.world.flow_field import FlowField
+from game.world.game_object import GameObject
+from game.world.line_of_sight import LineOfSight
+from game.world.map_scan import decode_surface, find_object_markers
+from game.world.object_types import ObjectType
+from game.world.pathfinding import GridPathfinder
+from game.world.spatial_index import SpatialGrid
+from game.world.terrain_cache import TerrainChunkCache
+from game.world.tile_palette import SPAWN_TILE_ID, TILE_WALKABLE, VOID_TILE_ID
+
+WORLD_MANIFEST = "world.json"
+
+
+def region_file_name(region_x: int, region_y: int) -> str:
+    return f"region_{region_x}_{region_y}.png"
+
+
+def is_streaming_world(path: str) -> bool:
+    """Check if a path points to a streaming world directory."""
+    return os.path.isfile(os.path.join(path, WORLD_MANIFEST))
+
+
+def write_streaming_world(map_path: str, world_dir: str, region_tiles: int = 64):
+    """Split a single-image map into a streaming world directory."""
+    surface = pygame.image.load(map_path)
+    width, height = surface.get_size()
+    os.makedirs(world_dir, exist_ok=True)
+
+    tile_ids = decode_surface(surface)
+    spawn_index = tile_ids.find(SPAWN_TILE_ID)
+    spawn_tile = [1, 1] if spawn_index == -1 else list(divmod(spawn_index, width))[::-1]
+
+    for region_y in range(-(-height // region_tiles)):
+        for region_x in range(-(-width // region_tiles)):
+            area = pygame.Rect(
+                region_x * region_tiles,
+                region_y * region_tiles,
+                region_tiles,
+                region_tiles,
+            ).clip(surface.get_rect())
+            pygame.image.save(
+                surface.subsurface(area),
+                os.path.join(world_dir, region_file_name(region_x, region_y)),
+            )
+
+    manifest = {
+        "width": width,
+        "height": height,
+        "region_tiles": region_tiles,
+        "spawn_tile": spawn_tile,
+    }
+    with open(os.path.join(world_dir, WORLD_MANIFEST), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+
+class MapRegion:
+    """Decoded tiles and objects of one region of a streaming world.
+
+    The worker fills in the tiles and object markers, objects and their
+    collision tiles are created when the region is installed.
+    """
+
+    def __init__(
+        self,
+        region_x: int,
+        region_y: int,
+        origin_x: int,
+        origin_y: int,
+        width: int,
+        height: int,
+        tile_ids: bytearray,
+        markers: List[Tuple[int, int, ObjectType]],
+    ):
+        self.region_x = region_x
+        self.region_y = region_y
+        self.origin_x = origin_x  # First tile covered, in world tile coordinates
+        self.origin_y = origin_y
+        self.width = width
+        self.height = height
+        self.tile_ids = tile_ids
+        self.markers = markers  # (world tile x, world tile y, object type)
+        self.objects: List[GameObject] = []
+        self.collision_tiles: Counter = Counter()  # Blocking objects per tile
+
+
+class StreamingMap(BitmapMap):
+    """BitmapMap whose regions are streamed in and out around the camera.
+
+    Tiles of regions that are not resident read as void, so entities cannot
+    walk into parts of the world that have not been loaded yet.
+    """
+
+    # Entrances and path snapshots span the whole world, which is never
+    # resident at once
+    hierarchical_pathfinder = None
+    path_queue = None
+    has_path_queue = False
+    # Regions connect through parts that are not resident
+    region_labels = None
+
+    def __init__(
+        self,
+        world_dir: str,
+        tile_size: int = 32,
+        max_regions: int = 25,
+        preload_margin: int = 1,
+        vectorized: Optional[bool] = None,
+        autotile: bool = False,
+        defer_objects: bool = False,
+    ):
+        with open(os.path.join(world_dir, WORLD_MANIFEST)) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        self.world_dir = world_dir
+        self.watch = False  # Regions are reloaded from disk as they stream in
+        self.tile_size = tile_size
+        self.vectorized = vectorized
+        self.autotile = autotile
+        self.width = manifest["width"]
+        self.height = manifest["height"]
+        self.region_tiles = manifest["region_tiles"]
+        self.max_regions = max_regions
+        self.preload_margin = preload_margin  # Extra regions loaded past the view
+        # Deferred objects: installed regions keep their markers until
+        # create_objects(), for worlds opened off the main thread
+        self.defer_objects = defer_objects
+
+        self.regions: Dict[Tuple[int, int], MapRegion] = OrderedDict()
+        self.object_collision_tiles: Counter = Counter()
+        self.object_index = SpatialGrid(cell_size=tile_size * 8)
+        self.terrain_cache = TerrainChunkCache(self)
+        self._line_of_sight: Optional[LineOfSight] = None
+        self._pathfinder: Optional[GridPathfinder] = None
+        self._flow_field: Optional[FlowField] = None
+        self.collision_listeners: List[Callable[[int, int, bool], None]] = []
+        self.tile_listeners: List[Callable[[int, int, int], None]] = []
+
+        self._pending: Set[Tuple[int, int]] = set()
+        self._requests: queue.Queue = queue.Queue()
+        self._loaded: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+
+        spawn_tile_x, spawn_tile_y = manifest["spawn_tile"]
+        self.spawn_point = self._find_walkable_spawn_near(spawn_tile_x, spawn_tile_y)
+        self.load_regions_around(*self.spawn_point)
+
+    def create_objects(self):
+        """Create the objects of the regions installed while deferring them."""
+        if self.defer_objects:
+            self.defer_objects = False
+            for region in self.regions.values():
+                self._create_region_objects(region)
+
+    @property
+    def objects(self) -> List[GameObject]:
+        """Objects of all resident regions."""
+        return [obj for region in self.regions.values() for obj in region.objects]
+
+    def get_region_key(self, tile_x: int, tile_y: int) -> Tuple[int, int]:
+        return (tile_x // self.region_tiles, tile_y // self.region_tiles)
+
+    def get_tile_id_at_grid(self, tile_x: int, tile_y: int) -> int:
+        if tile_x < 0 or tile_y < 0 or tile_x >= self.width or tile_y >= self.height:
+            return VOID_TILE_ID
+
+        region = self.regions.get(self.get_region_key(tile_x, tile_y))
+        if region is None:
+            return VOID_TILE_ID
+        return region.tile_ids[
+            (tile_y - region.origin_y) * region.width + tile_x - region.origin_x
+        ]
+
+    def get_tile_mask(self, tile_x: int, tile_y: int) -> int:
+        if not self.autotile:
+            return ALL_SIDES
+        # Computed as chunks are rendered, neighbours may lie in another region
+        return compute_tile_mask(
+            self.get_tile_id_at_grid, tile_x, tile_y, self.width, self.height
+        )
+
+    def is_tile_blocked(self, tile_x: int, tile_y: int) -> bool:
+        if not TILE_WALKABLE[self.get_tile_id_at_grid(tile_x, tile_y)]:
+            return True
+        return (tile_x, tile_y) in self.object_collision_tiles
+
+    def is_rect_walkable(self, x: float, y: float, width: float, height: float) -> bool:
+        # Regions come and go, so there is no summed-area table to query
+        for tile_y in range(
+            int(y // self.tile_size), int((y + height) // self.tile_size) + 1
+        ):
+            for tile_x in range(
+                int(x // self.tile_size), int((x + width) // self.tile_size) + 1
+            ):
+                if self.is_tile_blocked(tile_x, tile_y):
+                    return False
+        return True
+
+    def can_entity_fit(
+        self, x: float, y: float, width: int = 32, height: int = 32
+    ) -> bool:
+        # No clearance map either, the resident tiles are scanned instead
+        return self.is_player_spawn_safe(x, y, width, height)
+
+    def set_tile_at_grid(self, tile_x: int, tile_y: int, tile_id: int) -> bool:
+        region = self.regions.get(self.get_region_key(tile_x, tile_y))
+        if region is None:
+            return False
+
+        was_blocked = self.is_tile_blocked(tile_x, tile_y)
+        region.tile_ids[
+            (tile_y - region.origin_y) * region.width + tile_x - region.origin_x
+        ] = tile_id
+        self.terrain_cache.invalidate_tile_neighbourhood(tile_x, tile_y)
+        blocked = self.is_tile_blocked(tile_x, tile_y)
+        if blocked != was_blocked:
+            for listener in self.collision_listeners:
+                listener(tile_x, tile_y, blocked)
+        for listener in self.tile_listeners:
+            listener(tile_x, tile_y, tile_id)
+        return True
+
+    def add_obstacle(self, obj: GameObject) -> bool:
+        """Add an object to its region, False when that region is not resident.
+
+        The object lives as long as its region, it is dropped on eviction.
+        """
+        region = self._get_object_region(obj)
+        if region is None:
+            return False
+
+        region.objects.append(obj)
+        self.object_index.insert(obj, obj.x, obj.y, obj.width, obj.height)
+        if not obj.walkable:
+            self._update_collision_tiles(
+                region, obj.get_tile_coverage(self.tile_size), 1
+            )
+        return True
+
+    def remove_obstacle(self, obj: GameObject) -> bool:
+        region = self._get_object_region(obj)
+        if region is None or obj not in region.objects:
+            return False
+
+        region.objects.remove(obj)
+        self.object_index.remove(obj)
+        if not obj.walkable:
+            self._update_collision_tiles(
+                region, obj.get_tile_coverage(self.tile_size), -1
+            )
+        return True
+
+    def set_obstacle_blocking(self, obj: GameObject, blocking: bool):
+        region = self._get_object_region(obj)
+        if obj.walkable != blocking:
+            return
+        obj.walkable = not blocking
+        if region is not None:
+            self._update_collision_tiles(
+                region, obj.get_tile_coverage(self.tile_size), 1 if blocking else -1
+            )
+
+    def _get_object_region(self, obj: GameObject) -> Optional[MapRegion]:
+        return self.regions.get(
+            self.get_region_key(
+                int(obj.x // self.tile_size), int(obj.y // self.tile_size)
+            )
+        )
+
+    def _update_collision_tiles(
+        self, region: MapRegion, tiles: Iterable[Tuple[int, int]], delta: int
+    ):
+        for tile in tiles:
+            region.collision_tiles[tile] += delta
+            if region.collision_tiles[tile] <= 0:
+                del region.collision_tiles[tile]
+
+            was_blocked = self.is_tile_blocked(*tile)
+            self.object_collision_tiles[tile] += delta
+            if self.object_collision_tiles[tile] <= 0:
+                del self.object_collision_tiles[tile]
+            blocked = self.is_tile_blocked(*tile)
+            if blocked != was_blocked:
+                for listener in self.collision_listeners:
+                    listener(tile[0], tile[1], blocked)
+
+    def is_region_loaded(self, region_x: int, region_y: int) -> bool:
+        return (region_x, region_y) in self.regions
+
+    def request_region(self, region_x: int, region_y: int):
+        """Queue a region for background loading if it is not resident yet."""
+        key = (region_x, region_y)
+        if key in self.regions or key in self._pending:
+            return
+        if not (
+            0 <= region_x * self.region_tiles < self.width
+            and 0 <= region_y * self.region_tiles < self.height
+        ):
+            return
+
+        self._pending.add(key)
+        self._requests.put(key)
+
+    def load_regions_around(self, world_x: float, world_y: float, radius: int = 1):
+        """Synchronously load the regions around a point (used at startup)."""
+        center_x, center_y = self.get_region_key(
+            int(world_x // self.tile_size), int(world_y // self.tile_size)
+        )
+        keys = [
+            (region_x, region_y)
+            for region_y in range(center_y - radius, center_y + radius + 1)
+            for region_x in range(center_x - radius, center_x + radius + 1)
+        ]
+        for key in keys:
+            self.request_region(*key)
+        while any(key in self._pending for key in keys):
+            self._add_region(*self._loaded.get())
+
+    def update_view(
+        self, camera_x: float, camera_y: float, view_width: int, view_height: int
+    ):
+        """Stream regions in around the camera and evict far ones."""
+        region_pixels = self.region_tiles * self.tile_size
+        start_x = int(camera_x // region_pixels) - self.preload_margin
+        start_y = int(camera_y // region_pixels) - self.preload_margin
+        end_x = int((camera_x + view_width) // region_pixels) + self.preload_margin
+        end_y = int((camera_y + view_height) // region_pixels) + self.preload_margin
+
+        needed = set()
+        for region_y in range(start_y, end_y + 1):
+            for region_x in range(start_x, end_x + 1):
+                needed.add((region_x, region_y))
+                self.request_region(region_x, region_y)
+                if (region_x, region_y) in self.regions:
+                    self.regions.move_to_end((region_x, region_y))
+
+        # Integrate whatever the worker finished since last frame, never blocking
+        while True:
+            try:
+                self._add_region(*self._loaded.get_nowait())
+            except queue.Empty:
+                break
+
+        for key in list(self.regions):
+            if len(self.regions) <= self.max_regions:
+                break
+            if key not in needed:
+                self._evict_region(key)
+
+    def close(self):
+        """Stop the background loader thread."""
+        self._requests.put(None)
+        self._worker.join(timeout=1.0)
+
+    def _worker_loop(self):
+        while True:
+            key = self._requests.get()
+            if key is None:
+                return
+            try:
+                region = self._load_region(*key)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Warning: Could not load region {key}: {e}")
+                region = None
+            self._loaded.put((key, region))
+
+    def _load_region(self, region_x: int, region_y: int) -> MapRegion:
+        """Decode a region image and find its object markers (runs on the worker)."""
+        surface = pygame.image.load(
+            os.path.join(self.world_dir, region_file_name(region_x, region_y))
+        )
+        width, height = surface.get_size()
+        origin_x = region_x * self.region_tiles
+        origin_y = region_y * self.region_tiles
+        tile_ids = decode_surface(surface, self.vectorized)
+
+        markers = []
+        for index, object_type in find_object_markers(tile_ids, self.vectorized):
+            y, x = divmod(index, width)
+            markers.append((origin_x + x, origin_y + y, object_type))
+
+        return MapRegion(
+            region_x, region_y, origin_x, origin_y, width, height, tile_ids, markers
+        )
+
+    def _add_region(self, key: Tuple[int, int], region: Optional[MapRegion]):
+        self._pending.discard(key)
+        if region is None:
+            return
+
+        self.regions[key] = region
+        if not self.defer_objects:
+            self._create_region_objects(region)
+        # One tile more on each side, as edge masks depend on the next region
+        self.terrain_cache.invalidate_area(
+            region.origin_x - 1,
+            region.origin_y - 1,
+            region.width + 2,
+            region.height + 2,
+        )
+        if self._line_of_sight is not None:
+            # Tiles of the region read as void (blocked) while it is not resident
+            self._line_of_sight.invalidate_area(
+                region.origin_x, region.origin_y, region.width, region.height
+            )
+        if self._pathfinder is not None:
+            self._pathfinder.clear()
+        if self._flow_field is not None:
+            self._flow_field.invalidate_area(
+                region.origin_x, region.origin_y, region.width, region.height
+            )
+
+    def _create_region_objects(self, region: MapRegion):
+        # Objects load and convert their sprites, which belongs on the main thread
+        for tile_x, tile_y, object_type in region.markers:
+            obj = self._create_object(object_type, tile_x, tile_y)
+            region.objects.append(obj)
+            if not obj.walkable:
+                region.collision_tiles.update(obj.get_tile_coverage(self.tile_size))
+            self.object_index.insert(obj, obj.x, obj.y, obj.width, obj.height)
+        # Objects may overlap neighbour regions, so collision tiles are counted
+        self.object_collision_tiles.update(region.collision_tiles)
+
+    def _evict_region(self, key: Tuple[int, int]):
+        region = self.regions.pop(key)
+        for obj in region.objects:
+            self.object_index.remove(obj)
+        self.object_collision_tiles.subtract(region.collision_tiles)
+        for tile in region.collision_tiles:
+            if self.object_collision_tiles[tile] <= 0:
+                del self.object_collision_tiles[tile]
+        self.terrain_cache.invalidate_area(
+            region.origin_x - 1,
+            region.origin_y - 1,
+            region.width + 2,
+            region.height + 2,
+        )
+        if self._line_of_sight is not None:
+            # Tiles of the region read as void (blocked) while it is not resident
+            self._line_of_sight.invalidate_area(
+                region.origin_x, region.origin_y, region.width, region.height
+            )
+        if self._pathfinder is not None:
+            self._pathfinder.clear()
+        if self._flow_field is not None:
+            self._flow_field.invalidate_area(
+                region.origin_x, region.origin_y, region.width, region.height
+            )
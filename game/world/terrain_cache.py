@@ -0,0 +1,66 @@
+import pygame
+
+from game.world.autotile import ALL_SIDES, AutotileSet
+from game.world.chunk_cache import ChunkCache
+from game.world.tile_palette import TILE_RENDER_COLORS
+
+
+class TerrainChunkCache(ChunkCache):
+    """Pre-rendered terrain chunks, built lazily and kept in a bounded LRU cache.
+
+    Each chunk is a surface covering ``chunk_tiles`` x ``chunk_tiles`` tiles, so
+    rendering the terrain costs one blit per visible chunk instead of one draw
+    call per visible tile. On maps loaded with autotiling, tiles bordering another
+    terrain are drawn with the variant selected by their neighbour mask.
+    """
+
+    def __init__(self, game_map, chunk_tiles: int = 16, max_chunks: int = 32):
+        super().__init__(chunk_tiles, max_chunks)
+        self.game_map = game_map
+        self.autotiles = AutotileSet(game_map.tile_size)
+
+    @property
+    def width(self) -> int:
+        return self.game_map.width
+
+    @property
+    def height(self) -> int:
+        return self.game_map.height
+
+    @property
+    def tile_size(self) -> int:
+        return self.game_map.tile_size
+
+    def _render_chunk(self, chunk_x: int, chunk_y: int) -> pygame.Surface:
+        game_map = self.game_map
+        tile_size = game_map.tile_size
+        start_x, start_y, end_x, end_y = self._chunk_tile_bounds(chunk_x, chunk_y)
+
+        surface = pygame.Surface(
+            ((end_x - start_x) * tile_size, (end_y - start_y) * tile_size)
+        )
+        get_tile_id = game_map.get_tile_id_at_grid
+        get_tile_mask = game_map.get_tile_mask
+        get_variant = self.autotiles.get_variant
+        for tile_y in range(start_y, end_y):
+            for tile_x in range(start_x, end_x):
+                tile_id = get_tile_id(tile_x, tile_y)
+                mask = get_tile_mask(tile_x, tile_y)
+                position = (
+                    (tile_x - start_x) * tile_size,
+                    (tile_y - start_y) * tile_size,
+                )
+                if mask == ALL_SIDES:
+                    surface.fill(
+                        TILE_RENDER_COLORS[tile_id], (position, (tile_size, tile_size))
+                    )
+                else:
+                    surface.blit(get_variant(tile_id, mask), position)
+        return surface
+
+    def invalidate_tile_neighbourhood(self, tile_x: int, tile_y: int):
+        """Drop the chunks showing a tile and its neighbours.
+
+        The neighbours' autotile masks depend on the tile.
+        """
+        self.invalidate_area(tile_x - 1, tile_y - 1, 3, 3)
@@ -0,0 +1,160 @@
+"""Swept box movement against the tile grid and rectangular obstacles.
+
+The box is moved along x, then along y from the new x, like the previous
+x-then-y tries of the movement code. Each axis walks the tile columns (or
+rows) the leading edge crosses, so fast movement or a long frame can no longer
+step over a thin wall, and each crossed line costs one ``is_rect_walkable``
+query.
+"""
+
+from typing import Iterable, Tuple
+
+import pygame
+
+# Distance kept from a blocking tile edge, so the inclusive tile range of the
+# box stops on the free side of it
+CONTACT_EPSILON = 0.001
+
+
+def _sweep_tiles(game_map, start, span_start, span_end, size, delta, horizontal):
+    """Sweep one axis over the tile grid, returns (position, hit)."""
+    tile_size = game_map.tile_size
+
+    def line_blocked(tile):
+        if horizontal:
+            return not game_map.is_rect_walkable(
+                tile * tile_size, span_start, 0, span_end - span_start
+            )
+        return not game_map.is_rect_walkable(
+            span_start, tile * tile_size, span_end - span_start, 0
+        )
+
+    if delta > 0:
+        first = int((start + size) // tile_size)
+        last = int((start + size + delta) // tile_size)
+        # The leading line is checked too, so a box already inside a blocked
+        # tile stays put instead of sliding through it
+        for tile in range(first, last + 1):
+            if line_blocked(tile):
+                if tile == first:
+                    return start, True
+                return tile * tile_size - size - CONTACT_EPSILON, True
+    else:
+        first = int(start // tile_size)
+        last = int((start + delta) // tile_size)
+        for tile in range(first, last - 1, -1):
+            if line_blocked(tile):
+                if tile == first:
+                    return start, True
+                return (tile + 1) * tile_size, True
+    return start + delta, False
+
+
+def _sweep_rects(start, span_start, span_end, size, delta, rects, horizontal):
+    """Clamp one axis of movement against rectangles, returns (position, hit)."""
+    end = start + delta
+    hit = False
+    for rect in rects:
+        if horizontal:
+            near, far, side_start, side_end = (
+                rect.left,
+                rect.right,
+                rect.top,
+                rect.bottom,
+            )
+        else:
+            near, far, side_start, side_end = (
+                rect.top,
+                rect.bottom,
+                rect.left,
+                rect.right,
+            )
+        if side_end <= span_start or side_start >= span_end:
+            continue
+
+        if delta > 0:
+            if near < start + size and far > start:
+                # Already overlapping: only moving away from it is allowed
+                if near + far > 2 * start + size:
+                    return start, True
+            elif start + size <= near < end + size:
+                end = near - size
+                hit = True
+        else:
+            if near < start + size and far > start:
+                if near + far < 2 * start + size:
+                    return start, True
+            elif end < far <= start:
+                end = far
+                hit = True
+    return end, hit
+
+
+def sweep_box(
+    game_map,
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+    delta_x: float,
+    delta_y: float,
+    blockers: Iterable[pygame.Rect] = (),
+    tile_margin: float = 0,
+) -> Tuple[float, float, Tuple[int, int]]:
+    """Move a box as far as possible towards (x + delta_x, y + delta_y).
+
+    Tiles are tested against the box shrunk by tile_margin on every side,
+    blocker rectangles against the full box. Returns the new position and the
+    contact normal, (0, 0) when nothing was hit, e.g. (-1, 0) when stopped by
+    something on the right.
+    """
+    blockers = list(blockers)
+    normal_x = normal_y = 0
+    inner_width = width - 2 * tile_margin
+    inner_height = height - 2 * tile_margin
+
+    if delta_x:
+        tile_x, tile_hit = _sweep_tiles(
+            game_map,
+            x + tile_margin,
+            y + tile_margin,
+            y + tile_margin + inner_height,
+            inner_width,
+            delta_x,
+            True,
+        )
+        rect_x, rect_hit = _sweep_rects(
+            x, y, y + height, width, delta_x, blockers, True
+        )
+        new_x = (
+            min(tile_x - tile_margin, rect_x)
+            if delta_x > 0
+            else max(tile_x - tile_margin, rect_x)
+        )
+        if tile_hit or rect_hit:
+            normal_x = -1 if delta_x > 0 else 1
+        x = new_x
+
+    if delta_y:
+        tile_y, tile_hit = _sweep_tiles(
+            game_map,
+            y + tile_margin,
+            x + tile_margin,
+            x + tile_margin + inner_width,
+            inner_height,
+            delta_y,
+            False,
+        )
+        rect_y, rect_hit = _sweep_rects(
+            y, x, x + width, height, delta_y, blockers, False
+        )
+        new_y = (
+            min(tile_y - tile_margin, rect_y)
+            if delta_y > 0
+            else max(tile_y - tile_margin, rect_y)
+        )
+        if tile_hit or rect_hit:
+            normal_y = -1 if delta_y > 0 else 1
+        y = new_y
+
+    return x, y, (normal_x, normal_y)
@@ -0,0 +1,51 @@
+from typing import List, Optional, Tuple
+
+from game.world.object_types import OBJECT_TYPES, ObjectType
+from game.world.tile_types import TILE_TYPES, TileType, get_tile_type
+
+# Tile ids are indices into the tables below. Every TILE_TYPES color gets an id,
+# followed by one id per OBJECT_TYPES marker color. Object markers read as the
+# default tile but are drawn as grass, since objects sit on plain ground.
+PALETTE_COLORS: List[Tuple[int, int, int]] = list(TILE_TYPES) + list(OBJECT_TYPES)
+PALETTE_TILES: List[TileType] = list(TILE_TYPES.values()) + [
+    get_tile_type((255, 255, 255)) for _ in OBJECT_TYPES
+]
+PALETTE_OBJECTS: List[Optional[ObjectType]] = [None] * len(TILE_TYPES) + list(
+    OBJECT_TYPES.values()
+)
+
+TILE_IDS = {color: tile_id for tile_id, color in enumerate(PALETTE_COLORS)}
+# Marker tile id of each object type, by name
+OBJECT_TILE_IDS = {
+    obj.name: tile_id for tile_id, obj in enumerate(PALETTE_OBJECTS) if obj is not None
+}
+FIRST_OBJECT_TILE_ID = len(TILE_TYPES)
+VOID_TILE_ID = TILE_IDS[(0, 0, 0)]
+DEFAULT_TILE_ID = TILE_IDS[(255, 255, 255)]
+SPAWN_TILE_ID = TILE_IDS[(255, 0, 0)]
+
+# Parallel property tables indexed by tile id
+TILE_WALKABLE = bytes(tile.walkable for tile in PALETTE_TILES)
+# bytes.translate table turning a tile id grid into a 0/1 blocked grid
+TILE_BLOCKED_TABLE = bytes(not walkable for walkable in TILE_WALKABLE).ljust(
+    256, b"\x01"
+)
+TILE_RENDER_COLORS: List[Tuple[int, int, int]] = [
+    tile.color if obj is None else get_tile_type((34, 139, 34)).color
+    for tile, obj in zip(PALETTE_TILES, PALETTE_OBJECTS)
+]
+
+assert len(PALETTE_COLORS) <= 256, "Tile ids must fit in a uint8"
+
+
+def get_tile_id(color: Tuple[int, int, int]) -> int:
+    """Get the tile id for a map color, unknown colors map to the default tile."""
+    return TILE_IDS.get(color, DEFAULT_TILE_ID)
+
+
+def decode_rgb(rgb: bytes) -> bytearray:
+    """Decode packed RGB pixel data into one tile id byte per pixel."""
+    lookup = TILE_IDS.get
+    return bytearray(
+        lookup(color, DEFAULT_TILE_ID) for color in zip(rgb[0::3], rgb[1::3], rgb[2::3])
+    )
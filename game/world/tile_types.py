@@ -15,6 +15,7 @@ TILE_TYPES = {
     (128, 128, 128): TileType("stone", True, (128, 128, 128)),
     (0, 0, 255): TileType("water", False, (0, 100, 255)),
     (255, 0, 0): TileType("spawn", True, (34, 139, 34)),
+    (255, 0, 255): TileType("enemy_spawn", True, (34, 139, 34)),
     (255, 255, 0): TileType("chest", True, (255, 255, 0)),
     (165, 42, 42): TileType("wall", False, (100, 50, 50)),
     (255, 255, 255): TileType("default", True, (34, 139, 34)),
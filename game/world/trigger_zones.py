@@ -0,0 +1,102 @@
+from typing import Callable, List, Optional, Tuple
+
+from game.world.spatial_index import SpatialGrid
+
+
+class TriggerZone:
+    """Circular zone around a world point, e.g. the interaction radius of a chest."""
+
+    def __init__(
+        self,
+        kind: str,
+        owner,
+        center_x: float,
+        center_y: float,
+        radius: float,
+        on_enter: Optional[Callable[["TriggerZone"], None]] = None,
+        on_exit: Optional[Callable[["TriggerZone"], None]] = None,
+    ):
+        self.kind = kind  # "chest", later "npc", "trap", "door"...
+        self.owner = owner
+        self.center_x = center_x
+        self.center_y = center_y
+        self.radius = radius
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+
+    def contains(self, x: float, y: float) -> bool:
+        dx = x - self.center_x
+        dy = y - self.center_y
+        return dx * dx + dy * dy <= self.radius * self.radius
+
+    def distance_squared(self, x: float, y: float) -> float:
+        dx = x - self.center_x
+        dy = y - self.center_y
+        return dx * dx + dy * dy
+
+
+class TriggerZoneManager:
+    """Trigger zones indexed in a spatial grid, tracking the zones a point is in.
+
+    ``update`` is called with the player position once per frame and reports
+    the zones entered and exited since the previous call, so interaction
+    prompts follow events instead of scanning every zone.
+    """
+
+    def __init__(self, cell_size: int = 128):
+        self.index = SpatialGrid(cell_size)
+        self.active_zones: List[TriggerZone] = []
+        self.position: Optional[Tuple[float, float]] = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def add_zone(self, zone: TriggerZone) -> TriggerZone:
+        self.index.insert(
+            zone,
+            zone.center_x - zone.radius,
+            zone.center_y - zone.radius,
+            2 * zone.radius + 1,
+            2 * zone.radius + 1,
+        )
+        return zone
+
+    def remove_zone(self, zone: TriggerZone) -> bool:
+        """Unregister a zone, emitting its exit event if the point was inside."""
+        if not self.index.remove(zone):
+            return False
+        if zone in self.active_zones:
+            self.active_zones.remove(zone)
+            if zone.on_exit:
+                zone.on_exit(zone)
+        return True
+
+    def zones_at(
+        self, x: float, y: float, kind: Optional[str] = None
+    ) -> List[TriggerZone]:
+        """Get the zones containing a point, in registration order."""
+        return [
+            zone
+            for zone in self.index.query_point(x, y)
+            if (kind is None or zone.kind == kind) and zone.contains(x, y)
+        ]
+
+    def update(self, x: float, y: float) -> Tuple[List[TriggerZone], List[TriggerZone]]:
+        """Move the tracked point, returns the (entered, exited) zones."""
+        self.position = (x, y)
+        current = self.zones_at(x, y)
+        entered = [zone for zone in current if zone not in self.active_zones]
+        exited = [zone for zone in self.active_zones if zone not in current]
+        self.active_zones = current
+
+        for zone in exited:
+            if zone.on_exit:
+                zone.on_exit(zone)
+        for zone in entered:
+            if zone.on_enter:
+                zone.on_enter(zone)
+        return entered, exited
+
+    def get_active_zones(self, kind: Optional[str] = None) -> List[TriggerZone]:
+        """Zones the tracked point was in at the last update."""
+        return [zone for zone in self.active_zones if kind is None or zone.kind == kind]
@@ -0,0 +1,249 @@
+"""World made of several maps (zones) connected by portals.
+
+A zone world is a directory holding a ``zones.json`` manifest::
+
+    {
+      "start": "village",
+      "zones": {"village": "village.png", "forest": "forest.png"},
+      "portals": [
+        {"zone": "village", "tile": [12, 0], "size": [2, 1],
+         "target": "forest", "target_tile": [20, 30]}
+      ]
+    }
+
+Zone maps can be single images, compiled or layered maps, or streaming
+world directories. Zones reachable through a portal from the current one are
+decoded on a background thread, then get their objects and their arrival area
+pre-rendered on the main thread, so a transition only swaps the current map.
+Recently visited zones stay in a bounded LRU cache.
+"""
+
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import pygame
+
+from game.world.bitmap_map import BitmapMap
+from game.world.streaming_map import StreamingMap, is_streaming_world
+
+ZONE_MANIFEST = "zones.json"
+
+
+def is_zone_world(path: str) -> bool:
+    """Check if a path points to a zone world directory."""
+    return os.path.isfile(os.path.join(path, ZONE_MANIFEST))
+
+
+class Portal:
+    """Rectangle of tiles in one zone leading to a tile of another zone."""
+
+    def __init__(
+        self,
+        zone: str,
+        tile_x: int,
+        tile_y: int,
+        width: int,
+        height: int,
+        target_zone: str,
+        target_tile_x: int,
+        target_tile_y: int,
+    ):
+        self.zone = zone
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+        self.width = width  # Size in tiles
+        self.height = height
+        self.target_zone = target_zone
+        self.target_tile_x = target_tile_x
+        self.target_tile_y = target_tile_y
+
+    def get_tiles(self) -> List[Tuple[int, int]]:
+        return [
+            (self.tile_x + dx, self.tile_y + dy)
+            for dy in range(self.height)
+            for dx in range(self.width)
+        ]
+
+
+class ZoneWorld:
+    """Zones of a world, with the current one and a cache of loaded maps."""
+
+    def __init__(self, world_dir: str, tile_size: int = 32, max_cached_zones: int = 4):
+        with open(os.path.join(world_dir, ZONE_MANIFEST)) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        self.world_dir = world_dir
+        self.tile_size = tile_size
+        self.max_cached_zones = max_cached_zones
+        self.zone_paths: Dict[str, str] = {
+            name: os.path.join(world_dir, path)
+            for name, path in manifest["zones"].items()
+        }
+
+        # Portals of each zone, indexed by the tiles they cover
+        self.portals: Dict[str, Dict[Tuple[int, int], Portal]] = {
+            name: {} for name in self.zone_paths
+        }
+        for entry in manifest.get("portals", []):
+            width, height = entry.get("size", [1, 1])
+            portal = Portal(
+                entry["zone"],
+                entry["tile"][0],
+                entry["tile"][1],
+                width,
+                height,
+                entry["target"],
+                entry["target_tile"][0],
+                entry["target_tile"][1],
+            )
+            for tile in portal.get_tiles():
+                self.portals[portal.zone][tile] = portal
+
+        self.maps: Dict[str, BitmapMap] = OrderedDict()
+        self._pending: Set[str] = set()
+        self._requests: queue.Queue = queue.Queue()
+        self._loaded: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+
+        # Portals only fire again once the player has stepped off the one
+        # they arrived on
+        self._portal_armed = False
+        self.current_zone = manifest.get("start", next(iter(self.zone_paths)))
+        self.enter_zone(self.current_zone)
+
+    @property
+    def current_map(self) -> BitmapMap:
+        return self.maps[self.current_zone]
+
+    def get_neighbour_zones(self, zone: str) -> List[str]:
+        """Zones reachable through one portal, in manifest order."""
+        neighbours = []
+        for portal in self.portals[zone].values():
+            if portal.target_zone != zone and portal.target_zone not in neighbours:
+                neighbours.append(portal.target_zone)
+        return neighbours
+
+    def is_zone_loaded(self, zone: str) -> bool:
+        return zone in self.maps
+
+    def enter_zone(self, zone: str) -> BitmapMap:
+        """Make a zone current, waiting for it only if it is not preloaded yet."""
+        if zone not in self.zone_paths:
+            raise KeyError(f"Unknown zone '{zone}'")
+
+        self.current_zone = zone
+        self._portal_armed = False
+        if zone not in self.maps:
+            if zone in self._pending:
+                while zone in self._pending:
+                    self._add_map(*self._loaded.get())
+            if zone not in self.maps:
+                self._add_map(zone, self._load_map(zone))
+        self.maps.move_to_end(zone)
+
+        for neighbour in self.get_neighbour_zones(zone):
+            self.request_zone(neighbour)
+        self._evict_maps()
+        return self.maps[zone]
+
+    def request_zone(self, zone: str):
+        """Queue a zone for background loading if it is not cached yet."""
+        if zone in self.maps or zone in self._pending:
+            return
+        self._pending.add(zone)
+        self._requests.put(zone)
+
+    def update(self):
+        """Integrate the zones the worker finished, never blocking."""
+        while True:
+            try:
+                self._add_map(*self._loaded.get_nowait())
+            except queue.Empty:
+                break
+        self._evict_maps()
+
+    def check_portal(self, world_x: float, world_y: float) -> Optional[Portal]:
+        """Get the portal of the current zone under a point, if it should fire."""
+        portal = self.portals[self.current_zone].get(
+            (int(world_x // self.tile_size), int(world_y // self.tile_size))
+        )
+        if portal is None:
+            self._portal_armed = True
+            return None
+        return portal if self._portal_armed else None
+
+    def take_portal(self, portal: Portal) -> Tuple[BitmapMap, Tuple[float, float]]:
+        """Switch to the portal's target zone, returns its map and arrival point."""
+        game_map = self.enter_zone(portal.target_zone)
+        arrival = (
+            portal.target_tile_x * self.tile_size + self.tile_size // 2,
+            portal.target_tile_y * self.tile_size + self.tile_size // 2,
+        )
+        return game_map, arrival
+
+    def close(self):
+        """Stop the background loader and the workers of the maps it holds."""
+        self._requests.put(None)
+        self._worker.join(timeout=1.0)
+        for game_map in self.maps.values():
+            game_map.close()
+
+    def _load_map(self, zone: str) -> BitmapMap:
+        """Decode a zone's tiles and find its markers, _add_map does the rest."""
+        path = self.zone_paths[zone]
+        if is_streaming_world(path):
+            return StreamingMap(path, tile_size=self.tile_size, defer_objects=True)
+        return BitmapMap(path, tile_size=self.tile_size, defer_objects=True)
+
+    def _warm_arrivals(self, zone: str, game_map: BitmapMap):
+        """Pre-render the terrain chunks around the tiles portals arrive on."""
+        cache = game_map.terrain_cache
+        for portals in self.portals.values():
+            for portal in set(portals.values()):
+                if portal.target_zone == zone:
+                    chunk_x = portal.target_tile_x // cache.chunk_tiles
+                    chunk_y = portal.target_tile_y // cache.chunk_tiles
+                    for neighbour_y in range(chunk_y - 1, chunk_y + 2):
+                        for neighbour_x in range(chunk_x - 1, chunk_x + 2):
+                            if (
+                                0 <= neighbour_x * cache.chunk_tiles < game_map.width
+                                and 0
+                                <= neighbour_y * cache.chunk_tiles
+                                < game_map.height
+                            ):
+                                cache.get_chunk(neighbour_x, neighbour_y)
+
+    def _worker_loop(self):
+        while True:
+            zone = self._requests.get()
+            if zone is None:
+                return
+            try:
+                game_map = self._load_map(zone)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Warning: Could not preload zone '{zone}': {e}")
+                game_map = None
+            self._loaded.put((zone, game_map))
+
+    def _add_map(self, zone: str, game_map: Optional[BitmapMap]):
+        self._pending.discard(zone)
+        if game_map is not None and zone not in self.maps:
+            # Objects load and convert their sprites, and chunks are drawn,
+            # which belongs on this thread
+            game_map.create_objects()
+            self._warm_arrivals(zone, game_map)
+            self.maps[zone] = game_map
+
+    def _evict_maps(self):
+        """Drop least recently used zones, never the current one or its neighbours."""
+        keep = {self.current_zone, *self.get_neighbour_zones(self.current_zone)}
+        for zone in list(self.maps):
+            if len(self.maps) <= self.max_cached_zones:
+                break
+            if zone not in keep:
+                self.maps.pop(zone).close()
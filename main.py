@@ -5,7 +5,8 @@ import pygame
 from game.engine.game import Game
 
 def main():
-    game = Game()
+    # --watch : recharge la carte à chaud quand son fichier PNG est modifié
+    game = Game(watch_map="--watch" in sys.argv[1:])
     game.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement des cartes bitmap.
+
+Compare le chargeur d'origine (unmap_rgb pixel par pixel) avec le chemin de
+chargement pur Python et le chemin vectorisé NumPy (décodage de la grille de
+tuiles et recherche des marqueurs d'objets), puis le chargement de la même
+carte au format en couches .lmap. Les cartes compilées .cmap sont ignorées,
+pour mesurer le décodage du PNG.
+
+Usage:
+    python scripts/benchmark_map_loading.py [map.png ...] [--size 2048] [--runs 3]
+        [--density 0.02]
+
+Sans carte en argument, une carte aléatoire de --size x --size est générée.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from game.world.bitmap_map import BitmapMap  # noqa: E402
+from game.world.layered_map import split_layers, write_layered_map  # noqa: E402
+from game.world.map_scan import (  # noqa: E402
+    HAS_NUMPY,
+    decode_surface,
+    find_object_markers,
+)
+from game.world.object_types import OBJECT_TYPES, get_object_type  # noqa: E402
+from game.world.tile_types import get_tile_type  # noqa: E402
+
+
+def create_random_map(
+    path: str, size: int, object_density: float = 0.02, seed: int = 0
+):
+    """Génère une carte d'herbe avec de l'eau, des murs et des objets épars."""
+    rng = random.Random(seed)
+    surface = pygame.Surface((size, size))
+    surface.fill((34, 139, 34))
+
+    for _ in range(size // 8):
+        x, y = rng.randrange(size), rng.randrange(size)
+        surface.fill((0, 0, 255), (x, y, rng.randint(2, 24), rng.randint(2, 24)))
+        surface.fill((165, 42, 42), (rng.randrange(size), rng.randrange(size), 1, 12))
+
+    object_colors = list(OBJECT_TYPES)
+    for _ in range(int(size * size * object_density)):
+        surface.set_at(
+            (rng.randrange(size), rng.randrange(size)), rng.choice(object_colors)
+        )
+
+    surface.set_at((size // 2, size // 2), (255, 0, 0))
+    pygame.image.save(surface, path)
+
+
+def scan_per_pixel(surface: pygame.Surface):
+    """Chargeur d'origine : une lecture unmap_rgb et deux recherches par pixel."""
+    pixel_array = pygame.PixelArray(surface)
+    width, height = surface.get_size()
+    tiles = []
+    markers = []
+    for y in range(height):
+        for x in range(width):
+            color = surface.unmap_rgb(pixel_array[x, y])
+            color_tuple = (color.r, color.g, color.b)
+            tiles.append(get_tile_type(color_tuple))
+            object_type = get_object_type(color_tuple)
+            if object_type:
+                markers.append((y * width + x, object_type))
+    pixel_array.close()
+    return tiles, markers
+
+
+def best_of(runs: int, func):
+    """Retourne le meilleur temps (en secondes) et le dernier résultat."""
+    best = float("inf")
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_map(map_path: str, runs: int):
+    surface = pygame.image.load(map_path)
+    width, height = surface.get_size()
+    print(f"\n{map_path} ({width}x{height} tuiles)")
+
+    baseline_time, (_, baseline_markers) = best_of(
+        runs, lambda: scan_per_pixel(surface)
+    )
+    print(
+        f"  origine unmap_rgb par pixel {baseline_time * 1000:8.1f} ms "
+        f"({len(baseline_markers)} objets)"
+    )
+
+    paths = [("python", False)]
+    if HAS_NUMPY:
+        paths.append(("numpy", True))
+    else:
+        print("  numpy non installé, seul le chemin pur Python est mesuré")
+
+    for name, vectorized in paths:
+        decode_time, tile_ids = best_of(
+            runs, lambda v=vectorized: decode_surface(surface, v)
+        )
+        scan_time, markers = best_of(
+            runs, lambda v=vectorized, t=tile_ids: find_object_markers(t, v)
+        )
+        load_time, game_map = best_of(
+            runs,
+            lambda v=vectorized, p=map_path: BitmapMap(
+                p, vectorized=v, use_compiled=False
+            ),
+        )
+        print(
+            f"  {name:<7} décodage {decode_time * 1000:8.1f} ms "
+            f"(x{baseline_time / decode_time:.0f}) | "
+            f"marqueurs {scan_time * 1000:8.1f} ms ({len(markers)} objets) | "
+            f"BitmapMap complet {load_time * 1000:8.1f} ms"
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        layered_path = os.path.join(tmp_dir, "map.lmap")
+        write_layered_map(
+            layered_path,
+            game_map.width,
+            game_map.height,
+            split_layers(game_map.tile_ids, game_map.collision_grid),
+        )
+        print(
+            f"  taille  PNG {os.path.getsize(map_path) / 1024:8.1f} Ko | "
+            f"couches {os.path.getsize(layered_path) / 1024:8.1f} Ko"
+        )
+        for name, vectorized in paths:
+            load_time, _ = best_of(
+                runs,
+                lambda v=vectorized, p=layered_path: BitmapMap(
+                    p, vectorized=v, use_compiled=False
+                ),
+            )
+            print(f"  {name:<7} BitmapMap .lmap    {load_time * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("maps", nargs="*", help="Cartes PNG à mesurer")
+    parser.add_argument(
+        "--size", type=int, default=2048, help="Taille de la carte générée"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Nombre de répétitions")
+    parser.add_argument(
+        "--density", type=float, default=0.02, help="Densité d'objets générés"
+    )
+    args = parser.parse_args()
+
+    pygame.init()
+    try:
+        if args.maps:
+            for map_path in args.maps:
+                benchmark_map(map_path, args.runs)
+        else:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                map_path = os.path.join(tmp_dir, f"random_{args.size}.png")
+                create_random_map(map_path, args.size, args.density)
+                benchmark_map(map_path, args.runs)
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
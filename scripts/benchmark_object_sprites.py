@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement des sprites d'objets de carte.
+
+Mesure le temps de chargement d'une BitmapMap et la mémoire résidente (RSS)
+consommée, chaque carte étant chargée dans un processus séparé pour que les
+mesures de mémoire ne se mélangent pas.
+
+Usage:
+    python scripts/benchmark_object_sprites.py [map.png ...] [--objects 5000]
+
+Sans carte en argument, data/maps/large_map.png est mesurée ainsi qu'une
+carte générée contenant --objects objets.
+"""
+
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import pygame  # noqa: E402
+
+from game.world.bitmap_map import BitmapMap  # noqa: E402
+from game.world.object_types import OBJECT_TYPES  # noqa: E402
+
+
+def current_rss_kb() -> int:
+    """Retourne la mémoire résidente actuelle du processus en Ko."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    # Hors Linux, on se rabat sur le pic de mémoire
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def create_object_map(path: str, size: int, object_count: int, seed: int = 0):
+    """Génère une carte d'herbe parsemée d'objets de tous les types."""
+    rng = random.Random(seed)
+    surface = pygame.Surface((size, size))
+    surface.fill((34, 139, 34))
+    object_colors = list(OBJECT_TYPES)
+    for _ in range(object_count):
+        surface.set_at(
+            (rng.randrange(size), rng.randrange(size)), rng.choice(object_colors)
+        )
+    surface.set_at((size // 2, size // 2), (255, 0, 0))
+    pygame.image.save(surface, path)
+
+
+def measure_map(map_path: str):
+    """Charge une carte et affiche temps, RSS et nombre de sprites distincts."""
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    rss_before = current_rss_kb()
+    start = time.perf_counter()
+    game_map = BitmapMap(map_path, use_compiled=False)
+    load_time = time.perf_counter() - start
+    rss_after = current_rss_kb()
+
+    sprites = {id(obj.sprite_surface) for obj in game_map.objects}
+    print(
+        f"{map_path}: {len(game_map.objects)} objets, "
+        f"{len(sprites)} surfaces distinctes | "
+        f"chargement {load_time * 1000:8.1f} ms | "
+        f"RSS +{(rss_after - rss_before) / 1024:6.1f} Mo"
+    )
+    pygame.quit()
+
+
+def run_isolated(map_path: str):
+    subprocess.run(
+        [sys.executable, __file__, "--measure", map_path], cwd=REPO_ROOT, check=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("maps", nargs="*", help="Cartes PNG à mesurer")
+    parser.add_argument(
+        "--objects", type=int, default=5000, help="Objets de la carte générée"
+    )
+    parser.add_argument("--size", type=int, default=512, help="Taille de la carte")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure_map(args.measure)
+        return
+
+    if args.maps:
+        for map_path in args.maps:
+            run_isolated(os.path.abspath(map_path))
+        return
+
+    run_isolated(str(REPO_ROOT / "data" / "maps" / "large_map.png"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        map_path = os.path.join(tmp_dir, f"objects_{args.objects}.png")
+        pygame.init()
+        create_object_map(map_path, args.size, args.objects)
+        pygame.quit()
+        run_isolated(map_path)
+
+
+if __name__ == "__main__":
+    main()
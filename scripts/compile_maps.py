@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compile les cartes PNG au format binaire .cmap (chargé par mmap au démarrage),
+ou au format en couches compressées .lmap avec --layered.
+
+Usage:
+    python scripts/compile_maps.py                 # toutes les cartes de data/maps
+    python scripts/compile_maps.py data/maps/large_map.png
+    python scripts/compile_maps.py --force         # recompile même si à jour
+    python scripts/compile_maps.py --layered       # cartes en couches (.lmap)
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from game.world.bitmap_map import BitmapMap  # noqa: E402
+from game.world.compiled_map import (  # noqa: E402
+    compiled_path_for,
+    find_compiled_map,
+    write_compiled_map,
+)
+from game.world.layered_map import (  # noqa: E402
+    LAYERED_MAP_SUFFIX,
+    split_layers,
+    write_layered_map,
+)
+
+
+def compile_map(map_path: str, force: bool = False) -> bool:
+    """Compile une carte, retourne False si la version compilée est déjà à jour."""
+    compiled_path = compiled_path_for(map_path)
+    if not force and find_compiled_map(map_path) == compiled_path:
+        print(f"{compiled_path} est à jour")
+        return False
+
+    start = time.perf_counter()
+    game_map = BitmapMap(map_path, use_compiled=False)
+    write_compiled_map(game_map, compiled_path)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"{map_path} -> {compiled_path} "
+        f"({game_map.width}x{game_map.height}, {len(game_map.objects)} objets, "
+        f"{elapsed:.0f} ms)"
+    )
+    return True
+
+
+def compile_layered_map(map_path: str, force: bool = False) -> bool:
+    """Écrit la carte en couches, retourne False si elle est déjà à jour."""
+    layered_path = os.path.splitext(map_path)[0] + LAYERED_MAP_SUFFIX
+    if (
+        not force
+        and os.path.exists(layered_path)
+        and os.path.getmtime(layered_path) >= os.path.getmtime(map_path)
+    ):
+        print(f"{layered_path} est à jour")
+        return False
+
+    start = time.perf_counter()
+    game_map = BitmapMap(map_path, use_compiled=False)
+    write_layered_map(
+        layered_path,
+        game_map.width,
+        game_map.height,
+        split_layers(game_map.tile_ids, game_map.collision_grid),
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"{map_path} -> {layered_path} "
+        f"({os.path.getsize(map_path) // 1024} Ko -> "
+        f"{os.path.getsize(layered_path) // 1024} Ko, {elapsed:.0f} ms)"
+    )
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "maps", nargs="*", help="Cartes PNG à compiler (défaut: data/maps/*.png)"
+    )
+    parser.add_argument("--force", action="store_true", help="Toujours recompiler")
+    parser.add_argument(
+        "--layered", action="store_true", help="Écrire des cartes en couches (.lmap)"
+    )
+    args = parser.parse_args()
+
+    map_paths = args.maps or sorted(glob.glob("data/maps/*.png"))
+    pygame.init()
+    try:
+        for map_path in map_paths:
+            if args.layered:
+                compile_layered_map(map_path, args.force)
+            else:
+                compile_map(map_path, args.force)
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Génère des cartes procédurales reproductibles pour les benchmarks.
+
+La même taille, la même graine et la même densité donnent toujours la même
+image : terrain varié, lacs et rivières, routes, ruines, forêts, villages
+clôturés, coffres, points d'apparition d'ennemis et du joueur.
+
+Usage:
+    python scripts/generate_map.py carte.png --size 2048 --seed 42
+    python scripts/generate_map.py --corpus data/maps/generated
+    python scripts/generate_map.py --corpus dossier --sizes 256 1024 --seeds 0 1
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from game.world.map_generator import generate_map  # noqa: E402
+
+CORPUS_SIZES = [256, 1024, 4096, 8192]
+
+
+def write_map(path: str, size: int, seed: int, density: float):
+    start = time.perf_counter()
+    surface = generate_map(size, size, seed, density)
+    pygame.image.save(surface, path)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{path} ({size}x{size}, graine {seed}, {elapsed:.0f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", nargs="?", help="Carte PNG à créer")
+    parser.add_argument("--size", type=int, default=1024, help="Côté de la carte")
+    parser.add_argument("--seed", type=int, default=0, help="Graine aléatoire")
+    parser.add_argument(
+        "--density", type=float, default=1.0, help="Multiplicateur de densité d'objets"
+    )
+    parser.add_argument("--corpus", help="Dossier où générer un corpus de cartes")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=CORPUS_SIZES, help="Tailles du corpus"
+    )
+    parser.add_argument(
+        "--seeds", type=int, nargs="+", default=[0], help="Graines du corpus"
+    )
+    args = parser.parse_args()
+
+    if not args.output and not args.corpus:
+        parser.error("indiquer une carte à créer ou --corpus")
+
+    pygame.init()
+    try:
+        if args.corpus:
+            os.makedirs(args.corpus, exist_ok=True)
+            for size in args.sizes:
+                for seed in args.seeds:
+                    write_map(
+                        os.path.join(args.corpus, f"generated_{size}_{seed}.png"),
+                        size,
+                        seed,
+                        args.density,
+                    )
+        else:
+            write_map(args.output, args.size, args.seed, args.density)
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
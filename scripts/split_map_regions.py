@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Découpe une carte PNG en monde streamé (une image par région + world.json).
+
+Usage:
+    python scripts/split_map_regions.py data/maps/large_map.png data/worlds/large_map
+    python scripts/split_map_regions.py carte.png dossier --region-tiles 128
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from game.world.streaming_map import write_streaming_world  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("map_path", help="Carte PNG source")
+    parser.add_argument("world_dir", help="Dossier du monde streamé à créer")
+    parser.add_argument(
+        "--region-tiles", type=int, default=64, help="Taille d'une région en tuiles"
+    )
+    args = parser.parse_args()
+
+    pygame.init()
+    try:
+        write_streaming_world(args.map_path, args.world_dir, args.region_tiles)
+    finally:
+        pygame.quit()
+    print(f"Monde streamé créé dans {args.world_dir}")
+
+
+if __name__ == "__main__":
+    main()
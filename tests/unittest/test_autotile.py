@@ -0,0 +1,120 @@
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.world.autotile import (
+    ALL_SIDES,
+    EAST,
+    NORTH,
+    SOUTH,
+    WEST,
+    AutotileSet,
+    compute_masks,
+    compute_tile_mask,
+)
+from game.world.bitmap_map import BitmapMap
+from game.world.map_scan import HAS_NUMPY
+from game.world.tile_palette import get_tile_id
+
+LOADER_PATHS = [False] + ([True] if HAS_NUMPY else [])
+
+GRASS = get_tile_id((34, 139, 34))
+WATER = get_tile_id((0, 0, 255))
+SPAWN = get_tile_id((255, 0, 0))
+
+
+class TestAutotile:
+    @pytest.fixture
+    def tile_ids(self):
+        # 4x3 grass with a water tile at (1, 1) and a spawn marker at (3, 0)
+        tile_ids = bytearray([GRASS] * 12)
+        tile_ids[1 * 4 + 1] = WATER
+        tile_ids[3] = SPAWN
+        return tile_ids
+
+    @pytest.mark.parametrize("vectorized", LOADER_PATHS)
+    def test_compute_masks(self, tile_ids, vectorized):
+        masks = compute_masks(tile_ids, 4, 3, vectorized)
+
+        assert masks[1 * 4 + 1] == 0  # Water surrounded by grass
+        assert masks[0 * 4 + 1] == ALL_SIDES & ~SOUTH
+        assert masks[1 * 4 + 0] == ALL_SIDES & ~EAST
+        assert masks[1 * 4 + 2] == ALL_SIDES & ~WEST
+        assert masks[2 * 4 + 1] == ALL_SIDES & ~NORTH
+        # Map edges and grass-colored markers connect
+        assert masks[0] == ALL_SIDES
+        assert masks[3] == ALL_SIDES
+
+    def test_paths_agree(self, tile_ids):
+        if not HAS_NUMPY:
+            pytest.skip("numpy is not installed")
+        assert compute_masks(tile_ids, 4, 3, False) == compute_masks(
+            tile_ids, 4, 3, True
+        )
+
+    def test_compute_tile_mask_matches_grid(self, tile_ids):
+        masks = compute_masks(tile_ids, 4, 3, False)
+
+        def get_tile_id(tile_x, tile_y):
+            return tile_ids[tile_y * 4 + tile_x]
+
+        for index in range(12):
+            tile_y, tile_x = divmod(index, 4)
+            assert compute_tile_mask(get_tile_id, tile_x, tile_y, 4, 3) == masks[index]
+
+    def test_variant_borders(self):
+        pygame.init()
+        variant = AutotileSet(8).get_variant(GRASS, ALL_SIDES & ~NORTH)
+        assert variant.get_at((4, 0))[:3] == (25, 104, 25)  # Darker edge
+        assert variant.get_at((4, 7))[:3] == (34, 139, 34)
+        assert AutotileSet(8).get_variant(GRASS, 0) is not variant
+        pygame.quit()
+
+
+class TestAutotileMap:
+    @pytest.fixture
+    def game_map(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((8, 8))
+            surface.fill((34, 139, 34))
+            surface.set_at((4, 4), (0, 0, 255))
+            pygame.image.save(surface, tmp_file.name)
+            game_map = BitmapMap(tmp_file.name, tile_size=8, autotile=True)
+            game_map.terrain_cache.chunk_tiles = 4
+            yield game_map
+
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def test_masks_baked_into_chunks(self, game_map):
+        screen = pygame.Surface((64, 64))
+        game_map.render_terrain(screen, 0, 0)
+
+        # Grass above the water gets an edge along its bottom side
+        assert screen.get_at((4 * 8 + 4, 3 * 8 + 7))[:3] == (25, 104, 25)
+        assert screen.get_at((4 * 8 + 4, 3 * 8 + 4))[:3] == (34, 139, 34)
+        assert screen.get_at((4 * 8 + 4, 4 * 8 + 4))[:3] == (0, 100, 255)
+
+    def test_flat_tiles_by_default(self, game_map):
+        flat_map = BitmapMap(game_map.map_path, tile_size=8)
+        screen = pygame.Surface((64, 64))
+        flat_map.render_terrain(screen, 0, 0)
+
+        assert flat_map.tile_masks is None
+        assert flat_map.get_tile_mask(4, 3) == ALL_SIDES
+        assert screen.get_at((4 * 8 + 4, 3 * 8 + 7))[:3] == (34, 139, 34)
+
+    def test_set_tile_updates_neighbour_masks(self, game_map):
+        game_map.render_terrain(pygame.Surface((64, 64)), 0, 0)
+        game_map.set_tile_at_grid(4, 3, WATER)
+
+        assert game_map.get_tile_mask(4, 3) == SOUTH
+        assert game_map.get_tile_mask(4, 4) == NORTH
+        assert game_map.get_tile_mask(4, 2) == ALL_SIDES & ~SOUTH
+        # Tile (4, 4) is in the chunk below the changed tile
+        assert not game_map.terrain_cache.is_cached(1, 0)
+        assert not game_map.terrain_cache.is_cached(1, 1)
@@ -4,7 +4,9 @@ import tempfile
 import pygame
 import pytest
 
+from game.world import bitmap_map
 from game.world.bitmap_map import BitmapMap
+from game.world.game_object import GameObject
 
 
 class TestBitmapMap:
@@ -91,3 +93,161 @@ class TestBitmapMap:
         width, height = game_map.get_world_size()
         assert width == 5 * 32
         assert height == 5 * 32
+
+    def test_tile_grid_decoded_once(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32)
+
+        assert len(game_map.tile_ids) == 5 * 5
+        assert not hasattr(game_map, "map_surface")
+        assert not hasattr(game_map, "pixel_array")
+        assert game_map.get_tile_id_at_grid(-1, 0) == game_map.get_tile_id_at_grid(0, 9)
+
+    def test_is_rect_walkable(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32)
+
+        assert game_map.is_rect_walkable(34, 34, 28, 28)  # Inside spawn tile (1, 1)
+        assert not game_map.is_rect_walkable(34, 34, 40, 40)  # Reaches water (2, 2)
+        assert not game_map.is_rect_walkable(2, 2, 28, 28)  # Wall at (0, 0)
+        assert game_map.is_rect_walkable(2, 34, 28, 28)  # Grass at (0, 1)
+        assert not game_map.is_rect_walkable(-4, 40, 8, 8)  # Out of bounds
+        assert not game_map.is_rect_walkable(140, 140, 40, 40)
+
+    def test_is_rect_walkable_catches_thin_walls(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32)
+
+        # Corners of a 96px-wide rectangle over row 2 all land on grass, the
+        # water tile sits between them
+        assert game_map.is_walkable(34, 66)
+        assert game_map.is_walkable(126, 66)
+        assert not game_map.is_rect_walkable(34, 66, 92, 20)
+
+    def test_is_rect_walkable_after_tile_change(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32)
+
+        game_map.set_tile_at_grid(2, 2, game_map.get_tile_id_at_grid(3, 3))  # Grass
+        assert game_map.is_rect_walkable(34, 34, 60, 60)
+
+        game_map.set_tile_at_grid(2, 1, game_map.get_tile_id_at_grid(0, 0))  # Wall
+        assert not game_map.is_rect_walkable(34, 34, 60, 60)
+
+    def test_add_and_remove_obstacle(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32)
+        changes = []
+        game_map.collision_listeners.append(
+            lambda x, y, blocked: changes.append((x, y, blocked))
+        )
+        barrel = GameObject("barrel", 3 * 32, 1 * 32, 32, 64)
+
+        assert game_map.add_obstacle(barrel)
+        assert barrel in game_map.get_objects_at_point(3 * 32 + 5, 2 * 32 + 5)
+        assert not game_map.is_walkable(3 * 32 + 5, 1 * 32 + 5)
+        assert not game_map.is_rect_walkable(3 * 32 + 2, 2 * 32 + 2, 28, 28)
+        assert game_map.clearance_map.get_clearance(3, 2) == 0
+        assert changes == [(3, 1, True), (3, 2, True)]
+
+        assert game_map.remove_obstacle(barrel)
+        assert not game_map.remove_obstacle(barrel)
+        assert barrel not in game_map.objects
+        assert game_map.is_rect_walkable(3 * 32 + 2, 1 * 32 + 2, 28, 60)
+        assert game_map.clearance_map.get_clearance(3, 2) == 2
+        assert changes[2:] == [(3, 1, False), (3, 2, False)]
+
+    def test_obstacle_over_blocked_terrain(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32)
+        crate = GameObject("crate", 2 * 32, 2 * 32, 32, 32)
+
+        game_map.add_obstacle(crate)
+        game_map.remove_obstacle(crate)
+        # The water tile under the crate stays blocked
+        assert not game_map.is_walkable(2 * 32 + 5, 2 * 32 + 5)
+
+    def test_overlapping_obstacles(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32)
+        first = GameObject("block", 3 * 32, 3 * 32, 32, 32)
+        second = GameObject("block", 3 * 32, 3 * 32, 32, 32)
+
+        game_map.add_obstacle(first)
+        game_map.add_obstacle(second)
+        game_map.remove_obstacle(first)
+        assert not game_map.is_walkable(3 * 32 + 5, 3 * 32 + 5)
+        game_map.remove_obstacle(second)
+        assert game_map.is_walkable(3 * 32 + 5, 3 * 32 + 5)
+
+    def test_toggle_door(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32)
+        door = GameObject("door", 3 * 32, 0, 32, 32)
+        game_map.add_obstacle(door)
+
+        game_map.set_obstacle_blocking(door, False)
+        assert door.walkable
+        assert game_map.is_walkable(3 * 32 + 5, 5)
+        game_map.set_obstacle_blocking(door, False)  # Already open
+        assert game_map.is_walkable(3 * 32 + 5, 5)
+
+        game_map.set_obstacle_blocking(door, True)
+        assert not game_map.is_walkable(3 * 32 + 5, 5)
+        assert door in game_map.objects
+
+    def _edit_map(self, map_path, edits):
+        surface = pygame.image.load(map_path)
+        for position, color in edits:
+            surface.set_at(position, color)
+        pygame.image.save(surface, map_path)
+        # Make the edit visible even within the file system's mtime resolution
+        mtime = os.path.getmtime(map_path) + 1
+        os.utime(map_path, (mtime, mtime))
+
+    def test_reload_only_when_watching(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32)
+        self._edit_map(sample_map_file, [((3, 3), (165, 42, 42))])
+        assert not game_map.reload_if_changed()
+        assert game_map.is_walkable(3 * 32, 3 * 32)
+
+    def test_reload_changed_tiles(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32, watch=True)
+        assert not game_map.reload_if_changed()
+
+        self._edit_map(
+            sample_map_file, [((3, 3), (165, 42, 42)), ((0, 0), (34, 139, 34))]
+        )
+        assert game_map.reload_if_changed()
+        assert game_map.get_tile_at_grid(3, 3).name == "wall"
+        assert not game_map.is_walkable(3 * 32, 3 * 32)
+        assert game_map.is_walkable(0, 0)
+        assert not game_map.is_rect_walkable(80, 80, 40, 40)
+        assert not game_map.reload_if_changed()
+
+    def test_reload_objects(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32, watch=True)
+        object_count = len(game_map.objects)
+
+        self._edit_map(sample_map_file, [((3, 1), (50, 150, 50))])
+        assert game_map.reload_if_changed()
+        assert len(game_map.objects) == object_count + 1
+        assert game_map.get_objects_in_area(3 * 32, 32, 32, 32)
+        assert not game_map.is_walkable(3 * 32, 32)
+
+        self._edit_map(sample_map_file, [((3, 1), (34, 139, 34))])
+        assert game_map.reload_if_changed()
+        assert len(game_map.objects) == object_count
+        assert not game_map.get_objects_in_area(3 * 32, 32, 32, 32)
+        assert game_map.is_walkable(3 * 32, 32)
+
+    def test_reload_skips_unchanged_rows(self, sample_map_file, monkeypatch):
+        game_map = BitmapMap(sample_map_file, tile_size=32, watch=True)
+        self._edit_map(sample_map_file, [((3, 3), (165, 42, 42))])
+
+        decoded_rows = []
+        original_decode = bitmap_map.decode_rgb
+        monkeypatch.setattr(
+            bitmap_map,
+            "decode_rgb",
+            lambda rgb: decoded_rows.append(rgb) or original_decode(rgb),
+        )
+        assert game_map.reload_if_changed()
+        assert len(decoded_rows) == 1
+
+    def test_reload_keeps_size(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=32, watch=True)
+        assert not game_map.apply_map_surface(pygame.Surface((6, 5)))
+        assert game_map.width == 5
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from game.world.blocked_area_table import BlockedAreaTable
+from game.world.map_scan import HAS_NUMPY
+
+LOADER_PATHS = [
+    False,
+    pytest.param(
+        True, marks=pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed")
+    ),
+]
+
+
+def brute_force_count(grid, width, start_x, start_y, end_x, end_y):
+    return sum(
+        grid[tile_y * width + tile_x] != 0
+        for tile_y in range(start_y, end_y + 1)
+        for tile_x in range(start_x, end_x + 1)
+    )
+
+
+class TestBlockedAreaTable:
+    @pytest.fixture
+    def grid(self):
+        rng = random.Random(42)
+        return bytearray(rng.random() < 0.3 for _ in range(9 * 7))
+
+    @pytest.mark.parametrize("vectorized", LOADER_PATHS)
+    def test_counts_match_brute_force(self, grid, vectorized):
+        table = BlockedAreaTable(grid, 9, 7, vectorized)
+
+        for start_y in range(7):
+            for end_y in range(start_y, 7):
+                for start_x in range(9):
+                    for end_x in range(start_x, 9):
+                        assert table.count_blocked(
+                            start_x, start_y, end_x, end_y
+                        ) == brute_force_count(grid, 9, start_x, start_y, end_x, end_y)
+
+    @pytest.mark.parametrize("vectorized", LOADER_PATHS)
+    def test_incremental_update(self, grid, vectorized):
+        table = BlockedAreaTable(grid, 9, 7, vectorized)
+
+        for tile_x, tile_y in [(0, 0), (4, 3), (8, 6)]:
+            index = tile_y * 9 + tile_x
+            delta = -1 if grid[index] else 1
+            grid[index] = not grid[index]
+            table.update_tile(tile_x, tile_y, delta)
+
+        assert table.count_blocked(0, 0, 8, 6) == sum(grid)
+        assert table.count_blocked(2, 1, 6, 5) == brute_force_count(grid, 9, 2, 1, 6, 5)
+        assert table.count_blocked(4, 3, 4, 3) == grid[3 * 9 + 4]
+
+    @pytest.mark.parametrize("vectorized", LOADER_PATHS)
+    def test_counts_across_blocks(self, vectorized):
+        rng = random.Random(5)
+        width, height = 23, 17
+        grid = bytearray(rng.random() < 0.3 for _ in range(width * height))
+        table = BlockedAreaTable(grid, width, height, vectorized, block_size=4)
+
+        for _ in range(200):
+            tile_x, tile_y = rng.randrange(width), rng.randrange(height)
+            index = tile_y * width + tile_x
+            delta = -1 if grid[index] else 1
+            grid[index] = not grid[index]
+            table.update_tile(tile_x, tile_y, delta)
+
+            start_x, end_x = sorted((rng.randrange(width), rng.randrange(width)))
+            start_y, end_y = sorted((rng.randrange(height), rng.randrange(height)))
+            assert table.count_blocked(
+                start_x, start_y, end_x, end_y
+            ) == brute_force_count(grid, width, start_x, start_y, end_x, end_y)
+        assert table.count_blocked(0, 0, width - 1, height - 1) == sum(grid)
@@ -278,6 +278,23 @@ class TestChestManager:
         found_chest = self.chest_manager.find_interactable_chest(115, 115)
         assert found_chest is None
 
+    def test_prompt_follows_zone_events(self):
+        """Test que le coffre proposé suit les événements entrée/sortie des zones."""
+        chest = self.chest_manager.create_chest(110, 110, "basic_chest")
+        assert self.chest_manager.get_interactable_chest() is None
+        
+        self.chest_manager.update_player_position(115, 115)
+        assert self.chest_manager.nearby_zones[0].owner == chest
+        assert self.chest_manager.get_interactable_chest() == chest
+        
+        # Plus d'interrogation des zones actives à chaque frame
+        self.chest_manager.trigger_zones.get_active_zones = None
+        assert self.chest_manager.get_interactable_chest() == chest
+        
+        self.chest_manager.update_player_position(300, 300)
+        assert self.chest_manager.nearby_zones == []
+        assert self.chest_manager.get_interactable_chest() is None
+
     def test_get_stats(self):
         """Test des statistiques de coffres."""
         # Pas de coffres
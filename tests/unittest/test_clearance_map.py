@@ -0,0 +1,135 @@
+import os
+import random
+import tempfile
+
+import pygame
+import pytest
+
+from game.world.bitmap_map import BitmapMap
+from game.world.clearance_map import MAX_CLEARANCE, ClearanceMap
+from game.world.map_scan import HAS_NUMPY
+from game.world.tile_palette import TILE_IDS
+
+LOADER_PATHS = [
+    False,
+    pytest.param(
+        True, marks=pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed")
+    ),
+]
+
+
+def brute_force_clearance(grid, width, height, tile_x, tile_y):
+    size = 0
+    while tile_x + size < width and tile_y + size < height:
+        square = [
+            grid[y * width + x]
+            for y in range(tile_y, tile_y + size + 1)
+            for x in range(tile_x, tile_x + size + 1)
+        ]
+        if any(square):
+            break
+        size += 1
+    return size
+
+
+class TestClearanceMap:
+    @pytest.fixture
+    def grid(self):
+        rng = random.Random(7)
+        return bytearray(rng.random() < 0.15 for _ in range(13 * 9))
+
+    @pytest.mark.parametrize("vectorized", LOADER_PATHS)
+    def test_matches_brute_force(self, grid, vectorized):
+        clearance_map = ClearanceMap(grid, 13, 9, vectorized)
+        for tile_y in range(9):
+            for tile_x in range(13):
+                assert clearance_map.get_clearance(
+                    tile_x, tile_y
+                ) == brute_force_clearance(grid, 13, 9, tile_x, tile_y)
+
+    @pytest.mark.parametrize("vectorized", LOADER_PATHS)
+    def test_open_map(self, vectorized):
+        clearance_map = ClearanceMap(bytearray(6 * 4), 6, 4, vectorized)
+        assert clearance_map.get_clearance(0, 0) == 4
+        assert clearance_map.get_clearance(3, 0) == 3
+        assert clearance_map.get_clearance(5, 3) == 1
+
+    def test_out_of_bounds(self, grid):
+        clearance_map = ClearanceMap(grid, 13, 9, vectorized=False)
+        assert clearance_map.get_clearance(-1, 0) == 0
+        assert clearance_map.get_clearance(13, 0) == 0
+        assert clearance_map.get_clearance(0, 9) == 0
+
+    @pytest.mark.parametrize("vectorized", LOADER_PATHS)
+    def test_update_tile_matches_rebuild(self, grid, vectorized):
+        clearance_map = ClearanceMap(grid, 13, 9, vectorized)
+        rng = random.Random(3)
+        for _ in range(40):
+            tile_x, tile_y = rng.randrange(13), rng.randrange(9)
+            grid[tile_y * 13 + tile_x] ^= 1
+            clearance_map.update_tile(tile_x, tile_y)
+            assert clearance_map.clearance == ClearanceMap(grid, 13, 9, False).clearance
+
+    def test_update_bounded_by_max_clearance(self):
+        size = MAX_CLEARANCE * 3
+        grid = bytearray(size * size)
+        clearance_map = ClearanceMap(grid, size, size, vectorized=False)
+        assert clearance_map.get_clearance(0, 0) == MAX_CLEARANCE
+
+        grid[(size - 5) * size + size - 5] = 1
+        before = bytes(clearance_map.clearance)
+        clearance_map.update_tile(size - 5, size - 5)
+        changed = [
+            divmod(index, size)
+            for index in range(size * size)
+            if before[index] != clearance_map.clearance[index]
+        ]
+        assert changed
+        assert all(size - 5 - y <= MAX_CLEARANCE for y, _ in changed)
+        assert all(size - 5 - x <= MAX_CLEARANCE for _, x in changed)
+        assert (
+            clearance_map.clearance == ClearanceMap(grid, size, size, False).clearance
+        )
+
+
+class TestFindClearPosition:
+    @pytest.fixture
+    def walled_map(self):
+        """8x8 grass map with walls leaving a 2x2 gap at tiles (5, 1)-(6, 2)."""
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((8, 8))
+            surface.fill((34, 139, 34))
+            surface.fill((165, 42, 42), (0, 3, 8, 1))
+            surface.fill((165, 42, 42), (2, 0, 1, 3))
+            surface.set_at((1, 1), (255, 0, 0))
+            pygame.image.save(surface, tmp_file.name)
+            yield BitmapMap(tmp_file.name, tile_size=32, use_compiled=False)
+
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def test_fits_in_place(self, walled_map):
+        assert walled_map.find_clear_position(5 * 32, 1 * 32, 64, 64) == (160, 32)
+
+    def test_large_entity_moves_to_free_area(self, walled_map):
+        # 3x3 tiles do not fit left of the wall column, the nearest spot is right of it
+        assert walled_map.find_clear_position(32, 32, 96, 96) == (96, 0)
+        assert walled_map.is_player_spawn_safe(96, 0, 96, 96)
+
+    def test_matches_rect_check(self, walled_map):
+        for y in range(0, 8 * 32, 8):
+            for x in range(0, 8 * 32, 8):
+                for size in (32, 64):
+                    assert walled_map.can_entity_fit(
+                        x, y, size, size
+                    ) == walled_map.is_player_spawn_safe(x, y, size, size)
+
+    def test_nothing_fits(self, walled_map):
+        assert walled_map.find_clear_position(32, 32, 320, 320) is None
+
+    def test_follows_tile_changes(self, walled_map):
+        assert walled_map.can_entity_fit(5 * 32, 1 * 32, 64, 64)
+        walled_map.set_tile_at_grid(6, 2, TILE_IDS[(165, 42, 42)])
+        assert not walled_map.can_entity_fit(5 * 32, 1 * 32, 64, 64)
@@ -0,0 +1,119 @@
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.world.bitmap_map import BitmapMap
+from game.world.compiled_map import (
+    CompiledMap,
+    compiled_path_for,
+    find_compiled_map,
+    write_compiled_map,
+)
+from game.world.layered_map import split_layers, write_layered_map
+from game.world.tile_palette import get_tile_id
+
+
+class TestCompiledMap:
+    @pytest.fixture
+    def map_file(self):
+        pygame.init()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            map_path = os.path.join(tmp_dir, "map.png")
+            surface = pygame.Surface((8, 6))
+            surface.fill((34, 139, 34))
+            surface.set_at((0, 0), (165, 42, 42))  # Wall
+            surface.set_at((2, 3), (255, 0, 0))  # Spawn
+            surface.set_at((5, 1), (100, 50, 0))  # Well (blocking object)
+            surface.set_at((6, 4), (200, 200, 0))  # Chest marker (walkable object)
+            pygame.image.save(surface, map_path)
+            yield map_path
+
+        pygame.quit()
+
+    @pytest.fixture
+    def compiled_file(self, map_file):
+        compiled_path = compiled_path_for(map_file)
+        write_compiled_map(BitmapMap(map_file, use_compiled=False), compiled_path)
+        return compiled_path
+
+    def test_compiled_path_for(self):
+        assert (
+            compiled_path_for("data/maps/large_map.png") == "data/maps/large_map.cmap"
+        )
+
+    def test_find_compiled_map(self, map_file, compiled_file):
+        assert find_compiled_map(map_file) == compiled_file
+        assert find_compiled_map(compiled_file) == compiled_file
+
+    def test_missing_compiled_map(self, map_file):
+        assert find_compiled_map(map_file) is None
+
+    def test_stale_compiled_map_ignored(self, map_file, compiled_file):
+        compiled_mtime = os.path.getmtime(compiled_file)
+        os.utime(map_file, (compiled_mtime + 10, compiled_mtime + 10))
+
+        assert find_compiled_map(map_file) is None
+
+    def test_compiled_map_contents(self, compiled_file):
+        compiled = CompiledMap(compiled_file)
+
+        assert (compiled.width, compiled.height) == (8, 6)
+        assert compiled.spawn_tile == (2, 3)
+        assert compiled.tile_ids[0] == get_tile_id((165, 42, 42))
+        assert compiled.collision_grid[0] == 1
+        assert compiled.collision_grid[1 * 8 + 5] == 1  # Well
+        assert compiled.collision_grid[4 * 8 + 6] == 0  # Chest marker
+        assert [(index, obj.name) for index, obj in compiled.object_markers] == [
+            (1 * 8 + 5, "well"),
+            (4 * 8 + 6, "chest"),
+        ]
+
+    def test_bitmap_map_loads_compiled_file(self, map_file, compiled_file):
+        png_map = BitmapMap(map_file, use_compiled=False)
+        compiled_map = BitmapMap(map_file)
+
+        assert isinstance(compiled_map.tile_ids, memoryview)
+        assert bytes(compiled_map.tile_ids) == bytes(png_map.tile_ids)
+        assert compiled_map.spawn_point == png_map.spawn_point
+        assert [(o.name, o.x, o.y) for o in compiled_map.objects] == [
+            (o.name, o.x, o.y) for o in png_map.objects
+        ]
+        assert not compiled_map.is_walkable(5 * 32 + 4, 1 * 32 + 4)
+        assert compiled_map.is_walkable(2 * 32 + 4, 3 * 32 + 4)
+
+    def test_compiled_from_layered_map(self, map_file):
+        png_map = BitmapMap(map_file, use_compiled=False)
+        layered_path = os.path.splitext(map_file)[0] + ".lmap"
+        write_layered_map(
+            layered_path,
+            png_map.width,
+            png_map.height,
+            split_layers(png_map.tile_ids, png_map.collision_grid),
+        )
+        compiled_path = compiled_path_for(map_file)
+        # Terrain under the objects of a layered map is ground, not markers
+        write_compiled_map(BitmapMap(layered_path), compiled_path)
+
+        compiled_map = BitmapMap(map_file)
+        assert isinstance(compiled_map.tile_ids, memoryview)
+        assert [(o.name, o.x, o.y) for o in compiled_map.objects] == [
+            (o.name, o.x, o.y) for o in png_map.objects
+        ]
+
+    def test_runtime_edits_do_not_touch_file(self, map_file, compiled_file):
+        game_map = BitmapMap(map_file)
+        game_map.set_tile_at_grid(1, 1, get_tile_id((0, 0, 255)))
+
+        assert not game_map.is_walkable(1 * 32 + 4, 1 * 32 + 4)
+        assert BitmapMap(map_file).get_tile_at_grid(1, 1).name == "grass"
+
+    def test_corrupt_compiled_file_falls_back_to_png(self, map_file, compiled_file):
+        with open(compiled_file, "wb") as corrupt_file:
+            corrupt_file.write(b"not a map")
+
+        game_map = BitmapMap(map_file)
+        assert isinstance(game_map.tile_ids, bytearray)
+        assert game_map.get_tile_at_grid(0, 0).name == "wall"
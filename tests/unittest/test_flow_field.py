@@ -0,0 +1,147 @@
+import math
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.entities.enemy import Goblin, Ogre
+from game.entities.player import Player
+from game.world.bitmap_map import BitmapMap
+from game.world.tile_palette import get_tile_id
+
+GRASS = (34, 139, 34)
+WALL = (165, 42, 42)
+
+
+class TestFlowField:
+    @pytest.fixture
+    def game_map(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((60, 40))
+            surface.fill(GRASS)
+            # Wall with a gap at the bottom
+            for tile_y in range(0, 30):
+                surface.set_at((30, tile_y), WALL)
+            pygame.image.save(surface, tmp_file.name)
+
+        game_map = BitmapMap(tmp_file.name, tile_size=32)
+        yield game_map
+
+        game_map.close()
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def test_recomputed_only_on_tile_change(self, game_map):
+        flow_field = game_map.flow_field
+        assert flow_field.update(20 * 32 + 5, 10 * 32 + 5)
+        assert flow_field.goal == (20, 10)
+        assert not flow_field.update(20 * 32 + 30, 10 * 32 + 20)
+        assert flow_field.update(21 * 32, 10 * 32)
+
+    def test_integrated_on_demand(self, game_map):
+        flow_field = game_map.flow_field
+        flow_field.update(20 * 32, 10 * 32)
+        # Nobody asked yet, so nothing was integrated
+        assert not any(flow_field._settled)
+
+        assert flow_field.get_cost((22, 10)) == 2
+        settled = sum(flow_field._settled)
+        assert settled < 50
+        # Nearer tiles are already settled
+        assert flow_field.get_cost((21, 10)) == 1
+        assert sum(flow_field._settled) == settled
+
+    def test_collisions_reused_as_goal_moves(self, game_map, monkeypatch):
+        flow_field = game_map.flow_field
+        flow_field.update(20 * 32, 10 * 32)
+        flow_field.get_cost((25, 10))
+
+        read = []
+        is_tile_blocked = game_map.is_tile_blocked
+
+        def count_reads(tile_x, tile_y):
+            read.append((tile_x, tile_y))
+            return is_tile_blocked(tile_x, tile_y)
+
+        monkeypatch.setattr(game_map, "is_tile_blocked", count_reads)
+        flow_field.update(21 * 32, 10 * 32)
+        assert flow_field.get_cost((25, 10)) == 4
+        assert read == []
+
+    def test_costs(self, game_map):
+        flow_field = game_map.flow_field
+        flow_field.update(20 * 32, 10 * 32)
+
+        assert flow_field.get_cost((20, 10)) == 0
+        assert flow_field.get_cost((23, 10)) == 3
+        assert flow_field.get_cost((22, 12)) == pytest.approx(2 * math.sqrt(2))
+        assert flow_field.get_cost((30, 10)) == math.inf
+        # Around the wall through the gap
+        assert flow_field.get_cost((32, 10)) > 20
+        # Outside the radius
+        assert flow_field.get_cost((20 + flow_field.radius + 1, 10)) == math.inf
+
+    def test_next_tiles_lead_to_goal(self, game_map):
+        flow_field = game_map.flow_field
+        flow_field.update(25 * 32, 10 * 32)
+
+        tile = (35, 10)
+        for _ in range(100):
+            next_tile = flow_field.get_next_tile(tile)
+            if next_tile is None:
+                break
+            assert flow_field.get_cost(next_tile) < flow_field.get_cost(tile)
+            assert not game_map.is_tile_blocked(*next_tile)
+            tile = next_tile
+        assert tile == (25, 10)
+        assert flow_field.get_next_tile((30, 5)) is None
+
+    def test_collision_change_in_window(self, game_map):
+        flow_field = game_map.flow_field
+        flow_field.update(25 * 32, 10 * 32)
+        assert flow_field.get_cost((35, 10)) < math.inf
+
+        for tile_y in range(30, 40):
+            game_map.set_tile_at_grid(30, tile_y, get_tile_id(WALL))
+        assert flow_field.get_cost((35, 10)) == math.inf
+        assert not flow_field.update(25 * 32, 10 * 32)
+
+    def test_goblins_follow_field(self, game_map, monkeypatch):
+        player = Player(25 * 32, 10 * 32)
+        goblin = Goblin(35 * 32, 10 * 32)
+        goblin.target = player
+        game_map.flow_field.update(
+            player.x + player.width / 2, player.y + player.height / 2
+        )
+        monkeypatch.setattr(
+            game_map.pathfinder, "find_path", lambda *args: pytest.fail()
+        )
+
+        for _ in range(600):
+            goblin.move_towards_target(0.05, game_map)
+            goblin.x += goblin.velocity_x * 0.05
+            goblin.y += goblin.velocity_y * 0.05
+            if goblin.distance_to_target() <= goblin.attack_range:
+                break
+
+        assert goblin.distance_to_target() <= goblin.attack_range
+
+    def test_larger_enemies_use_paths(self, game_map):
+        player = Player(25 * 32, 10 * 32)
+        ogre = Ogre(35 * 32, 10 * 32)
+        ogre.target = player
+        game_map.flow_field.update(
+            player.x + player.width / 2, player.y + player.height / 2
+        )
+
+        # Straight at the player until the background search is applied
+        assert ogre.get_next_waypoint(game_map) is None
+        assert ogre.flow_step is None
+        request = ogre.path_request
+        game_map.path_queue.drain()
+        assert request.done
+        assert ogre.get_next_waypoint(game_map)
+        assert ogre.path
@@ -0,0 +1,193 @@
+import os
+import tempfile
+import time
+
+import pygame
+import pytest
+
+from game.ui.minimap import Minimap
+from game.world.bitmap_map import BitmapMap
+from game.world.fog_of_war import ExploredTiles, FogOfWar, circle_offsets
+from game.world.spatial_index import SpatialGrid
+from game.world.streaming_map import StreamingMap, write_streaming_world
+from game.world.tile_palette import VOID_TILE_ID
+
+
+class TestExploredTiles:
+    def test_one_bit_per_tile(self):
+        explored = ExploredTiles(10, 10)
+        assert len(explored.bits) == 13
+
+        assert explored.explore(9, 0)
+        assert not explored.explore(9, 0)
+        assert explored.is_explored(9, 0)
+        assert not explored.is_explored(0, 1)
+        assert not explored.is_explored(-1, 0)
+        assert explored.bits[1] == 0b10
+        assert explored.count() == 1
+
+    def test_iter_explored(self):
+        explored = ExploredTiles(10, 10)
+        for tile in [(3, 7), (0, 0), (9, 9)]:
+            explored.explore(*tile)
+        assert list(explored.iter_explored()) == [(0, 0), (3, 7), (9, 9)]
+
+    def test_bytes_round_trip(self):
+        explored = ExploredTiles(300, 200)
+        for tile_x in range(50, 80):
+            explored.explore(tile_x, 120)
+
+        data = explored.to_bytes()
+        assert len(data) < len(explored.bits) // 10
+
+        loaded = ExploredTiles.from_bytes(data)
+        assert (loaded.width, loaded.height) == (300, 200)
+        assert loaded.bits == explored.bits
+
+    def test_corrupt_bytes(self):
+        data = ExploredTiles(16, 16).to_bytes()
+        with pytest.raises(ValueError):
+            ExploredTiles.from_bytes(data[:8] + b"garbage")
+        with pytest.raises(ValueError):
+            ExploredTiles.from_bytes(ExploredTiles(8, 8).to_bytes()[:8] + data[8:])
+
+
+class TestFogOfWar:
+    @pytest.fixture(autouse=True)
+    def pygame_session(self):
+        pygame.init()
+        yield
+        pygame.quit()
+
+    @pytest.fixture
+    def fog(self):
+        return FogOfWar(64, 64, tile_size=32, reveal_radius=3, chunk_tiles=16)
+
+    def test_reveals_only_on_tile_change(self, fog):
+        revealed = fog.update(10 * 32 + 5, 10 * 32 + 5)
+        assert len(revealed) == len(circle_offsets(3))
+        assert fog.explored.is_explored(13, 10)
+        assert not fog.explored.is_explored(13, 13)
+
+        assert fog.update(10 * 32 + 30, 10 * 32 + 1) == []
+        assert len(fog.update(11 * 32, 10 * 32)) == 7  # One new column
+
+    def test_reveal_clipped_to_map(self, fog):
+        assert len(fog.reveal(0, 0)) == 11
+        assert fog.explored.count() == 11
+
+    def test_only_changed_chunks_rerendered(self, fog):
+        for chunk in [(0, 0), (1, 0), (2, 2)]:
+            fog.get_chunk(*chunk)
+
+        fog.reveal(20, 5)
+        assert fog.is_cached(0, 0)
+        assert not fog.is_cached(1, 0)
+        assert fog.is_cached(2, 2)
+
+        chunk = fog.get_chunk(1, 0)
+        assert chunk.get_at((4 * 32 + 5, 5 * 32 + 5)).a == 0
+        assert chunk.get_at((0, 0)) == (0, 0, 0, 255)
+
+    def test_explored_chunk_not_drawn(self, fog):
+        for tile_y in range(16):
+            for tile_x in range(16):
+                fog.explored.explore(tile_x, tile_y)
+        assert fog.get_chunk(0, 0) is None
+
+        screen = pygame.Surface((640, 480))
+        screen.fill((255, 255, 255))
+        fog.render(screen, 0, 0)
+        assert screen.get_at((100, 100))[:3] == (255, 255, 255)
+        assert screen.get_at((600, 100))[:3] == (0, 0, 0)
+
+    def test_reveal_listeners(self, fog):
+        revealed = []
+        fog.reveal_listeners.append(revealed.extend)
+        fog.reveal(30, 30)
+        fog.reveal(30, 30)
+        assert len(revealed) == len(circle_offsets(3))
+
+
+class TestMinimapFog:
+    @pytest.fixture
+    def game_map(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((40, 30))
+            surface.fill((34, 139, 34))
+            surface.set_at((2, 2), (0, 0, 255))  # Water
+            pygame.image.save(surface, tmp_file.name)
+
+        yield BitmapMap(tmp_file.name, tile_size=32)
+
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def test_minimap_draws_explored_tiles(self, game_map):
+        fog = FogOfWar(game_map.width, game_map.height, reveal_radius=2)
+        fog.reveal(20, 20)
+        minimap = Minimap(game_map, fog=fog)
+        void = minimap.surface.get_palette_at(VOID_TILE_ID)
+
+        assert minimap.surface.get_at((20, 21))[:3] == (34, 139, 34)
+        assert minimap.surface.get_at((2, 2)) == void
+
+        fog.reveal(2, 3)
+        assert minimap.surface.get_at((2, 2))[:3] == (0, 100, 255)
+
+        minimap.close()
+        fog.reveal(30, 5)
+        assert minimap.surface.get_at((30, 5)) == void
+
+    def test_minimap_hides_markers_on_unexplored_tiles(self, game_map):
+        fog = FogOfWar(game_map.width, game_map.height, reveal_radius=2)
+        fog.reveal(20, 15)
+        minimap = Minimap(game_map, view_tiles=16, scale=2, fog=fog)
+
+        class Marker:
+            width = height = 32
+
+            def __init__(self, tile_x, tile_y):
+                self.x, self.y = tile_x * 32, tile_y * 32
+
+        enemies = SpatialGrid(cell_size=64)
+        for marker in (Marker(22, 15), Marker(14, 10)):
+            enemies.insert(marker, marker.x, marker.y, 32, 32)
+
+        screen = pygame.Surface((200, 100))
+        minimap.render(screen, 20 * 32, 15 * 32, [(enemies.query_rect, (220, 40, 40))])
+
+        screen_x = 200 - 16 * 2 - minimap.margin
+        # View starts at tile (12, 7): (22, 15) is explored, (14, 10) is not
+        assert screen.get_at((screen_x + 10 * 2, 10 + 8 * 2))[:3] == (220, 40, 40)
+        assert screen.get_at((screen_x + 2 * 2, 10 + 3 * 2))[:3] != (220, 40, 40)
+
+    def test_minimap_draws_explored_tiles_of_streamed_regions(self, game_map, tmp_path):
+        world_dir = str(tmp_path / "world")
+        write_streaming_world(game_map.map_path, world_dir, region_tiles=8)
+        streaming_map = StreamingMap(world_dir, tile_size=32, preload_margin=0)
+        try:
+            fog = FogOfWar(streaming_map.width, streaming_map.height, reveal_radius=1)
+            # Explored before region (3, 3) is resident, before and after the
+            # minimap is built
+            fog.reveal(26, 26)
+            minimap = Minimap(streaming_map, fog=fog)
+            fog.reveal(28, 28)
+            void = minimap.surface.get_palette_at(VOID_TILE_ID)
+            assert minimap.surface.get_at((26, 26)) == void
+            assert minimap.surface.get_at((28, 28)) == void
+
+            deadline = time.time() + 5
+            while not streaming_map.is_region_loaded(3, 3):
+                assert time.time() < deadline, "region never finished loading"
+                streaming_map.update_view(26 * 32, 26 * 32, 32, 32)
+                time.sleep(0.01)
+            minimap.update()
+
+            assert minimap.surface.get_at((26, 26))[:3] == (34, 139, 34)
+            assert minimap.surface.get_at((28, 28))[:3] == (34, 139, 34)
+            assert minimap.surface.get_at((30, 24)) == void  # Still unexplored
+        finally:
+            streaming_map.close()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.world.game_object import (
+    GameObject,
+    clear_object_sprite_cache,
+    load_object_sprite,
+)
+
+
+class TestObjectSprites:
+    @pytest.fixture
+    def sprite_file(self):
+        pygame.init()
+        clear_object_sprite_cache()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((16, 16))
+            surface.fill((200, 0, 0))
+            pygame.image.save(surface, tmp_file.name)
+            yield tmp_file.name
+
+        os.unlink(tmp_file.name)
+        clear_object_sprite_cache()
+        pygame.quit()
+
+    def test_sprite_scaled_to_size(self, sprite_file):
+        sprite = load_object_sprite(sprite_file, (32, 64))
+        assert sprite.get_size() == (32, 64)
+        assert sprite.get_at((10, 10))[:3] == (200, 0, 0)
+
+    def test_objects_share_sprite(self, sprite_file):
+        first = GameObject("tree", 0, 0, 32, 32, sprite_file)
+        second = GameObject("tree", 64, 0, 32, 32, sprite_file)
+        assert first.sprite_surface is second.sprite_surface
+
+    def test_different_sizes_not_shared(self, sprite_file):
+        small = GameObject("tree", 0, 0, 32, 32, sprite_file)
+        large = GameObject("tree", 0, 0, 64, 64, sprite_file)
+        assert small.sprite_surface is not large.sprite_surface
+        assert large.sprite_surface.get_size() == (64, 64)
+
+    def test_missing_sprite_falls_back_to_gray(self, sprite_file):
+        game_object = GameObject("tree", 0, 0, 32, 32, "missing/sprite.png")
+        assert game_object.sprite_surface.get_size() == (32, 32)
+        assert game_object.sprite_surface.get_at((0, 0))[:3] == (100, 100, 100)
+
+    def test_clear_cache(self, sprite_file):
+        sprite = load_object_sprite(sprite_file, (32, 32))
+        clear_object_sprite_cache()
+        assert load_object_sprite(sprite_file, (32, 32)) is not sprite
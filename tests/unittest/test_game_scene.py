@@ -179,3 +179,14 @@ class TestGameScene:
                 os.remove(original_map_path)
 
             pygame.quit()
+
+    def test_path_worker_started_on_demand_and_stopped_on_exit(self, sample_map_file):
+        scene = GameScene(sample_map_file)
+        scene.enemies = []
+        scene.update(0.016)
+        assert not scene.game_map.has_path_queue
+
+        worker = scene.game_map.path_queue._worker
+        scene.on_exit()
+        assert not worker.is_alive()
+        assert not scene.game_map.has_path_queue
@@ -0,0 +1,162 @@
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.entities.enemy import Goblin
+from game.entities.player import Player
+from game.world.bitmap_map import BitmapMap
+from game.world.hierarchical_pathfinding import (
+    EAST_BORDER,
+    SOUTH_BORDER,
+    HierarchicalPathfinder,
+)
+from game.world.map_scan import HAS_NUMPY
+from game.world.tile_palette import get_tile_id
+
+requires_numpy = pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed")
+
+GRASS = (34, 139, 34)
+WALL = (165, 42, 42)
+
+
+class TestHierarchicalPathfinder:
+    @pytest.fixture
+    def game_map(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            # 3x3 clusters of 16 tiles, the last row and column cut short
+            surface = pygame.Surface((44, 40))
+            surface.fill(GRASS)
+            # Wall down the middle cluster column, open at the bottom
+            for tile_y in range(0, 36):
+                surface.set_at((24, tile_y), WALL)
+            # Border between clusters (0, 0) and (1, 0) mostly closed
+            for tile_y in range(0, 16):
+                if tile_y not in (3, 4):
+                    surface.set_at((16, tile_y), WALL)
+            pygame.image.save(surface, tmp_file.name)
+
+        yield BitmapMap(tmp_file.name, tile_size=32)
+
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def assert_walkable_path(self, game_map, start, goal, tiles):
+        previous = start
+        for tile in tiles:
+            assert max(abs(tile[0] - previous[0]), abs(tile[1] - previous[1])) == 1
+            assert not game_map.is_tile_blocked(*tile)
+            previous = tile
+        assert previous == goal
+
+    def test_entrances(self, game_map):
+        pathfinder = HierarchicalPathfinder(game_map, vectorized=False)
+        # Short opening, one entrance in its middle
+        assert pathfinder._border_links[(0, 0, EAST_BORDER)] == [((15, 3), (16, 3))]
+        # Long opening, one entrance at each end
+        assert pathfinder._border_links[(0, 0, SOUTH_BORDER)] == [
+            ((0, 15), (0, 16)),
+            ((15, 15), (15, 16)),
+        ]
+        assert (1, 0, EAST_BORDER) in pathfinder._border_links
+        assert pathfinder.get_entrances((0, 0)) == {(15, 3), (0, 15), (15, 15)}
+
+    @requires_numpy
+    def test_vectorized_entrances_match_python(self, game_map):
+        python = HierarchicalPathfinder(game_map, vectorized=False)
+        vectorized = HierarchicalPathfinder(game_map, vectorized=True)
+        assert vectorized._border_links == python._border_links
+
+    def test_path_around_wall(self, game_map):
+        pathfinder = HierarchicalPathfinder(game_map)
+        start, goal = (20, 5), (30, 5)
+        path = pathfinder.find_path(start, goal)
+
+        assert path.nodes[0] == start and path.nodes[-1] == goal
+        tiles = path.tiles()
+        assert path.is_finished
+        self.assert_walkable_path(game_map, start, goal, tiles)
+        assert any(tile_y >= 36 for _, tile_y in tiles)
+
+    def test_same_cluster_path(self, game_map):
+        pathfinder = HierarchicalPathfinder(game_map)
+        path = pathfinder.find_path((2, 2), (10, 12))
+        assert path.nodes == [(2, 2), (10, 12)]
+        self.assert_walkable_path(game_map, (2, 2), (10, 12), path.tiles())
+
+    def test_segments_refined_lazily(self, game_map):
+        pathfinder = HierarchicalPathfinder(game_map)
+        path = pathfinder.find_path((2, 2), (40, 2))
+        assert len(path.nodes) > 3
+
+        first = path.next_segment()
+        assert first[-1] == path.nodes[1]
+        assert not path.is_finished
+
+    def test_unreachable(self, game_map):
+        pathfinder = HierarchicalPathfinder(game_map)
+        assert pathfinder.find_path((20, 5), (24, 5)) is None
+        for tile_y in range(36, 40):
+            game_map.set_tile_at_grid(24, tile_y, get_tile_id(WALL))
+        assert pathfinder.find_path((20, 5), (30, 5)) is None
+
+    def test_obstacle_rebuilds_only_its_cluster(self, game_map, monkeypatch):
+        pathfinder = HierarchicalPathfinder(game_map)
+        pathfinder.precompute_distances()
+        scanned = []
+        scan_border = pathfinder._scan_border
+        monkeypatch.setattr(
+            pathfinder,
+            "_scan_border",
+            lambda border: scanned.append(border) or scan_border(border),
+        )
+
+        # Close the opening between clusters (0, 0) and (1, 0)
+        game_map.set_tile_at_grid(16, 3, get_tile_id(WALL))
+        game_map.set_tile_at_grid(16, 4, get_tile_id(WALL))
+        path = pathfinder.find_path((8, 8), (20, 8))
+
+        assert sorted(scanned) == [
+            (0, 0, EAST_BORDER),
+            (1, 0, EAST_BORDER),
+            (1, 0, SOUTH_BORDER),
+        ]
+        assert (0, 0, EAST_BORDER) not in pathfinder._border_links
+        assert pathfinder.is_cluster_cached((2, 2))
+        tiles = path.tiles()
+        self.assert_walkable_path(game_map, (8, 8), (20, 8), tiles)
+        assert any(tile_y >= 16 for _, tile_y in tiles)
+
+    def test_blocked_segment(self, game_map):
+        pathfinder = HierarchicalPathfinder(game_map)
+        path = pathfinder.find_path((20, 5), (30, 5))
+        # Close the opening under the wall after the path was planned
+        for tile_y in range(36, 40):
+            game_map.set_tile_at_grid(24, tile_y, get_tile_id(WALL))
+        assert path.tiles() == []
+
+    def test_built_with_the_map(self, game_map):
+        pathfinder = game_map.hierarchical_pathfinder
+        assert pathfinder._border_links[(0, 0, EAST_BORDER)] == [((15, 3), (16, 3))]
+        assert not pathfinder.is_long_range((2, 2), (20, 20))
+        assert pathfinder.is_long_range((2, 2), (40, 2))
+
+    def test_enemy_follows_long_range_path(self, game_map):
+        goblin = Goblin(2 * 32, 2 * 32)
+        goblin.target = Player(40 * 32, 2 * 32)
+
+        tiles = []
+        waypoint = goblin.get_next_waypoint(game_map)
+        assert goblin.hierarchical_path is not None
+        while waypoint is not None and len(tiles) < 200:
+            goblin.x, goblin.y = waypoint
+            tiles.append((int(waypoint[0] // 32), int(waypoint[1] // 32)))
+            waypoint = goblin.get_next_waypoint(game_map)
+
+        assert goblin.hierarchical_path.is_finished
+        self.assert_walkable_path(game_map, (2, 2), goblin.path_goal, tiles)
+        # Around the wall through its opening at the bottom
+        assert any(tile_y >= 36 for _, tile_y in tiles)
@@ -0,0 +1,111 @@
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.world.bitmap_map import BitmapMap
+from game.world.layered_map import (
+    GRASS_TILE_ID,
+    TRIGGER_SPAWN,
+    LayeredMap,
+    decode_runs,
+    encode_runs,
+    split_layers,
+    write_layered_map,
+)
+from game.world.map_scan import HAS_NUMPY
+from game.world.tile_palette import get_tile_id
+
+LOADER_PATHS = [False] + ([True] if HAS_NUMPY else [])
+
+
+class TestLayeredMap:
+    @pytest.fixture
+    def map_file(self):
+        pygame.init()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            map_path = os.path.join(tmp_dir, "map.png")
+            surface = pygame.Surface((8, 6))
+            surface.fill((34, 139, 34))
+            surface.set_at((0, 0), (165, 42, 42))  # Wall
+            surface.set_at((2, 3), (255, 0, 0))  # Spawn
+            surface.set_at((5, 1), (100, 50, 0))  # Well (blocking object)
+            surface.set_at((6, 4), (200, 200, 0))  # Chest marker (walkable object)
+            pygame.image.save(surface, map_path)
+            yield map_path
+
+        pygame.quit()
+
+    @pytest.fixture
+    def layered_file(self, map_file):
+        game_map = BitmapMap(map_file, use_compiled=False)
+        layered_path = os.path.splitext(map_file)[0] + ".lmap"
+        write_layered_map(
+            layered_path,
+            game_map.width,
+            game_map.height,
+            split_layers(game_map.tile_ids, game_map.collision_grid),
+        )
+        return layered_path
+
+    @pytest.mark.parametrize("vectorized", LOADER_PATHS)
+    def test_runs_round_trip(self, vectorized):
+        data = bytearray(b"\x01" * 70000 + b"\x02\x03\x03" + b"\x00" * 5)
+        encoded = encode_runs(data, vectorized)
+        assert len(encoded) == 5 * 3  # The 70000 run is split in two records
+        assert decode_runs(encoded, len(data), vectorized) == data
+
+    def test_decode_runs_checks_size(self):
+        with pytest.raises(ValueError):
+            decode_runs(encode_runs(b"\x01" * 10, False), 12, False)
+
+    def test_split_layers(self, map_file):
+        game_map = BitmapMap(map_file, use_compiled=False)
+        layers = split_layers(game_map.tile_ids, game_map.collision_grid)
+
+        index = 1 * 8 + 5  # Well
+        assert layers["terrain"][index] == GRASS_TILE_ID
+        assert layers["decoration"][index] == get_tile_id((100, 50, 0))
+        assert layers["collision"][index] == 1
+        assert layers["decoration"][0] == 0
+        assert layers["terrain"][0] == get_tile_id((165, 42, 42))
+        assert layers["triggers"][3 * 8 + 2] == TRIGGER_SPAWN
+        assert layers["terrain"][3 * 8 + 2] == GRASS_TILE_ID
+
+    @pytest.mark.parametrize("vectorized", LOADER_PATHS)
+    def test_layered_map_contents(self, layered_file, vectorized):
+        layered = LayeredMap(layered_file, vectorized)
+        assert (layered.width, layered.height) == (8, 6)
+        assert len(layered.terrain) == 8 * 6
+        assert layered.triggers.count(TRIGGER_SPAWN) == 1
+        assert layered.collision[0] == 1
+
+    def test_bitmap_map_loads_layered_file(self, map_file, layered_file):
+        image_map = BitmapMap(map_file, use_compiled=False)
+        layered_map = BitmapMap(layered_file)
+
+        assert layered_map.spawn_point == image_map.spawn_point
+        assert layered_map.collision_grid == image_map.collision_grid
+        assert [(obj.name, obj.x, obj.y) for obj in layered_map.objects] == [
+            (obj.name, obj.x, obj.y) for obj in image_map.objects
+        ]
+        # Objects stand on their own terrain instead of a substituted color
+        assert layered_map.get_tile_id_at_grid(5, 1) == GRASS_TILE_ID
+        assert not layered_map.is_walkable(5 * 32, 1 * 32)
+
+    def test_uniform_layers_compress(self, layered_file):
+        # 4 layers of 48 tiles, mostly single runs
+        assert os.path.getsize(layered_file) < 4 * 8 * 6
+
+    def test_corrupt_layered_file(self, layered_file):
+        with open(layered_file, "r+b") as map_file:
+            map_file.truncate(os.path.getsize(layered_file) - 4)
+
+        with pytest.raises(ValueError):
+            LayeredMap(layered_file)
+
+    def test_not_a_layered_file(self, map_file):
+        with pytest.raises(ValueError):
+            LayeredMap(map_file)
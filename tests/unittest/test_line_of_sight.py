@@ -0,0 +1,100 @@
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.entities.enemy import Goblin
+from game.entities.player import Player
+from game.world.bitmap_map import BitmapMap
+from game.world.tile_palette import get_tile_id
+
+GRASS = (34, 139, 34)
+WALL = (165, 42, 42)
+
+
+class TestLineOfSight:
+    @pytest.fixture
+    def game_map(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((20, 20))
+            surface.fill(GRASS)
+            for tile_y in range(5, 15):
+                surface.set_at((10, tile_y), WALL)
+            pygame.image.save(surface, tmp_file.name)
+
+        yield BitmapMap(tmp_file.name, tile_size=32)
+
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def test_wall_blocks_sight(self, game_map):
+        sight = game_map.line_of_sight
+        assert not sight.has_line_of_sight((5, 10), (15, 10))
+        assert not sight.has_line_of_sight((15, 10), (5, 12))
+        assert sight.has_line_of_sight((5, 2), (15, 2))
+        assert sight.has_line_of_sight((8, 10), (8, 18))
+        assert sight.has_line_of_sight((5, 10), (5, 10))
+
+    def test_end_tiles_do_not_block(self, game_map):
+        sight = game_map.line_of_sight
+        assert sight.has_line_of_sight((10, 10), (12, 10))
+        assert sight.has_line_of_sight((8, 10), (10, 10))
+        assert not sight.has_line_of_sight((8, 10), (11, 10))
+
+    def test_can_see_world_points(self, game_map):
+        sight = game_map.line_of_sight
+        assert sight.can_see(5 * 32 + 16, 2 * 32, 15 * 32 + 16, 2 * 32 + 31)
+        assert not sight.can_see(5 * 32, 10 * 32, 15 * 32, 10 * 32)
+
+    def test_results_memoized(self, game_map, monkeypatch):
+        sight = game_map.line_of_sight
+        walks = []
+        original = game_map.is_tile_blocked
+        monkeypatch.setattr(
+            game_map,
+            "is_tile_blocked",
+            lambda x, y: walks.append((x, y)) or original(x, y),
+        )
+
+        sight.has_line_of_sight((5, 2), (15, 2))
+        assert len(walks) == 9
+        assert sight.is_cached((5, 2), (15, 2))
+        sight.has_line_of_sight((5, 2), (15, 2))
+        assert len(walks) == 9
+
+    def test_collision_change_invalidates_crossing_lines(self, game_map):
+        sight = game_map.line_of_sight
+        assert not sight.has_line_of_sight((5, 10), (15, 10))
+        assert sight.has_line_of_sight((5, 2), (15, 2))
+        assert sight.has_line_of_sight((2, 18), (4, 18))
+
+        game_map.set_tile_at_grid(10, 10, get_tile_id(GRASS))
+        assert not sight.is_cached((5, 10), (15, 10))
+        assert sight.is_cached((5, 2), (15, 2))
+        assert sight.is_cached((2, 18), (4, 18))
+        assert sight.has_line_of_sight((5, 10), (15, 10))
+
+        game_map.set_tile_at_grid(12, 2, get_tile_id(WALL))
+        assert not sight.has_line_of_sight((5, 2), (15, 2))
+
+    def test_old_targets_evicted(self, game_map):
+        sight = game_map.line_of_sight
+        for target_x in range(sight.max_targets + 1):
+            sight.has_line_of_sight((0, 0), (target_x, 19))
+
+        assert not sight.is_cached((0, 0), (0, 19))
+        assert sight.is_cached((0, 0), (sight.max_targets, 19))
+
+    def test_enemy_does_not_detect_through_walls(self, game_map):
+        player = Player(11 * 32, 10 * 32)
+        hidden = Goblin(8 * 32, 10 * 32)
+        in_view = Goblin(11 * 32, 12 * 32)
+        for goblin in (hidden, in_view):
+            goblin.target = player
+            goblin.update_ai(0.016, 0.0, game_map)
+
+        assert hidden.ai_state == "idle"
+        assert in_view.ai_state == "chase"
@@ -0,0 +1,63 @@
+import pygame
+import pytest
+
+from game.world.map_generator import (
+    ENEMY_SPAWN,
+    SPAWN,
+    WALL,
+    WATER,
+    generate_map,
+)
+from game.world.map_scan import decode_surface
+from game.world.object_types import OBJECT_TYPES
+from game.world.tile_palette import FIRST_OBJECT_TILE_ID, PALETTE_COLORS, get_tile_id
+
+
+class TestMapGenerator:
+    @pytest.fixture(autouse=True)
+    def pygame_session(self):
+        pygame.init()
+        yield
+        pygame.quit()
+
+    def test_same_seed_same_map(self):
+        first = generate_map(256, 256, seed=7)
+        second = generate_map(256, 256, seed=7)
+        assert pygame.image.tobytes(first, "RGB") == pygame.image.tobytes(second, "RGB")
+
+    def test_different_seeds_differ(self):
+        first = generate_map(256, 256, seed=1)
+        second = generate_map(256, 256, seed=2)
+        assert pygame.image.tobytes(first, "RGB") != pygame.image.tobytes(second, "RGB")
+
+    def test_size_limits(self):
+        with pytest.raises(ValueError):
+            generate_map(128, 256)
+        with pytest.raises(ValueError):
+            generate_map(256, 8193)
+
+    def test_uses_map_vocabulary(self):
+        surface = generate_map(512, 256, seed=3)
+        assert surface.get_size() == (512, 256)
+
+        rgb = pygame.image.tobytes(surface, "RGB")
+        colors = set(zip(rgb[0::3], rgb[1::3], rgb[2::3]))
+        assert colors <= set(PALETTE_COLORS)
+        assert {WALL, WATER, SPAWN, ENEMY_SPAWN} <= colors
+        assert len(colors & set(OBJECT_TYPES)) >= 5
+
+    def test_single_player_spawn_in_the_open(self):
+        surface = generate_map(256, 256, seed=4)
+        tile_ids = decode_surface(surface, False)
+        assert tile_ids.count(get_tile_id(SPAWN)) == 1
+        assert surface.get_at((128, 128))[:3] == SPAWN
+        assert surface.get_at((127, 127))[:3] == (34, 139, 34)
+
+    def test_object_density(self):
+        sparse = decode_surface(generate_map(256, 256, seed=5, object_density=0.2))
+        dense = decode_surface(generate_map(256, 256, seed=5, object_density=1.0))
+
+        def object_count(tile_ids):
+            return sum(tile_id >= FIRST_OBJECT_TILE_ID for tile_id in tile_ids)
+
+        assert object_count(sparse) < object_count(dense)
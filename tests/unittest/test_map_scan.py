@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.world.bitmap_map import BitmapMap
+from game.world.map_scan import (
+    HAS_NUMPY,
+    decode_surface,
+    find_object_markers,
+    use_vectorized,
+)
+from game.world.tile_palette import SPAWN_TILE_ID, get_tile_id
+
+requires_numpy = pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed")
+
+
+class TestMapScan:
+    @pytest.fixture
+    def map_surface(self):
+        pygame.init()
+
+        surface = pygame.Surface((6, 4))
+        surface.fill((34, 139, 34))
+        surface.set_at((0, 0), (165, 42, 42))  # Wall
+        surface.set_at((5, 0), (50, 150, 50))  # Small tree
+        surface.set_at((2, 1), (255, 0, 0))  # Spawn
+        surface.set_at((1, 3), (150, 75, 0))  # House
+        surface.set_at((4, 3), (1, 2, 3))  # Unknown color
+
+        yield surface
+        pygame.quit()
+
+    @pytest.fixture
+    def map_file(self, map_surface):
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            pygame.image.save(map_surface, tmp_file.name)
+            yield tmp_file.name
+
+        os.unlink(tmp_file.name)
+
+    def test_decode_surface_python(self, map_surface):
+        tile_ids = decode_surface(map_surface, vectorized=False)
+
+        assert len(tile_ids) == 6 * 4
+        assert tile_ids[0] == get_tile_id((165, 42, 42))
+        assert tile_ids[1 * 6 + 2] == SPAWN_TILE_ID
+        assert tile_ids[3 * 6 + 4] == get_tile_id((255, 255, 255))
+
+    def test_find_object_markers_python(self, map_surface):
+        tile_ids = decode_surface(map_surface, vectorized=False)
+        markers = find_object_markers(tile_ids, vectorized=False)
+
+        assert [(index, obj.name) for index, obj in markers] == [
+            (5, "small_tree"),
+            (3 * 6 + 1, "house"),
+        ]
+
+    @requires_numpy
+    def test_vectorized_paths_match_python(self, map_surface):
+        python_ids = decode_surface(map_surface, vectorized=False)
+        numpy_ids = decode_surface(map_surface, vectorized=True)
+
+        assert numpy_ids == python_ids
+        assert find_object_markers(numpy_ids, vectorized=True) == find_object_markers(
+            python_ids, vectorized=False
+        )
+
+    @requires_numpy
+    def test_bitmap_map_loads_identically(self, map_file):
+        python_map = BitmapMap(map_file, vectorized=False)
+        numpy_map = BitmapMap(map_file, vectorized=True)
+
+        assert numpy_map.tile_ids == python_map.tile_ids
+        assert numpy_map.spawn_point == python_map.spawn_point
+        assert [(o.name, o.x, o.y) for o in numpy_map.objects] == [
+            (o.name, o.x, o.y) for o in python_map.objects
+        ]
+
+    def test_use_vectorized_defaults_to_numpy_availability(self):
+        assert use_vectorized(None) is HAS_NUMPY
+        assert use_vectorized(False) is False
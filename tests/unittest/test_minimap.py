@@ -0,0 +1,113 @@
+import os
+import tempfile
+import time
+
+import pygame
+import pytest
+
+from game.ui.minimap import Minimap
+from game.world.bitmap_map import BitmapMap
+from game.world.spatial_index import SpatialGrid
+from game.world.streaming_map import StreamingMap, write_streaming_world
+from game.world.tile_palette import get_tile_id
+
+
+class Marker:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.width = 32
+        self.height = 32
+
+
+class TestMinimap:
+    @pytest.fixture
+    def map_file(self):
+        pygame.init()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            map_path = os.path.join(tmp_dir, "map.png")
+            surface = pygame.Surface((40, 30))
+            surface.fill((34, 139, 34))
+            surface.set_at((2, 2), (0, 0, 255))  # Water
+            surface.set_at((5, 5), (150, 75, 0))  # House marker
+            surface.set_at((20, 15), (255, 0, 0))  # Spawn
+            pygame.image.save(surface, map_path)
+            yield map_path
+
+        pygame.quit()
+
+    @pytest.fixture
+    def game_map(self, map_file):
+        return BitmapMap(map_file, tile_size=32)
+
+    def test_surface_built_from_tile_grid(self, game_map):
+        minimap = Minimap(game_map)
+        assert minimap.surface.get_size() == (40, 30)
+        assert minimap.surface.get_bitsize() == 8
+        assert minimap.surface.get_at((2, 2))[:3] == (0, 100, 255)
+        assert minimap.surface.get_at((5, 5))[:3] == (150, 75, 0)
+        assert minimap.surface.get_at((20, 15))[:3] == (34, 139, 34)
+
+    def test_tile_change_updates_pixel(self, game_map):
+        minimap = Minimap(game_map)
+        game_map.set_tile_at_grid(10, 10, get_tile_id((165, 42, 42)))
+        assert minimap.surface.get_at((10, 10))[:3] == (100, 50, 50)
+
+        minimap.close()
+        game_map.set_tile_at_grid(11, 10, get_tile_id((165, 42, 42)))
+        assert minimap.surface.get_at((11, 10))[:3] == (34, 139, 34)
+
+    def test_view_rect_clamped_to_map(self, game_map):
+        minimap = Minimap(game_map, view_tiles=16)
+        assert minimap.get_view_rect(0, 0) == pygame.Rect(0, 0, 16, 16)
+        assert minimap.get_view_rect(20 * 32, 15 * 32) == pygame.Rect(12, 7, 16, 16)
+        assert minimap.get_view_rect(39 * 32, 29 * 32) == pygame.Rect(24, 14, 16, 16)
+
+    def test_render_queries_only_the_view(self, game_map):
+        minimap = Minimap(game_map, view_tiles=16, scale=2)
+        enemies = SpatialGrid(cell_size=64)
+        enemies.insert(Marker(14 * 32, 10 * 32), 14 * 32, 10 * 32, 32, 32)
+
+        queries = []
+
+        def query(x, y, width, height):
+            queries.append((x, y, width, height))
+            return enemies.query_rect(x, y, width, height)
+
+        screen = pygame.Surface((200, 100))
+        minimap.render(screen, 20 * 32, 15 * 32, [(query, (220, 40, 40))])
+
+        assert queries == [(12 * 32, 7 * 32, 16 * 32, 16 * 32)]
+        screen_x = 200 - 16 * 2 - minimap.margin
+        # Enemy marker at tile (14, 10), player marker at tile (20, 15)
+        assert screen.get_at((screen_x + 2 * 2, 10 + 3 * 2))[:3] == (220, 40, 40)
+        assert screen.get_at((screen_x + 8 * 2, 10 + 8 * 2))[:3] == (255, 255, 255)
+
+    def test_hidden_minimap_draws_nothing(self, game_map):
+        minimap = Minimap(game_map)
+        minimap.visible = False
+        screen = pygame.Surface((300, 300))
+        minimap.render(screen, 0, 0)
+        assert screen.get_at((250, 20))[:3] == (0, 0, 0)
+
+    def test_streamed_regions_drawn_when_loaded(self, map_file):
+        world_dir = os.path.join(os.path.dirname(map_file), "world")
+        write_streaming_world(map_file, world_dir, region_tiles=8)
+        game_map = StreamingMap(world_dir, tile_size=32, preload_margin=0)
+        try:
+            minimap = Minimap(game_map)
+            # Only the regions around the spawn are explored
+            assert minimap.surface.get_at((20, 15))[:3] == (34, 139, 34)
+            assert minimap.surface.get_at((2, 2))[:3] == (0, 0, 0)
+
+            game_map.update_view(0, 0, 32, 32)
+            deadline = time.time() + 5
+            while not game_map.is_region_loaded(0, 0):
+                assert time.time() < deadline, "region never finished loading"
+                game_map.update_view(0, 0, 32, 32)
+                time.sleep(0.01)
+            minimap.update()
+            assert minimap.surface.get_at((2, 2))[:3] == (0, 100, 255)
+        finally:
+            game_map.close()
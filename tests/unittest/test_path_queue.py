@@ -0,0 +1,128 @@
+import os
+import tempfile
+import threading
+import time
+
+import pygame
+import pytest
+
+from game.world.bitmap_map import BitmapMap
+from game.world.path_queue import PathQueue
+from game.world.tile_palette import get_tile_id
+
+GRASS = (34, 139, 34)
+WALL = (165, 42, 42)
+
+
+def wait_for_results(path_queue, count):
+    """Wait for finished searches without applying them."""
+    deadline = time.monotonic() + 5.0
+    while path_queue._results.qsize() < count:
+        assert time.monotonic() < deadline, "path searches never finished"
+        time.sleep(0.001)
+
+
+class TestPathQueue:
+    @pytest.fixture
+    def game_map(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((20, 20))
+            surface.fill(GRASS)
+            for tile_y in range(0, 16):
+                surface.set_at((10, tile_y), WALL)
+            pygame.image.save(surface, tmp_file.name)
+
+        game_map = BitmapMap(tmp_file.name, tile_size=32)
+        yield game_map
+
+        game_map.close()
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def test_result_applied_on_update(self, game_map):
+        path_queue = game_map.path_queue
+        request = path_queue.request((8, 5), (12, 5))
+        assert not request.done
+
+        wait_for_results(path_queue, 1)
+        assert not request.done
+        assert path_queue.update() == 1
+        assert request.done
+        assert request.path == game_map.pathfinder.find_path((8, 5), (12, 5))
+        # Stored for everyone asking the same path
+        assert game_map.pathfinder.is_cached((8, 5), (12, 5))
+
+    def test_results_capped_per_frame(self, game_map):
+        path_queue = PathQueue(game_map, max_results_per_frame=3)
+        requests = [path_queue.request((2, tile_y), (15, 2)) for tile_y in range(8)]
+        wait_for_results(path_queue, 8)
+
+        assert path_queue.update() == 3
+        assert [request.done for request in requests] == [True] * 3 + [False] * 5
+        assert path_queue.update() == 3
+        assert path_queue.update() == 2
+        assert all(request.path for request in requests)
+        path_queue.close()
+
+    def test_cancelled_requests_dropped(self, game_map):
+        path_queue = game_map.path_queue
+        completed = []
+        path_queue.completion_listeners.append(completed.append)
+        cancelled = path_queue.request((2, 2), (15, 2))
+        kept = path_queue.request((2, 3), (15, 3))
+        cancelled.cancel()
+
+        assert path_queue.drain() == 1
+        assert not cancelled.done
+        assert completed == [kept]
+
+    def test_stale_results_searched_again(self, game_map, monkeypatch):
+        path_queue = game_map.path_queue
+        release = threading.Event()
+        search = path_queue._search
+        searched_walls = []
+
+        def blocked_search(request, snapshot):
+            release.wait(5.0)
+            searched_walls.append(snapshot[17 * game_map.width + 10])
+            return search(request, snapshot)
+
+        monkeypatch.setattr(path_queue, "_search", blocked_search)
+        request = path_queue.request((8, 17), (12, 17))
+        game_map.set_tile_at_grid(10, 17, get_tile_id(WALL))
+        release.set()
+
+        assert path_queue.drain() == 1
+        # Found on the grid of the request, then again on the changed one
+        assert searched_walls == [0, 1]
+        assert (10, 17) not in request.path
+        assert game_map.pathfinder.is_cached((8, 17), (12, 17))
+
+    def test_drain_applies_every_result(self, game_map):
+        path_queue = PathQueue(game_map, max_results_per_frame=3)
+        requests = [path_queue.request((2, tile_y), (15, 2)) for tile_y in range(8)]
+
+        assert path_queue.drain() == 8
+        assert all(request.done for request in requests)
+        assert path_queue.drain() == 0
+        path_queue.close()
+
+    def test_drain_times_out(self, game_map, monkeypatch):
+        path_queue = game_map.path_queue
+        release = threading.Event()
+        monkeypatch.setattr(path_queue, "_search", lambda *args: release.wait(5.0))
+        path_queue.request((2, 2), (15, 2))
+
+        with pytest.raises(TimeoutError):
+            path_queue.drain(timeout=0.05)
+        release.set()
+        assert path_queue.drain() == 1
+
+    def test_close_stops_worker(self, game_map):
+        path_queue = game_map.path_queue
+        worker = path_queue._worker
+        game_map.close()
+        assert not worker.is_alive()
+        assert path_queue._on_collision_changed not in game_map.collision_listeners
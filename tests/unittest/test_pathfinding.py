@@ -0,0 +1,131 @@
+import math
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.entities.enemy import Goblin
+from game.entities.player import Player
+from game.world.bitmap_map import BitmapMap
+from game.world.pathfinding import octile_distance
+from game.world.tile_palette import get_tile_id
+
+GRASS = (34, 139, 34)
+WALL = (165, 42, 42)
+
+
+class TestGridPathfinder:
+    @pytest.fixture
+    def game_map(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((20, 20))
+            surface.fill(GRASS)
+            # Wall across the map with a gap at the bottom
+            for tile_y in range(0, 16):
+                surface.set_at((10, tile_y), WALL)
+            pygame.image.save(surface, tmp_file.name)
+
+        game_map = BitmapMap(tmp_file.name, tile_size=32)
+        yield game_map
+
+        game_map.close()
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def path_cost(self, start, path):
+        tiles = (start,) + path
+        return sum(
+            math.dist(tile, next_tile) for tile, next_tile in zip(tiles, tiles[1:])
+        )
+
+    def test_octile_distance(self):
+        assert octile_distance((0, 0), (3, 0)) == 3
+        assert octile_distance((0, 0), (3, 3)) == pytest.approx(3 * math.sqrt(2))
+        assert octile_distance((5, 1), (1, 3)) == pytest.approx(2 + 2 * math.sqrt(2))
+
+    def test_open_ground_is_straight(self, game_map):
+        path = game_map.pathfinder.find_path((2, 2), (6, 6))
+        assert path == ((3, 3), (4, 4), (5, 5), (6, 6))
+        assert game_map.pathfinder.find_path((2, 2), (2, 2)) == ()
+
+    def test_path_goes_through_gap(self, game_map):
+        start, goal = (8, 5), (12, 5)
+        path = game_map.pathfinder.find_path(start, goal)
+
+        assert path[-1] == goal
+        assert (10, 16) in path or (10, 17) in path
+        assert not any(game_map.is_tile_blocked(*tile) for tile in path)
+        tiles = (start,) + path
+        for (x, y), (next_x, next_y) in zip(tiles, tiles[1:]):
+            assert max(abs(next_x - x), abs(next_y - y)) == 1
+
+    def test_no_corner_cutting(self, game_map):
+        # The gap's top corner (10, 15) must be walked around, not clipped
+        path = game_map.pathfinder.find_path((9, 15), (11, 15))
+        assert path == ((9, 16), (10, 16), (11, 16), (11, 15))
+        assert self.path_cost((9, 15), path) == pytest.approx(4)
+
+    def test_unreachable_goal(self, game_map):
+        assert game_map.pathfinder.find_path((2, 2), (10, 3)) is None
+        for tile_y in range(16, 20):
+            game_map.set_tile_at_grid(10, tile_y, get_tile_id(WALL))
+        assert game_map.pathfinder.find_path((2, 2), (15, 3)) is None
+
+    def test_search_gives_up_past_node_budget(self, game_map):
+        game_map.pathfinder.max_nodes = 10
+        assert game_map.pathfinder.find_path((8, 5), (12, 5)) is None
+
+    def test_larger_entities_need_room(self, game_map):
+        game_map.set_tile_at_grid(11, 16, get_tile_id(WALL))
+        game_map.set_tile_at_grid(11, 19, get_tile_id(WALL))
+        # One tile left open at (11, 17) and (11, 18), too narrow for 3x3
+        assert game_map.pathfinder.find_path((5, 5), (14, 5), size=1)
+        assert game_map.pathfinder.find_path((5, 5), (14, 5), size=2)
+        assert game_map.pathfinder.find_path((5, 5), (14, 5), size=3) is None
+
+    def test_paths_cached(self, game_map, monkeypatch):
+        pathfinder = game_map.pathfinder
+        path = pathfinder.find_path((8, 5), (12, 5))
+        assert pathfinder.is_cached((8, 5), (12, 5))
+
+        monkeypatch.setattr(pathfinder, "_search", lambda *args: pytest.fail())
+        assert pathfinder.find_path((8, 5), (12, 5)) is path
+
+    def test_new_obstacle_drops_crossing_paths(self, game_map):
+        pathfinder = game_map.pathfinder
+        path = pathfinder.find_path((8, 5), (12, 5))
+        pathfinder.find_path((2, 2), (6, 2))
+        gap_tile = next(tile for tile in path if tile[0] == 10)
+
+        game_map.set_tile_at_grid(*gap_tile, get_tile_id(WALL))
+        assert not pathfinder.is_cached((8, 5), (12, 5))
+        assert pathfinder.is_cached((2, 2), (6, 2))
+        assert gap_tile not in pathfinder.find_path((8, 5), (12, 5))
+
+    def test_opened_tile_drops_all_paths(self, game_map):
+        pathfinder = game_map.pathfinder
+        long_way = pathfinder.find_path((8, 5), (12, 5))
+        pathfinder.find_path((2, 2), (6, 2))
+
+        game_map.set_tile_at_grid(10, 5, get_tile_id(GRASS))
+        assert not pathfinder.is_cached((2, 2), (6, 2))
+        assert len(pathfinder.find_path((8, 5), (12, 5))) < len(long_way)
+
+    def test_enemy_walks_around_wall(self, game_map):
+        player = Player(13 * 32, 5 * 32)
+        goblin = Goblin(7 * 32, 5 * 32)
+        goblin.target = player
+
+        for _ in range(600):
+            goblin.move_towards_target(0.05, game_map)
+            goblin.x += goblin.velocity_x * 0.05
+            goblin.y += goblin.velocity_y * 0.05
+            if goblin.distance_to_target() <= goblin.attack_range:
+                break
+            game_map.path_queue.drain()
+
+        assert goblin.distance_to_target() <= goblin.attack_range
+        assert goblin.path_goal == (13, 5)
@@ -1,8 +1,11 @@
+from collections import defaultdict
 from unittest.mock import Mock, patch
 
 import pygame
 
 from game.entities.player import Player
+from game.world.bitmap_map import BitmapMap
+from game.world.chest import ChestManager
 
 
 class TestPlayer:
@@ -79,28 +82,60 @@ class TestPlayer:
 
     def test_can_move_to_walkable_area(self):
         mock_map = Mock()
-        mock_map.is_walkable.return_value = True
+        mock_map.is_rect_walkable.return_value = True
 
         player = Player(0, 0)
         assert player.can_move_to(10, 10, mock_map) is True
 
-        # Should check all 4 corners
-        assert mock_map.is_walkable.call_count == 4
+        # Should check the whole rectangle, inset by the 2px margin, at once
+        mock_map.is_rect_walkable.assert_called_once_with(12, 12, 28, 28)
 
     def test_can_move_to_non_walkable_area(self):
         mock_map = Mock()
-        mock_map.is_walkable.return_value = False
+        mock_map.is_rect_walkable.return_value = False
 
         player = Player(0, 0)
         assert player.can_move_to(10, 10, mock_map) is False
 
-    def test_can_move_to_partial_collision(self):
-        mock_map = Mock()
-        # First corner walkable, others not
-        mock_map.is_walkable.side_effect = [True, False, True, True]
+    def test_can_move_to_partial_collision(self, tmp_path):
+        pygame.init()
+        surface = pygame.Surface((4, 4))
+        surface.fill((34, 139, 34))
+        # Only the tile under the bottom-right corner of the player is blocked
+        surface.set_at((1, 1), (165, 42, 42))
+        map_path = str(tmp_path / "map.png")
+        pygame.image.save(surface, map_path)
+        game_map = BitmapMap(map_path, tile_size=32)
 
         player = Player(0, 0)
-        assert player.can_move_to(10, 10, mock_map) is False
+        assert player.can_move_to(10, 10, game_map) is False
+        assert player.can_move_to(64, 64, game_map) is True
+        pygame.quit()
+
+    @patch("pygame.key.get_pressed")
+    def test_chests_block_movement(self, mock_keys, tmp_path):
+        pygame.init()
+        surface = pygame.Surface((20, 4))
+        surface.fill((34, 139, 34))
+        map_path = str(tmp_path / "map.png")
+        pygame.image.save(surface, map_path)
+        game_map = BitmapMap(map_path, tile_size=32)
+        chest_manager = ChestManager()
+        chest_manager.create_chest(300, 0)
+        chest_manager.create_chest(3000, 3000)  # Far away, never looked at
+        mock_keys.return_value = defaultdict(bool, {pygame.K_RIGHT: True})
+
+        player = Player(200, 0)
+        assert player.can_move_to(290, 0, game_map, chest_manager) is False
+        assert player.can_move_to(100, 0, game_map, chest_manager) is True
+        with patch.object(
+            chest_manager, "get_chests_in_rect", wraps=chest_manager.get_chests_in_rect
+        ) as get_chests:
+            player.update(1.0, game_map, chest_manager=chest_manager)
+        # Stopped against the chest, looked up around the swept box only
+        assert player.x == 300 - player.width
+        get_chests.assert_called_once_with(200, 0, 182, 32)
+        pygame.quit()
 
     @patch("pygame.key.get_pressed")
     def test_handle_input_no_keys(self, mock_keys):
@@ -178,7 +213,8 @@ class TestPlayer:
     @patch("game.entities.player.Player.handle_input")
     def test_update_with_map_collision(self, mock_handle_input):
         mock_map = Mock()
-        mock_map.is_walkable.return_value = False  # Block all movement
+        mock_map.tile_size = 32
+        mock_map.is_rect_walkable.return_value = False  # Block all movement
 
         player = Player(10, 10)
         player.velocity_x = 100
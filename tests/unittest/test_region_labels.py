@@ -0,0 +1,159 @@
+import os
+import random
+import tempfile
+
+import pygame
+import pytest
+
+from game.entities.enemy import Goblin
+from game.entities.player import Player
+from game.world import region_labels
+from game.world.bitmap_map import BitmapMap
+from game.world.tile_palette import get_tile_id
+
+GRASS = (34, 139, 34)
+WALL = (165, 42, 42)
+
+
+def flood_regions(game_map):
+    """Reference labeling, one flood fill per region."""
+    labels = {}
+    region = 0
+    for tile_y in range(game_map.height):
+        for tile_x in range(game_map.width):
+            if (tile_x, tile_y) in labels or game_map.is_tile_blocked(tile_x, tile_y):
+                continue
+            region += 1
+            labels[(tile_x, tile_y)] = region
+            stack = [(tile_x, tile_y)]
+            while stack:
+                x, y = stack.pop()
+                for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    if neighbour not in labels and not game_map.is_tile_blocked(
+                        *neighbour
+                    ):
+                        labels[neighbour] = region
+                        stack.append(neighbour)
+    return labels, region
+
+
+class TestRegionLabels:
+    @pytest.fixture
+    def game_map(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((20, 20))
+            surface.fill(GRASS)
+            # Wall across the map with a gap at the bottom
+            for tile_y in range(0, 16):
+                surface.set_at((10, tile_y), WALL)
+            # Walled-in pocket in the top left corner
+            for tile in ((2, 0), (2, 1), (0, 2), (1, 2), (2, 2)):
+                surface.set_at(tile, WALL)
+            pygame.image.save(surface, tmp_file.name)
+
+        game_map = BitmapMap(tmp_file.name, tile_size=32)
+        yield game_map
+
+        game_map.close()
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def close_gap(self, game_map):
+        for tile_y in range(16, 20):
+            game_map.set_tile_at_grid(10, tile_y, get_tile_id(WALL))
+
+    def test_regions_labeled_on_first_use(self, game_map):
+        assert game_map._region_labels is None
+        regions = game_map.region_labels
+        assert regions.labels.typecode == "H"
+        assert regions.region_count == 2
+        assert regions.same_region((3, 3), (15, 3))
+        assert regions.same_region((0, 0), (1, 1))
+        assert not regions.same_region((0, 0), (3, 3))
+
+    def test_blocked_and_outside_tiles_in_no_region(self, game_map):
+        regions = game_map.region_labels
+        assert regions.get_label((10, 3)) == 0
+        assert regions.get_label((-1, 3)) == 0
+        assert not regions.same_region((10, 3), (10, 3))
+        assert not regions.same_region((3, 3), (20, 3))
+
+    def test_blocking_splits_region(self, game_map):
+        regions = game_map.region_labels
+        self.close_gap(game_map)
+
+        assert regions.region_count == 3
+        assert not regions.same_region((3, 3), (15, 3))
+        assert regions.same_region((3, 3), (9, 19))
+        assert regions.same_region((15, 3), (11, 19))
+        assert sum(regions.sizes.values()) == 20 * 20 - 16 - 4 - 5
+
+    def test_labels_widened_past_short_range(self, game_map, monkeypatch):
+        monkeypatch.setattr(region_labels, "MAX_SHORT_LABEL", 2)
+        regions = game_map.region_labels
+        assert regions.labels.typecode == "H"
+        self.close_gap(game_map)
+
+        assert regions.labels.typecode == "i"
+        assert regions.region_count == 3
+        assert regions.same_region((3, 3), (9, 19))
+        assert regions.same_region((15, 3), (11, 19))
+        assert not regions.same_region((3, 3), (15, 3))
+
+    def test_opening_merges_regions(self, game_map):
+        regions = game_map.region_labels
+        self.close_gap(game_map)
+        game_map.set_tile_at_grid(10, 18, get_tile_id(GRASS))
+        game_map.set_tile_at_grid(2, 1, get_tile_id(GRASS))
+
+        assert regions.region_count == 1
+        assert regions.same_region((0, 0), (15, 3))
+
+    def test_follows_collision_changes(self, game_map):
+        regions = game_map.region_labels
+        rng = random.Random(7)
+        for _ in range(200):
+            tile_id = get_tile_id(WALL if rng.random() < 0.6 else GRASS)
+            game_map.set_tile_at_grid(rng.randrange(20), rng.randrange(20), tile_id)
+
+        labels, region_count = flood_regions(game_map)
+        assert regions.region_count == region_count
+        tiles = list(labels)
+        for _ in range(500):
+            a, b = rng.choice(tiles), rng.choice(tiles)
+            assert regions.same_region(a, b) == (labels[a] == labels[b])
+
+    def test_pathfinder_skips_unreachable_goal(self, game_map, monkeypatch):
+        def fail_search(*args):
+            raise AssertionError("searched for an unreachable goal")
+
+        monkeypatch.setattr(game_map.pathfinder, "_search", fail_search)
+        assert game_map.pathfinder.find_path((3, 3), (0, 0)) is None
+
+    def test_path_queue_answers_unreachable_goal_at_once(self, game_map, monkeypatch):
+        path_queue = game_map.path_queue
+
+        def fail_search(*args):
+            raise AssertionError("searched for an unreachable goal")
+
+        monkeypatch.setattr(path_queue, "_search", fail_search)
+        request = path_queue.request((3, 3), (0, 0))
+        assert path_queue.update() == 1
+        assert request.done
+        assert request.path is None
+
+    def test_enemy_stops_chasing_unreachable_target(self, game_map):
+        player = Player(12 * 32, 17 * 32)
+        goblin = Goblin(8 * 32, 17 * 32)
+        goblin.target = player
+        goblin.ai_state = "chase"
+
+        goblin.update_ai(0.016, 0, game_map)
+        assert goblin.ai_state == "chase"
+
+        self.close_gap(game_map)
+        goblin.update_ai(0.016, 0, game_map)
+        assert goblin.ai_state == "idle"
+        assert (goblin.velocity_x, goblin.velocity_y) == (0, 0)
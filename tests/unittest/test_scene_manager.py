@@ -121,6 +121,19 @@ class TestSceneManager:
         assert manager.scenes[0] == scene
         assert scene.entered is True
 
+    def test_clear_exits_every_scene(self):
+        manager = SceneManager()
+        scene1 = MockScene("scene1")
+        scene2 = MockScene("scene2")
+        manager.push_scene(scene1)
+        manager.push_scene(scene2)
+
+        manager.clear()
+
+        assert len(manager.scenes) == 0
+        assert scene1.exited is True
+        assert scene2.exited is True
+
     def test_handle_event_with_scene(self):
         manager = SceneManager()
         scene = MockScene("test")
@@ -0,0 +1,94 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+import pygame
+import pytest
+
+from game.world.bitmap_map import BitmapMap
+from game.world.game_object import GameObject
+from game.world.spatial_index import SpatialGrid
+
+
+class TestSpatialGrid:
+    def test_query_rect_returns_insertion_order(self):
+        grid = SpatialGrid(cell_size=100)
+        grid.insert("c", 250, 250, 10, 10)
+        grid.insert("a", 0, 0, 10, 10)
+        grid.insert("wide", 50, 0, 200, 10)
+
+        assert grid.query_rect(0, 0, 300, 300) == ["c", "a", "wide"]
+        assert grid.query_rect(0, 0, 99, 99) == ["a", "wide"]
+        assert grid.query_rect(400, 400, 50, 50) == []
+
+    def test_item_spanning_cells_returned_once(self):
+        grid = SpatialGrid(cell_size=32)
+        grid.insert("house", 0, 0, 96, 64)
+
+        assert grid.query_rect(0, 0, 128, 128) == ["house"]
+        assert grid.query_point(70, 40) == ["house"]
+
+    def test_remove(self):
+        grid = SpatialGrid(cell_size=32)
+        grid.insert("a", 0, 0, 64, 64)
+        grid.insert("b", 10, 10, 5, 5)
+
+        assert grid.remove("a")
+        assert not grid.remove("a")
+        assert grid.query_rect(0, 0, 64, 64) == ["b"]
+        assert len(grid) == 1
+
+    def test_move(self):
+        grid = SpatialGrid(cell_size=32)
+        grid.insert("enemy", 0, 0, 16, 16)
+        grid.insert("chest", 100, 100, 16, 16)
+
+        assert grid.move("enemy", 8, 8, 16, 16)  # Same cell
+        assert grid.query_point(5, 5) == ["enemy"]
+        assert grid.move("enemy", 96, 96, 16, 16)
+        assert grid.query_point(5, 5) == []
+        assert grid.query_rect(96, 96, 32, 32) == ["enemy", "chest"]
+        assert not grid.move("ghost", 0, 0, 1, 1)
+        assert len(grid) == 2
+
+
+class TestBitmapMapObjectIndex:
+    @pytest.fixture
+    def game_map(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((40, 40))
+            surface.fill((34, 139, 34))
+            surface.set_at((1, 1), (50, 150, 50))  # Small tree
+            surface.set_at((3, 1), (150, 75, 0))  # House (3x2)
+            surface.set_at((30, 30), (60, 180, 60))  # Bush, far away
+            pygame.image.save(surface, tmp_file.name)
+
+        yield BitmapMap(tmp_file.name, tile_size=32)
+
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def test_objects_indexed(self, game_map):
+        assert len(game_map.object_index) == len(game_map.objects) == 3
+
+    def test_get_objects_at_point(self, game_map):
+        assert [obj.name for obj in game_map.get_objects_at_point(5 * 32, 2 * 32)] == [
+            "house"
+        ]
+        assert game_map.get_objects_at_point(20 * 32, 20 * 32) == []
+
+    def test_get_objects_in_area(self, game_map):
+        names = [obj.name for obj in game_map.get_objects_in_area(0, 0, 200, 100)]
+        assert names == ["small_tree", "house"]
+
+    def test_render_objects_culls_to_camera(self, game_map):
+        screen = pygame.Surface((200, 150))
+        with patch.object(GameObject, "render", autospec=True) as render:
+            game_map.render_objects(screen, 0, 0)
+
+        assert [call.args[0].name for call in render.call_args_list] == [
+            "small_tree",
+            "house",
+        ]
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import threading
+import time
+
+import pygame
+import pytest
+
+from game.world import game_object
+from game.world.bitmap_map import BitmapMap
+from game.world.game_object import GameObject
+from game.world.streaming_map import (
+    StreamingMap,
+    is_streaming_world,
+    write_streaming_world,
+)
+
+
+class TestStreamingMap:
+    @pytest.fixture
+    def world_dir(self):
+        pygame.init()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            map_path = os.path.join(tmp_dir, "map.png")
+            surface = pygame.Surface((20, 12))
+            surface.fill((34, 139, 34))
+            surface.set_at((1, 1), (255, 0, 0))  # Spawn
+            surface.set_at((3, 2), (165, 42, 42))  # Wall
+            surface.set_at((17, 10), (0, 0, 255))  # Water, far region
+            surface.set_at((7, 3), (150, 75, 0))  # House crossing a region border
+            pygame.image.save(surface, map_path)
+
+            world_dir = os.path.join(tmp_dir, "world")
+            write_streaming_world(map_path, world_dir, region_tiles=8)
+            yield world_dir
+
+        pygame.quit()
+
+    @pytest.fixture
+    def streaming_map(self, world_dir):
+        game_map = StreamingMap(
+            world_dir, tile_size=32, max_regions=4, preload_margin=0
+        )
+        yield game_map
+        game_map.close()
+
+    def wait_for_region(self, game_map, region_x, region_y):
+        deadline = time.time() + 5
+        while not game_map.is_region_loaded(region_x, region_y):
+            assert time.time() < deadline, "region never finished loading"
+            game_map.update_view(region_x * 256, region_y * 256, 32, 32)
+            time.sleep(0.01)
+
+    def test_world_manifest(self, world_dir, streaming_map):
+        assert is_streaming_world(world_dir)
+        assert not is_streaming_world(os.path.dirname(world_dir))
+        assert streaming_map.width == 20
+        assert streaming_map.height == 12
+        assert streaming_map.spawn_point == (1 * 32 + 16, 1 * 32 + 16)
+
+    def test_regions_around_spawn_loaded_at_startup(self, streaming_map):
+        assert streaming_map.is_region_loaded(0, 0)
+        assert streaming_map.is_region_loaded(1, 1)
+        assert not streaming_map.is_region_loaded(2, 1)
+
+        assert streaming_map.get_tile_at_grid(3, 2).name == "wall"
+        assert not streaming_map.is_walkable(3 * 32, 2 * 32)
+
+    def test_objects_loaded_with_world_positions(self, streaming_map):
+        house = [obj for obj in streaming_map.objects if obj.name == "house"]
+        assert len(house) == 1
+        assert (house[0].x, house[0].y) == (7 * 32, 3 * 32)
+        # The house extends into the neighbour region
+        assert not streaming_map.is_walkable(9 * 32 + 5, 4 * 32 + 5)
+
+    def test_unloaded_region_reads_as_void(self, streaming_map):
+        assert streaming_map.get_tile_at_grid(17, 10).name == "void"
+        assert not streaming_map.is_walkable(17 * 32, 10 * 32)
+
+    def test_region_streamed_in_background(self, streaming_map):
+        self.wait_for_region(streaming_map, 2, 1)
+
+        assert streaming_map.get_tile_at_grid(17, 10).name == "water"
+
+    def test_least_recently_used_regions_evicted(self, streaming_map):
+        self.wait_for_region(streaming_map, 2, 1)
+        self.wait_for_region(streaming_map, 2, 0)
+
+        assert len(streaming_map.regions) <= 4
+        assert streaming_map.is_region_loaded(2, 0)
+        assert not streaming_map.is_region_loaded(0, 0)
+        # Collision tiles of evicted regions are released
+        assert (3, 2) not in streaming_map.object_collision_tiles
+
+    def test_matches_single_image_map(self, world_dir, streaming_map):
+        self.wait_for_region(streaming_map, 2, 1)
+        self.wait_for_region(streaming_map, 2, 0)
+        self.wait_for_region(streaming_map, 1, 0)
+        self.wait_for_region(streaming_map, 1, 1)
+
+        full_map = BitmapMap(os.path.join(os.path.dirname(world_dir), "map.png"))
+        for tile_y in range(full_map.height):
+            for tile_x in range(8, full_map.width):
+                assert streaming_map.get_tile_id_at_grid(
+                    tile_x, tile_y
+                ) == full_map.get_tile_id_at_grid(tile_x, tile_y)
+
+    def test_dynamic_obstacle(self, streaming_map):
+        door = GameObject("door", 5 * 32, 5 * 32, 32, 32)
+        assert streaming_map.add_obstacle(door)
+        assert not streaming_map.is_walkable(5 * 32 + 5, 5 * 32 + 5)
+        assert door in streaming_map.objects
+
+        streaming_map.set_obstacle_blocking(door, False)
+        assert streaming_map.is_walkable(5 * 32 + 5, 5 * 32 + 5)
+        streaming_map.set_obstacle_blocking(door, True)
+        assert streaming_map.remove_obstacle(door)
+        assert streaming_map.is_walkable(5 * 32 + 5, 5 * 32 + 5)
+        assert (5, 5) not in streaming_map.object_collision_tiles
+
+        # Objects can only be added to resident regions
+        assert not streaming_map.add_obstacle(
+            GameObject("door", 17 * 32, 10 * 32, 32, 32)
+        )
+
+    def test_terrain_edit_notifies_collision_listeners(self, streaming_map):
+        changes = []
+        streaming_map.collision_listeners.append(lambda *change: changes.append(change))
+        grass = streaming_map.get_tile_id_at_grid(4, 4)
+        water = streaming_map.get_tile_id_at_grid(3, 2)
+
+        assert streaming_map.set_tile_at_grid(4, 4, water)
+        assert streaming_map.set_tile_at_grid(4, 4, water)
+        assert streaming_map.set_tile_at_grid(4, 4, grass)
+        assert changes == [(4, 4, True), (4, 4, False)]
+
+    def test_objects_created_on_main_thread(self, world_dir, monkeypatch):
+        threads = []
+
+        def record_thread(*args, **kwargs):
+            threads.append(threading.current_thread())
+
+        monkeypatch.setattr(game_object, "load_object_sprite", record_thread)
+        streaming_map = StreamingMap(world_dir, tile_size=32, preload_margin=0)
+        streaming_map.close()
+
+        # The house sprite, loaded as its region was installed
+        assert threads == [threading.main_thread()]
@@ -0,0 +1,92 @@
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.world.bitmap_map import BitmapMap
+from game.world.tile_palette import get_tile_id
+
+
+class TestTerrainChunkCache:
+    @pytest.fixture
+    def sample_map_file(self):
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((10, 6))
+            surface.fill((34, 139, 34))  # Grass
+            surface.set_at((0, 0), (165, 42, 42))  # Wall
+            surface.set_at((5, 5), (0, 0, 255))  # Water
+            surface.set_at((9, 0), (50, 150, 50))  # Small tree marker
+
+            pygame.image.save(surface, tmp_file.name)
+            yield tmp_file.name
+
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    @pytest.fixture
+    def game_map(self, sample_map_file):
+        game_map = BitmapMap(sample_map_file, tile_size=8)
+        game_map.terrain_cache.chunk_tiles = 4
+        return game_map
+
+    def test_render_matches_tile_colors(self, game_map):
+        screen = pygame.Surface((80, 48))
+        game_map.render_terrain(screen, 0, 0)
+
+        assert screen.get_at((4, 4))[:3] == (100, 50, 50)  # Wall color
+        assert screen.get_at((5 * 8 + 4, 5 * 8 + 4))[:3] == (0, 100, 255)
+        assert screen.get_at((9 * 8 + 4, 4))[:3] == (34, 139, 34)  # Grass under tree
+        assert screen.get_at((20, 20))[:3] == (34, 139, 34)
+
+    def test_render_with_camera_offset(self, game_map):
+        screen = pygame.Surface((16, 16))
+        game_map.render_terrain(screen, 36, 36)
+
+        # Water tile (5, 5) starts at world pixel 40
+        assert screen.get_at((8, 8))[:3] == (0, 100, 255)
+        assert screen.get_at((0, 0))[:3] == (34, 139, 34)
+
+    def test_chunks_built_lazily(self, game_map):
+        cache = game_map.terrain_cache
+        assert not cache.is_cached(0, 0)
+
+        game_map.render_terrain(pygame.Surface((16, 16)), 0, 0)
+
+        assert cache.is_cached(0, 0)
+        assert not cache.is_cached(2, 1)
+
+    def test_edge_chunks_are_clipped_to_map(self, game_map):
+        chunk = game_map.terrain_cache.get_chunk(2, 1)
+        assert chunk.get_size() == (2 * 8, 2 * 8)
+
+    def test_cache_is_bounded(self, game_map):
+        cache = game_map.terrain_cache
+        cache.max_chunks = 2
+
+        cache.get_chunk(0, 0)
+        cache.get_chunk(1, 0)
+        cache.get_chunk(0, 0)  # Refresh (0, 0)
+        cache.get_chunk(2, 0)
+
+        assert cache.is_cached(0, 0)
+        assert not cache.is_cached(1, 0)
+        assert cache.is_cached(2, 0)
+
+    def test_set_tile_invalidates_chunk(self, game_map):
+        screen = pygame.Surface((80, 48))
+        game_map.render_terrain(screen, 0, 0)
+
+        assert game_map.set_tile_at_grid(1, 1, get_tile_id((0, 0, 255)))
+        assert not game_map.terrain_cache.is_cached(0, 0)
+        assert game_map.terrain_cache.is_cached(1, 0)
+
+        game_map.render_terrain(screen, 0, 0)
+        assert screen.get_at((12, 12))[:3] == (0, 100, 255)
+        assert not game_map.is_walkable(12, 12)
+
+    def test_set_tile_out_of_bounds(self, game_map):
+        assert not game_map.set_tile_at_grid(-1, 0, get_tile_id((0, 0, 255)))
+        assert not game_map.set_tile_at_grid(10, 0, get_tile_id((0, 0, 255)))
@@ -0,0 +1,120 @@
+import os
+import tempfile
+
+import pygame
+import pytest
+
+from game.entities.enemy import Goblin
+from game.entities.player import Player
+from game.world.bitmap_map import BitmapMap
+from game.world.chest import ChestManager
+from game.world.spatial_index import SpatialGrid
+from game.world.tile_collision import sweep_box
+
+
+class TestSweepBox:
+    @pytest.fixture
+    def corridor_map(self):
+        """8x5 grass map with a one tile thick wall column at x=5."""
+        pygame.init()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+            surface = pygame.Surface((8, 5))
+            surface.fill((34, 139, 34))
+            for tile_y in range(5):
+                surface.set_at((5, tile_y), (165, 42, 42))
+            surface.set_at((1, 1), (255, 0, 0))
+            pygame.image.save(surface, tmp_file.name)
+            yield BitmapMap(tmp_file.name, tile_size=32, use_compiled=False)
+
+        os.unlink(tmp_file.name)
+        pygame.quit()
+
+    def test_free_movement(self, corridor_map):
+        x, y, normal = sweep_box(corridor_map, 32, 32, 32, 32, 20, 10)
+        assert (x, y) == (52, 42)
+        assert normal == (0, 0)
+
+    def test_stops_against_wall(self, corridor_map):
+        x, y, normal = sweep_box(corridor_map, 96, 32, 32, 32, 40, 0)
+        assert normal == (-1, 0)
+        assert x + 32 < 5 * 32
+        assert x > 96
+        assert corridor_map.is_rect_walkable(x, y, 32, 32)
+
+    def test_no_tunneling_on_large_step(self, corridor_map):
+        # A long frame would jump straight over the wall with a destination check
+        x, _, normal = sweep_box(corridor_map, 32, 32, 30, 30, 150, 0)
+        assert normal == (-1, 0)
+        assert x + 30 < 5 * 32
+
+    def test_slides_along_wall(self, corridor_map):
+        x, y, normal = sweep_box(corridor_map, 96, 32, 32, 32, 60, 20)
+        assert normal == (-1, 0)
+        assert y == 52
+        assert x + 32 < 5 * 32
+
+    def test_stops_at_map_edge(self, corridor_map):
+        x, y, normal = sweep_box(corridor_map, 40, 40, 20, 20, -100, -100)
+        assert (x, y) == (0, 0)
+        assert normal == (1, 1)
+
+    def test_tile_margin(self, corridor_map):
+        x, _, _ = sweep_box(corridor_map, 96, 32, 32, 32, 40, 0, tile_margin=2)
+        assert 5 * 32 - 32 < x + 32 < 5 * 32 + 2
+
+    def test_stops_against_blocker(self, corridor_map):
+        blocker = pygame.Rect(100, 0, 10, 200)
+        x, y, normal = sweep_box(corridor_map, 32, 32, 32, 32, 50, 0, [blocker])
+        assert (x, y) == (68, 32)
+        assert normal == (-1, 0)
+
+    def test_moves_away_from_overlapping_blocker(self, corridor_map):
+        blocker = pygame.Rect(40, 32, 32, 32)
+        x, _, normal = sweep_box(corridor_map, 32, 32, 32, 32, -10, 0, [blocker])
+        assert x == 22
+        assert normal == (0, 0)
+        x, _, normal = sweep_box(corridor_map, 32, 32, 32, 32, 10, 0, [blocker])
+        assert x == 32
+        assert normal == (-1, 0)
+
+    def test_player_does_not_tunnel(self, corridor_map):
+        player = Player(96, 32)
+        player.handle_input = lambda *args: None
+        player.velocity_x = player.speed
+        player.update(2.0, corridor_map)
+        assert player.x + player.width - 2 < 5 * 32
+        assert player.x > 96
+
+    def test_enemy_velocity_reaches_resolved_position(self, corridor_map):
+        enemy = Goblin(96, 32)
+        enemy.target = Player(400, 32)
+        enemy.move_towards_target(1.0, corridor_map)
+        assert enemy.velocity_x > 0
+        assert enemy.x + enemy.velocity_x + enemy.width - 2 < 5 * 32
+
+    def test_enemy_blockers_from_spatial_indexes(self, corridor_map):
+        enemies = [Goblin(32, 32), Goblin(96, 32), Goblin(32, 128)]
+        enemy_index = SpatialGrid(cell_size=64)
+        for enemy in enemies:
+            enemy_index.insert(enemy, enemy.x, enemy.y, enemy.width, enemy.height)
+        chest_manager = ChestManager()
+        near_chest = chest_manager.create_chest(32, 96)
+        far_chest = chest_manager.create_chest(600, 128)
+
+        mover = enemies[0]
+        area = pygame.Rect(mover.x, mover.y, mover.width + 40, mover.height)
+        blockers = mover.get_movement_blockers(
+            chest_manager, other_enemies=enemies, area=area, enemy_index=enemy_index
+        )
+        # Only what lies in the cells around the move, never the mover itself
+        assert pygame.Rect(96, 32, 32, 32) in blockers
+        assert near_chest.rect in blockers
+        assert far_chest.rect not in blockers
+        assert mover.rect not in blockers
+
+        mover.target = Player(400, 32)
+        mover.move_towards_target(
+            1.0, corridor_map, other_enemies=enemies, enemy_index=enemy_index
+        )
+        assert mover.x + mover.velocity_x + mover.width <= 96
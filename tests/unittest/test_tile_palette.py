@@ -0,0 +1,43 @@
+from game.world.object_types import OBJECT_TYPES
+from game.world.tile_palette import (
+    DEFAULT_TILE_ID,
+    PALETTE_OBJECTS,
+    PALETTE_TILES,
+    SPAWN_TILE_ID,
+    TILE_RENDER_COLORS,
+    TILE_WALKABLE,
+    VOID_TILE_ID,
+    decode_rgb,
+    get_tile_id,
+)
+
+
+class TestTilePalette:
+    def test_tile_ids_match_tile_types(self):
+        assert PALETTE_TILES[get_tile_id((165, 42, 42))].name == "wall"
+        assert PALETTE_TILES[VOID_TILE_ID].name == "void"
+        assert PALETTE_TILES[SPAWN_TILE_ID].name == "spawn"
+
+    def test_unknown_color_maps_to_default(self):
+        assert get_tile_id((123, 45, 67)) == DEFAULT_TILE_ID
+
+    def test_walkable_table(self):
+        assert TILE_WALKABLE[get_tile_id((34, 139, 34))]
+        assert not TILE_WALKABLE[get_tile_id((0, 0, 255))]
+        assert not TILE_WALKABLE[VOID_TILE_ID]
+
+    def test_object_markers_render_as_grass(self):
+        for color, object_type in OBJECT_TYPES.items():
+            tile_id = get_tile_id(color)
+            assert PALETTE_OBJECTS[tile_id] is object_type
+            assert PALETTE_TILES[tile_id].name == "default"
+            assert TILE_RENDER_COLORS[tile_id] == (34, 139, 34)
+
+    def test_decode_rgb(self):
+        rgb = bytes([165, 42, 42, 255, 0, 0, 1, 2, 3])
+        tile_ids = decode_rgb(rgb)
+        assert list(tile_ids) == [
+            get_tile_id((165, 42, 42)),
+            SPAWN_TILE_ID,
+            DEFAULT_TILE_ID,
+        ]
@@ -0,0 +1,93 @@
+import pygame
+
+from game.world.chest import ChestManager
+from game.world.trigger_zones import TriggerZone, TriggerZoneManager
+
+
+class TestTriggerZoneManager:
+    def test_zones_at(self):
+        manager = TriggerZoneManager(cell_size=64)
+        near = manager.add_zone(TriggerZone("trap", None, 100, 100, 40))
+        manager.add_zone(TriggerZone("trap", None, 500, 500, 40))
+
+        assert manager.zones_at(120, 120) == [near]
+        assert manager.zones_at(140, 100) == [near]  # On the radius
+        assert manager.zones_at(130, 130) == []  # Inside the bounds, outside the circle
+        assert manager.zones_at(120, 120, kind="door") == []
+
+    def test_zone_spanning_cells(self):
+        manager = TriggerZoneManager(cell_size=32)
+        zone = manager.add_zone(TriggerZone("npc", None, 64, 64, 50))
+
+        for x, y in [(20, 64), (110, 64), (64, 20), (64, 110)]:
+            assert manager.zones_at(x, y) == [zone]
+
+    def test_enter_and_exit_events(self):
+        manager = TriggerZoneManager()
+        events = []
+        zone = manager.add_zone(
+            TriggerZone(
+                "door",
+                None,
+                100,
+                100,
+                30,
+                on_enter=lambda z: events.append(("enter", z)),
+                on_exit=lambda z: events.append(("exit", z)),
+            )
+        )
+
+        assert manager.update(0, 0) == ([], [])
+        assert manager.update(90, 100) == ([zone], [])
+        assert manager.update(95, 100) == ([], [])  # Still inside, no new event
+        assert manager.get_active_zones() == [zone]
+        assert manager.update(200, 100) == ([], [zone])
+        assert events == [("enter", zone), ("exit", zone)]
+
+    def test_remove_active_zone_exits(self):
+        manager = TriggerZoneManager()
+        exited = []
+        zone = manager.add_zone(
+            TriggerZone("trap", None, 0, 0, 10, on_exit=exited.append)
+        )
+        manager.update(1, 1)
+
+        assert manager.remove_zone(zone)
+        assert not manager.remove_zone(zone)
+        assert exited == [zone]
+        assert manager.get_active_zones() == []
+        assert len(manager) == 0
+
+
+class TestChestTriggerZones:
+    def setup_method(self):
+        pygame.init()
+        self.chest_manager = ChestManager()
+
+    def teardown_method(self):
+        pygame.quit()
+
+    def test_chests_register_zones(self):
+        chest = self.chest_manager.create_chest(100, 100)
+        zones = self.chest_manager.trigger_zones.zones_at(116, 116, "chest")
+        assert [zone.owner for zone in zones] == [chest]
+
+    def test_interactable_chest_follows_player(self):
+        chest = self.chest_manager.create_chest(100, 100)
+        assert self.chest_manager.get_interactable_chest() is None
+
+        self.chest_manager.update_player_position(120, 120)
+        assert self.chest_manager.get_interactable_chest() is chest
+
+        chest.is_opened = True
+        assert self.chest_manager.get_interactable_chest() is None
+
+        chest.is_opened = False
+        self.chest_manager.update_player_position(400, 400)
+        assert self.chest_manager.get_interactable_chest() is None
+
+    def test_shared_trigger_zones(self):
+        trigger_zones = TriggerZoneManager()
+        chest_manager = ChestManager(trigger_zones)
+        chest_manager.create_chest(0, 0)
+        assert len(trigger_zones) == 1
@@ -0,0 +1,168 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pygame
+import pytest
+
+from game.scenes.game_scene import GameScene
+from game.world.bitmap_map import BitmapMap
+from game.world.zone_world import ZoneWorld, is_zone_world
+
+
+def write_map(path, size, spawn=None, tree=None):
+    surface = pygame.Surface(size)
+    surface.fill((34, 139, 34))
+    if spawn:
+        surface.set_at(spawn, (255, 0, 0))
+    if tree:
+        surface.set_at(tree, (50, 150, 50))
+    pygame.image.save(surface, path)
+
+
+class TestZoneWorld:
+    @pytest.fixture
+    def world_dir(self):
+        """village <-> forest <-> cave, plus an unconnected ruins zone."""
+        pygame.init()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_map(os.path.join(tmp_dir, "village.png"), (12, 10), spawn=(2, 2))
+            write_map(os.path.join(tmp_dir, "forest.png"), (16, 16), tree=(5, 5))
+            write_map(os.path.join(tmp_dir, "cave.png"), (8, 8))
+            write_map(os.path.join(tmp_dir, "ruins.png"), (8, 8))
+            manifest = {
+                "start": "village",
+                "zones": {
+                    "village": "village.png",
+                    "forest": "forest.png",
+                    "cave": "cave.png",
+                    "ruins": "ruins.png",
+                },
+                "portals": [
+                    {
+                        "zone": "village",
+                        "tile": [10, 4],
+                        "size": [1, 2],
+                        "target": "forest",
+                        "target_tile": [1, 8],
+                    },
+                    {
+                        "zone": "forest",
+                        "tile": [0, 8],
+                        "target": "village",
+                        "target_tile": [9, 4],
+                    },
+                    {
+                        "zone": "forest",
+                        "tile": [8, 15],
+                        "target": "cave",
+                        "target_tile": [4, 1],
+                    },
+                    {
+                        "zone": "cave",
+                        "tile": [4, 0],
+                        "target": "forest",
+                        "target_tile": [8, 14],
+                    },
+                ],
+            }
+            with open(os.path.join(tmp_dir, "zones.json"), "w") as manifest_file:
+                json.dump(manifest, manifest_file)
+            yield tmp_dir
+
+        pygame.quit()
+
+    @pytest.fixture
+    def zone_world(self, world_dir):
+        world = ZoneWorld(world_dir, tile_size=32, max_cached_zones=2)
+        yield world
+        world.close()
+
+    def wait_for_zone(self, world, zone):
+        deadline = time.time() + 5
+        while not world.is_zone_loaded(zone):
+            assert time.time() < deadline, "zone never finished loading"
+            world.update()
+            time.sleep(0.01)
+
+    def test_manifest(self, world_dir, zone_world):
+        assert is_zone_world(world_dir)
+        assert not is_zone_world(os.path.dirname(world_dir))
+        assert zone_world.current_zone == "village"
+        assert zone_world.current_map.width == 12
+        assert zone_world.get_neighbour_zones("forest") == ["village", "cave"]
+
+    def test_neighbours_preloaded(self, zone_world):
+        self.wait_for_zone(zone_world, "forest")
+        assert not zone_world.is_zone_loaded("cave")
+        # The arrival area is already rendered
+        assert zone_world.maps["forest"].terrain_cache.is_cached(0, 0)
+
+    def test_objects_created_on_main_thread(self, world_dir, monkeypatch):
+        threads = []
+        create_object = BitmapMap._create_object
+
+        def record_thread(game_map, *args):
+            threads.append(threading.current_thread())
+            return create_object(game_map, *args)
+
+        monkeypatch.setattr(BitmapMap, "_create_object", record_thread)
+        world = ZoneWorld(world_dir, tile_size=32)
+        try:
+            self.wait_for_zone(world, "forest")
+            forest = world.maps["forest"]
+            assert [obj.name for obj in forest.objects] == ["small_tree"]
+            assert forest.get_objects_in_area(5 * 32, 5 * 32, 32, 32)
+            assert forest.is_tile_blocked(5, 5)
+            assert threads == [threading.main_thread()]
+        finally:
+            world.close()
+
+    def test_portal_transition(self, zone_world):
+        self.wait_for_zone(zone_world, "forest")
+        forest = zone_world.maps["forest"]
+
+        zone_world.check_portal(100, 100)  # Walk around before the portal
+        portal = zone_world.check_portal(10 * 32 + 5, 5 * 32 + 5)
+        assert portal is not None and portal.target_zone == "forest"
+
+        game_map, arrival = zone_world.take_portal(portal)
+        assert game_map is forest
+        assert zone_world.current_zone == "forest"
+        assert arrival == (1 * 32 + 16, 8 * 32 + 16)
+
+    def test_portal_disarmed_on_arrival(self, zone_world):
+        zone_world.enter_zone("forest")
+        assert zone_world.check_portal(0 * 32 + 5, 8 * 32 + 5) is None
+        zone_world.check_portal(5 * 32, 5 * 32)
+        assert zone_world.check_portal(0 * 32 + 5, 8 * 32 + 5) is not None
+
+    def test_cache_bounded(self, zone_world):
+        zone_world.enter_zone("forest")
+        zone_world.enter_zone("cave")
+        zone_world.enter_zone("ruins")
+        zone_world.update()
+
+        assert len(zone_world.maps) <= 2
+        assert zone_world.is_zone_loaded("ruins")
+
+    def test_unknown_zone(self, zone_world):
+        with pytest.raises(KeyError):
+            zone_world.enter_zone("moon")
+
+    def test_game_scene_changes_zone(self, world_dir):
+        scene = GameScene(world_dir)
+        try:
+            village_enemies = scene.enemies
+            scene.player.x, scene.player.y = 10 * 32, 4 * 32
+            scene.zone_world.check_portal(100, 100)
+            scene.update(0.016)
+
+            assert scene.zone_world.current_zone == "forest"
+            assert scene.game_map is scene.zone_world.maps["forest"]
+            assert scene.enemies is not village_enemies
+        finally:
+            scene.on_exit()